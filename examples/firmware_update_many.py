@@ -0,0 +1,60 @@
+"""Update the firmware of several devices in parallel.
+
+Note: PySOEM >= 1.2.0 is required.
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+import pysoem
+
+logger = logging.getLogger(__name__)
+
+
+def argument_parsing(cmd_line_args):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('interface_name', type=str,
+                        help='ID of the network adapter used for the EtherCAT network.')
+    parser.add_argument('update_file', type=str,
+                        help='Path to the file to be uploaded.')
+    parser.add_argument('device_positions', type=int, nargs='+', metavar='1..65535',
+                        help='Positions of the devices in the EtherCAT network to be updated.')
+    return parser.parse_args(cmd_line_args)
+
+
+def main(cmd_line_args):
+    script_args = argument_parsing(cmd_line_args)
+
+    with pysoem.open(script_args.interface_name) as master:
+        logger.info('Enumerate devices in the network..')
+        number_of_devices_found = master.config_init()
+        logger.info('..Number of devices found: %d.' % number_of_devices_found)
+
+        def on_progress(pos, written, total):
+            logger.info('Device %d: %d of %d bytes' % (pos + 1, written, total))
+
+        # the file name on the device is the name of the update file without its extension
+        file_name = os.path.splitext(os.path.basename(script_args.update_file))[0]
+        results = master.update_firmware(file_name,
+                                         {position - 1: script_args.update_file
+                                          for position in script_args.device_positions},
+                                         progress=on_progress,
+                                         progress_interval_us=1_000_000)
+        for pos, result in results.items():
+            if result.error is None:
+                logger.info('Device %d: updated in %.1f s.' % (pos + 1, result.duration))
+            else:
+                logger.error('Device %d: update failed: %s' % (pos + 1, result.error))
+    logger.info('Finished.')
+    return all(result.error is None for result in results.values())
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    try:
+        sys.exit(0 if main(sys.argv[1:]) else 1)
+    except Exception as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
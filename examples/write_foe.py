@@ -14,9 +14,9 @@ def write_file_to_first_slave(ifname, file_path):
 
             first_slave = master.slaves[0]
 
-            with open(file_path, 'rb') as file:
-                file_data = file.read()
-                first_slave.foe_write('data.bin', 0, file_data)
+            # the file is memory-mapped, not read into memory
+            first_slave.foe_write('data.bin', 0, file_path,
+                                  progress=lambda written, total: print('{} of {} bytes'.format(written, total)))
         else:
             print('no slave available')
     except Exception as ex:
@@ -48,7 +48,11 @@ soem_sources.extend([os.path.join('.', 'soem', 'osal', os_name, 'osal.c'),
                      os.path.join('.', 'soem', 'soem', 'ethercatmain.c'),
                      os.path.join('.', 'soem', 'soem', 'ethercatprint.c'),
                      os.path.join('.', 'soem', 'soem', 'ethercatsoe.c'),
-                     os.path.join('.', 'src', 'soem', 'soem_config.c')])
+                     os.path.join('.', 'src', 'soem', 'soem_config.c'),
+                     os.path.join('.', 'src', 'soem', 'soem_cyclic.c'),
+                     os.path.join('.', 'src', 'soem', 'soem_enum.c'),
+                     os.path.join('.', 'src', 'soem', 'soem_mailbox.c'),
+                     os.path.join('.', 'src', 'soem', 'soem_sii.c')])
 
 soem_inc_dirs.extend([os.path.join('.', 'soem', 'oshw', os_name),
                       os.path.join('.', 'soem', 'osal', os_name),
@@ -13,7 +13,25 @@ from pysoem.pysoem import (
     EepromError,
     WkcError,
     NetworkInterfaceNotOpenError,
+    FirmwareUpdateError,
     SiiOffset,
+    SiiCategory,
+    SiiImage,
+    SiiGeneral,
+    SiiSyncManager,
+    SiiPdo,
+    SiiPdoEntry,
+    IoMapLayout,
+    InputSnapshot,
+    CycleStats,
+    TimingStats,
+    PdoVariable,
+    PdoMap,
+    ProcessDataBits,
+    SdoResult,
+    ObjectDictionaryTable,
+    MailboxEvent,
+    FirmwareUpdateResult,
 )
 
 # State constants:
@@ -49,6 +67,9 @@ from pysoem.pysoem import (
     find_adapters,
     open,
     al_status_code_to_string,
+    clear_od_cache,
+    clear_sii_cache,
+    parse_sii_image,
 )
 
 # Raw Cdefs:
@@ -23,6 +23,9 @@ cdef extern from "ethercat.h":
         EC_MAXBUF = 16
         EC_MAXMBX = 1486
         EC_BUFSIZE = 1518
+        ECT_MBXPROT_COE = 0x0004
+        ECT_REG_TYPE = 0x0000
+        EC_TIMEOUTSAFE = 20000
     
     ec_adaptert* ec_find_adapters()
         
@@ -151,6 +154,7 @@ cdef extern from "ethercat.h":
         uint32           eep_man
         uint32           eep_id
         uint32           eep_rev
+        uint32           eep_sn
         uint16           Itype
         uint16           Dtype
         uint16           Obits
@@ -318,22 +322,16 @@ cdef extern from "ethercat.h":
     void ecx_close(ecx_contextt *context)
     int ecx_config_map_group(ecx_contextt *context, void *pIOmap, uint8 group)
     int ecx_config_overlap_map_group(ecx_contextt *context, void *pIOmap, uint8 group)
-    int ecx_readODlist(ecx_contextt *context, uint16 Slave, ec_ODlistt *pODlist)
-    int ecx_readODdescription(ecx_contextt *context, uint16 Item, ec_ODlistt *pODlist)
-    int ecx_readOE(ecx_contextt *context, uint16 Item, ec_ODlistt *pODlist, ec_OElistt *pOElist)
     
     int ecx_readstate(ecx_contextt *context)
     int ecx_writestate(ecx_contextt *context, uint16 slave)
-    uint16 ecx_statecheck(ecx_contextt *context, uint16 slave, uint16 reqstate, int timeout)
     
-    int ecx_send_overlap_processdata(ecx_contextt *context)
     
     int ecx_recover_slave(ecx_contextt *context, uint16 slave, int timeout)
     int ecx_reconfig_slave(ecx_contextt *context, uint16 slave, int timeout)
 
     int ecx_mbxreceive(ecx_contextt *context, uint16 slave, ec_mbxbuft *mbx, int timeout)
     void ec_clearmbx(ec_mbxbuft *Mbx)
-    boolean ecx_poperror(ecx_contextt *context, ec_errort *Ec)
     const char* ec_sdoerror2string(uint32 sdoerrorcode)
     char* ec_mbxerror2string(uint16 errorcode)
     
@@ -351,9 +349,123 @@ cdef extern from "ethercat.h":
 
 cdef extern from "ethercat.h" nogil:
     int ecx_config_init(ecx_contextt *context, uint8 usetable)
+    uint16 ecx_statecheck(ecx_contextt *context, uint16 slave, uint16 reqstate, int timeout)
+    int ecx_BRD(ecx_portt *port, uint16 ADP, uint16 ADO, uint16 length, void *data, int timeout)
     int ecx_send_processdata(ecx_contextt *context)
+    int ecx_send_overlap_processdata(ecx_contextt *context)
     int ecx_receive_processdata(ecx_contextt *context, int timeout)
+    int ecx_send_processdata_group(ecx_contextt *context, uint8 group)
+    int ecx_send_overlap_processdata_group(ecx_contextt *context, uint8 group)
+    int ecx_receive_processdata_group(ecx_contextt *context, uint8 group, int timeout)
     int ecx_FOEwrite(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int psize, void *p, int timeout)
     int ecx_FOEread(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int *psize, void *p, int timeout)
     int ecx_SDOread(ecx_contextt *context, uint16 slave, uint16 index, uint8 subindex, boolean CA, int *psize, void *p, int timeout)
-    int ecx_SDOwrite(ecx_contextt *context, uint16 slave, uint16 index, uint8 subindex, boolean CA, int psize, void *p, int Timeout)
\ No newline at end of file
+    int ecx_SDOwrite(ecx_contextt *context, uint16 slave, uint16 index, uint8 subindex, boolean CA, int psize, void *p, int Timeout)
+    boolean ecx_poperror(ecx_contextt *context, ec_errort *Ec)
+    int ecx_readODlist(ecx_contextt *context, uint16 Slave, ec_ODlistt *pODlist)
+    int ecx_readODdescription(ecx_contextt *context, uint16 Item, ec_ODlistt *pODlist)
+    int ecx_readOE(ecx_contextt *context, uint16 Item, ec_ODlistt *pODlist, ec_OElistt *pOElist)
+
+cdef extern from "soem_cyclic.h" nogil:
+    cdef enum:
+        SOEM_HIST_BINS = 32
+
+    ctypedef struct soem_histt:
+        uint64 count
+        int64 min_ns
+        int64 max_ns
+        int64 sum_ns
+        uint64 bins[SOEM_HIST_BINS]
+
+    ctypedef struct soem_cyclestatst:
+        uint64 cycles
+        uint64 wkc_mismatches
+        uint64 overruns
+        soem_histt wakeup_latency
+        soem_histt roundtrip
+        soem_histt dc_offset
+        int64 dc_offset_ns
+        int64 dc_correction_ns
+        int64 dc_drift_ns
+
+    ctypedef struct soem_snapshott:
+        int size
+
+    ctypedef struct soem_cyclict:
+        pass
+
+    int64 soem_monotonic_ns()
+    int soem_expected_wkc(ecx_contextt *context, uint8 group)
+    void soem_stats_reset(soem_cyclestatst *stats)
+    void soem_stats_request_reset(soem_cyclestatst *stats)
+    void soem_stats_record_send(soem_cyclestatst *stats)
+    void soem_stats_record_receive(soem_cyclestatst *stats, int wkc, int expected_wkc)
+    void soem_stats_snapshot(soem_cyclestatst *stats, soem_cyclestatst *out)
+    int soem_snapshot_init(soem_snapshott *self, const uint8 *source, int size)
+    void soem_snapshot_free(soem_snapshott *self)
+    void soem_snapshot_publish(soem_snapshott *self, int wkc, int64 dc_time)
+    int soem_snapshot_read(soem_snapshott *self, uint8 *out, uint64 *cycle, int64 *timestamp_ns, int64 *dc_time, int *wkc)
+    int soem_cyclic_start(soem_cyclict *self, ecx_contextt *context, soem_cyclestatst *stats,
+                          soem_snapshott *snapshot, const uint8 *groups, const int64 *periods_ns, int ngroups,
+                          int timeout_us, int overlap, int rt_priority, int dc_sync, int64 dc_sync_offset_ns)
+    void soem_cyclic_stop(soem_cyclict *self)
+    int soem_cyclic_is_running(soem_cyclict *self)
+    int soem_cyclic_wkc(soem_cyclict *self)
+    uint64 soem_cyclic_count(soem_cyclict *self)
+    int soem_cyclic_group_wkc(soem_cyclict *self, uint8 group)
+    uint64 soem_cyclic_group_count(soem_cyclict *self, uint8 group)
+
+cdef extern from "soem_mailbox.h" nogil:
+    ctypedef struct soem_sdo_requestt:
+        uint16 slave
+        uint16 index
+        uint8 subindex
+        uint8 ca
+        int size
+        uint8 *data
+        int wkc
+        int completion
+        int has_error
+        ec_errort error
+
+    ctypedef struct soem_emergenciest:
+        ec_errort *errors
+        int capacity
+        int count
+
+    int soem_sdo_read_parallel(ecx_contextt *context, soem_sdo_requestt *requests, int count, int timeout,
+                               soem_emergenciest *emergencies)
+    int soem_mbx_poll_emergencies(ecx_contextt *context, const uint16 *slaves, int count, soem_emergenciest *errors)
+
+    ctypedef struct soem_foe_progresst:
+        void (*callback)(void *user, int transferred)
+        void *user
+        int interval_us
+
+    int soem_foe_write(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int psize, void *p,
+                       int timeout, soem_foe_progresst *progress)
+    int soem_foe_read(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int *psize, void *p,
+                      int timeout, soem_foe_progresst *progress)
+
+cdef extern from "soem_sii.h" nogil:
+    int SOEM_SII_FIRST_CATEGORY
+
+    int soem_sii_read_image(ecx_contextt *context, uint16 slave, uint8 *image, int size, int timeout)
+    int soem_sii_write_image(ecx_contextt *context, uint16 slave, const uint8 *image, int words, uint8 *changed,
+                             int verify, int timeout, int *failed_word)
+
+    ctypedef struct soem_sii_readt:
+        uint16 slave
+        uint8 *image
+        int size
+        int length
+        int words
+        int complete
+
+    int soem_sii_read_parallel(ecx_contextt *context, soem_sii_readt *reads, int count, int timeout)
+
+cdef extern from "soem_enum.h" nogil:
+    int soem_enum_detect(ecx_contextt *context)
+    void soem_enum_configure(ecx_contextt *context, uint16 slave, const uint8 *image, int length)
+    void soem_enum_restore(ecx_contextt *context, uint16 slave)
+    void soem_enum_restore_map(ecx_contextt *context, uint16 slave)
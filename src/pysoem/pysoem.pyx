@@ -23,15 +23,28 @@ import collections
 import time
 import contextlib
 import warnings
+import struct
+import array
+import json
+import os
+import builtins
+import concurrent.futures
+import threading
+import mmap
 
 from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
-from cpython.bytes cimport PyBytes_FromString, PyBytes_FromStringAndSize
+from cpython.bytes cimport PyBytes_FromString, PyBytes_FromStringAndSize, PyBytes_AS_STRING, _PyBytes_Resize
 from libc.stdint cimport int8_t, int16_t, int32_t, int64_t, uint8_t, uint16_t, uint32_t, uint64_t
-from libc.string cimport memcpy, memset
-from cpython.ref cimport Py_INCREF, Py_DECREF
+from libc.stdlib cimport malloc, realloc, free
+from libc.string cimport memcpy, memset, strncpy
+from cpython.ref cimport PyObject, Py_INCREF, Py_DECREF
+from cpython.buffer cimport PyBuffer_FillInfo
 
 logger = logging.getLogger(__name__)
 
+# version of the SOEM sources in the soem submodule, a saved configuration is only restored with the same
+_SOEM_VERSION = '1.4.0'
+
 NONE_STATE = cpysoem.EC_STATE_NONE
 INIT_STATE = cpysoem.EC_STATE_INIT
 PREOP_STATE = cpysoem.EC_STATE_PRE_OP
@@ -113,10 +126,14 @@ cdef class CdefSettings:
 
     cdef public CdefTimeouts timeouts
     cdef public cpysoem.boolean always_release_gil
+    cdef public object od_cache_dir
+    cdef public object sii_cache_dir
 
     def __init__(self):
         self.timeouts = CdefTimeouts()
         self.always_release_gil = False
+        self.od_cache_dir = None
+        self.sii_cache_dir = None
 
 settings = CdefSettings()
 
@@ -194,11 +211,145 @@ def al_status_code_to_string(code):
     return cpysoem.ec_ALstatuscode2string(code).decode('utf8');
 
 
+IoMapLayout = collections.namedtuple('IoMapLayout', ['slave',
+                                                     'name',
+                                                     'output_offset',
+                                                     'output_bytes',
+                                                     'output_bits',
+                                                     'output_start_bit',
+                                                     'input_offset',
+                                                     'input_bytes',
+                                                     'input_bits',
+                                                     'input_start_bit',
+                                                     'group'])
+
+
+InputSnapshot = collections.namedtuple('InputSnapshot', ['cycle',
+                                                         'timestamp_ns',
+                                                         'dc_time',
+                                                         'wkc',
+                                                         'data'])
+
+CycleStats = collections.namedtuple('CycleStats', ['cycles',
+                                                   'wkc_mismatches',
+                                                   'overruns',
+                                                   'wakeup_latency',
+                                                   'roundtrip',
+                                                   'dc_offset',
+                                                   'dc_offset_ns',
+                                                   'dc_correction_ns',
+                                                   'dc_drift_ns'])
+
+TimingStats = collections.namedtuple('TimingStats', ['count',
+                                                     'min_ns',
+                                                     'max_ns',
+                                                     'mean_ns',
+                                                     'histogram'])
+
+PdoVariable = collections.namedtuple('PdoVariable', ['name',
+                                                     'index',
+                                                     'subindex',
+                                                     'data_type',
+                                                     'is_input',
+                                                     'bit_offset',
+                                                     'bit_length'])
+
+ObjectDictionaryTable = collections.namedtuple('ObjectDictionaryTable', ['index',
+                                                                         'subindex',
+                                                                         'object_code',
+                                                                         'object_name',
+                                                                         'name',
+                                                                         'data_type',
+                                                                         'bit_length',
+                                                                         'access'])
+
+SdoResult = collections.namedtuple('SdoResult', ['index',
+                                                 'subindex',
+                                                 'data',
+                                                 'wkc',
+                                                 'abort_code',
+                                                 'error'])
+
+SiiImage = collections.namedtuple('SiiImage', ['data',
+                                               'vendor_id',
+                                               'product_code',
+                                               'revision',
+                                               'serial_number',
+                                               'boot_rx_mailbox',
+                                               'boot_tx_mailbox',
+                                               'std_rx_mailbox',
+                                               'std_tx_mailbox',
+                                               'mailbox_protocols',
+                                               'strings',
+                                               'general',
+                                               'fmmus',
+                                               'sync_managers',
+                                               'tx_pdos',
+                                               'rx_pdos',
+                                               'categories'])
+
+SiiGeneral = collections.namedtuple('SiiGeneral', ['group',
+                                                   'image',
+                                                   'order',
+                                                   'name',
+                                                   'coe_details',
+                                                   'foe_details',
+                                                   'eoe_details',
+                                                   'flags',
+                                                   'current_on_ebus',
+                                                   'physical_ports'])
+
+SiiSyncManager = collections.namedtuple('SiiSyncManager', ['start_address',
+                                                           'length',
+                                                           'control',
+                                                           'enable',
+                                                           'type'])
+
+SiiPdo = collections.namedtuple('SiiPdo', ['index',
+                                           'sync_manager',
+                                           'dc_sync',
+                                           'name',
+                                           'flags',
+                                           'entries'])
+
+SiiPdoEntry = collections.namedtuple('SiiPdoEntry', ['index',
+                                                     'subindex',
+                                                     'name',
+                                                     'data_type',
+                                                     'bit_length',
+                                                     'flags'])
+
+FirmwareUpdateResult = collections.namedtuple('FirmwareUpdateResult', ['size',
+                                                                       'duration',
+                                                                       'error'])
+
+MailboxEvent = collections.namedtuple('MailboxEvent', ['timestamp',
+                                                       'slave_pos',
+                                                       'error'])
+
+
+cdef object _timing_stats(cpysoem.soem_histt* hist):
+    mean_ns = hist.sum_ns / hist.count if hist.count > 0 else 0.0
+    return TimingStats(hist.count,
+                       hist.min_ns,
+                       hist.max_ns,
+                       mean_ns,
+                       tuple(hist.bins[i] for i in range(cpysoem.SOEM_HIST_BINS)))
+
+
 class Master(CdefMaster):
     """Representing a logical EtherCAT master device.
 
     For each network interface you can have a Master instance.
 
+    The slave list and the IO map are allocated on the heap. By default the slave list is
+    sized by config_init() for the number of slaves found, and the IO map by config_map()
+    for the mapped process data, so neither has a fixed limit.
+
+    Args:
+        max_slaves (:obj:`int`, optional): Fix the capacity of the slave list instead of
+            sizing it in config_init(). config_init() fails if more slaves are connected.
+
     Attributes:
         slaves: Gets a list of the slaves found during config_init. The slave instances are of type :class:`CdefSlave`.
         sdo_read_timeout: timeout for SDO read access for all slaves connected
@@ -209,12 +360,38 @@ class Master(CdefMaster):
 
 
 cdef enum:
-    EC_MAXSLAVE = 200
-    EC_MAXGROUP = 1
+    EC_MAXGROUP = 8
     EC_MAXEEPBITMAP = 128
     EC_MAXEEPBUF = EC_MAXEEPBITMAP * 32
     EC_MAXMAPT = 8
-    EC_IOMAPSIZE = 4096
+    EC_MAXELIST = 64
+
+
+cdef class _MemoryBlock:
+    """Zero initialized heap memory, kept alive by all objects pointing into it."""
+    cdef void* ptr
+    cdef size_t size
+
+    def __dealloc__(self):
+        PyMem_Free(self.ptr)
+
+
+cdef _MemoryBlock _allocate_block(size_t size):
+    cdef _MemoryBlock block = _MemoryBlock.__new__(_MemoryBlock)
+    # never allocate 0 bytes, so a NULL pointer always means an error
+    block.ptr = PyMem_Malloc(size if size > 0 else 1)
+    if block.ptr == NULL:
+        raise MemoryError()
+    memset(block.ptr, 0, size if size > 0 else 1)
+    block.size = size
+    return block
+
+
+cdef inline char* _move_pointer(char* ptr, char* old_base, char* new_base, int size) noexcept:
+    if ptr == NULL or ptr < old_base or ptr > old_base + size:
+        return ptr
+    return new_base + (ptr - old_base)
+
 
 cdef class CdefMaster:
     """Representing a logical EtherCAT master device.
@@ -224,11 +401,13 @@ cdef class CdefMaster:
     cdef classes. For example you can add new attributes dynamically.
     """
 
-    cdef cpysoem.ec_slavet        _ec_slave[EC_MAXSLAVE]
+    cdef cpysoem.ec_slavet*       _ec_slave
+    cdef _MemoryBlock             _slave_table
+    cdef object                   _max_slaves
     cdef int                      _ec_slavecount
-    cdef cpysoem.ec_groupt        _ec_group[EC_MAXGROUP]
-    cdef cpysoem.uint8            _ec_esibuf[EC_MAXEEPBUF]
-    cdef cpysoem.uint32           _ec_esimap[EC_MAXEEPBITMAP]
+    cdef cpysoem.ec_groupt*       _ec_group
+    cdef cpysoem.uint8*           _ec_esibuf
+    cdef cpysoem.uint32*          _ec_esimap
     cdef cpysoem.ec_eringt        _ec_elist
     cdef cpysoem.ec_idxstackT     _ec_idxstack
     cdef cpysoem.ec_SMcommtypet   _ec_SMcommtype[EC_MAXMAPT]
@@ -238,12 +417,32 @@ cdef class CdefMaster:
     cdef cpysoem.ec_eepromFMMUt   _ec_FMMU
     cdef cpysoem.boolean          _EcatError
     cdef cpysoem.int64            _ec_DCtime
-    cdef cpysoem.ecx_portt        _ecx_port
-    cdef cpysoem.ecx_redportt     _ecx_redport
+    cdef cpysoem.ecx_portt*       _ecx_port
+    cdef cpysoem.ecx_redportt*    _ecx_redport
 
     cdef cpysoem.ecx_contextt _ecx_contextt
-    cdef char io_map[EC_IOMAPSIZE]
+    cdef char* _io_map
+    cdef _MemoryBlock _io_map_block
+    cdef int _io_map_size
+    cdef cpysoem.boolean _is_overlap_map
+    cdef int _expected_wkc
+    cdef int _group_expected_wkc[EC_MAXGROUP]
+    cdef int _sent_expected_wkc
+    cdef cpysoem.uint8 _mapped_groups[EC_MAXGROUP]
+    cdef int _num_mapped_groups
     cdef CdefMasterSettings _settings
+    cdef cpysoem.soem_cyclict _cyclic
+    cdef cpysoem.soem_cyclestatst _cycle_stats
+    cdef cpysoem.soem_snapshott _input_snapshot
+    cdef int _input_snapshot_offset
+    cdef object _mailbox_executor
+    cdef object _mailbox_monitor
+    cdef object _mailbox_monitor_stop
+    cdef object _mailbox_events
+    cdef readonly int mailbox_events_dropped
+    cdef readonly dict config_init_timing
+    cdef list _startup_actions
+    cdef cpysoem.boolean _recording_startup
     cdef public int sdo_read_timeout
     cdef public int sdo_write_timeout
     cdef public cpysoem.boolean always_release_gil
@@ -252,13 +451,36 @@ cdef class CdefMaster:
     state = property(_get_state, _set_state)
     expected_wkc  = property(_get_expected_wkc)
     dc_time = property(_get_dc_time)
+    io_map = property(_get_io_map)
+    cyclic_running = property(_get_cyclic_running)
+    cyclic_wkc = property(_get_cyclic_wkc)
+    cycle_count = property(_get_cycle_count)
+    max_slaves = property(_get_max_slaves)
     manual_state_change = property(_get_manual_state_change, _set_manual_state_change)
 
-    def __cinit__(self):
-        self._ecx_contextt.port = &self._ecx_port
-        self._ecx_contextt.slavelist = &self._ec_slave[0]
+    def __cinit__(self, *args, max_slaves=None, **kwargs):
+        self._ec_group = <cpysoem.ec_groupt*>PyMem_Malloc(EC_MAXGROUP * sizeof(cpysoem.ec_groupt))
+        self._ec_esibuf = <cpysoem.uint8*>PyMem_Malloc(EC_MAXEEPBUF * sizeof(cpysoem.uint8))
+        self._ec_esimap = <cpysoem.uint32*>PyMem_Malloc(EC_MAXEEPBITMAP * sizeof(cpysoem.uint32))
+        if self._ec_group == NULL or self._ec_esibuf == NULL or self._ec_esimap == NULL:
+            raise MemoryError()
+        memset(self._ec_group, 0, EC_MAXGROUP * sizeof(cpysoem.ec_groupt))
+        memset(self._ec_esibuf, 0, EC_MAXEEPBUF * sizeof(cpysoem.uint8))
+        memset(self._ec_esimap, 0, EC_MAXEEPBITMAP * sizeof(cpysoem.uint32))
+        if max_slaves is not None and max_slaves < 0:
+            raise ValueError('max_slaves must not be negative')
+        self._max_slaves = max_slaves
+        self._ec_slavecount = 0
+        # the first entry of the slave list is reserved by SOEM
+        self._set_slave_table_size(1 if max_slaves is None else max_slaves + 1)
+        self._io_map_block = _allocate_block(0)
+        self._io_map = <char*>self._io_map_block.ptr
+
+        # the ports with their frame buffers are allocated by open()
+        self._ecx_port = NULL
+        self._ecx_redport = NULL
+        self._ecx_contextt.port = NULL
         self._ecx_contextt.slavecount = &self._ec_slavecount
-        self._ecx_contextt.maxslave = EC_MAXSLAVE
         self._ecx_contextt.grouplist = &self._ec_group[0]
         self._ecx_contextt.maxgroup = EC_MAXGROUP
         self._ecx_contextt.esibuf = &self._ec_esibuf[0]
@@ -284,6 +506,61 @@ cdef class CdefMaster:
         self._settings.sdo_read_timeout = &self.sdo_read_timeout
         self._settings.sdo_write_timeout = &self.sdo_write_timeout
         self.context_initialized = False
+        self._io_map_size = 0
+        self._is_overlap_map = False
+        self._expected_wkc = 0
+        memset(self._group_expected_wkc, 0, sizeof(self._group_expected_wkc))
+        self._sent_expected_wkc = 0
+        self._mapped_groups[0] = 0
+        self._num_mapped_groups = 1
+        memset(&self._cyclic, 0, sizeof(self._cyclic))
+        memset(&self._cycle_stats, 0, sizeof(self._cycle_stats))
+        memset(&self._input_snapshot, 0, sizeof(self._input_snapshot))
+        cpysoem.soem_snapshot_free(&self._input_snapshot)  # sets the "nothing published" state
+        self._input_snapshot_offset = 0
+        self._mailbox_executor = None
+        self._mailbox_monitor = None
+        self._mailbox_events = collections.deque()
+        self.mailbox_events_dropped = 0
+        self.config_init_timing = {}
+        self._startup_actions = None
+        self._recording_startup = False
+
+    def __init__(self, *, max_slaves=None):
+        pass
+
+    def __dealloc__(self):
+        # the cyclic thread works on memory owned by this object
+        with nogil:
+            cpysoem.soem_cyclic_stop(&self._cyclic)
+        cpysoem.soem_snapshot_free(&self._input_snapshot)
+        PyMem_Free(self._ecx_port)
+        PyMem_Free(self._ecx_redport)
+        PyMem_Free(self._ec_group)
+        PyMem_Free(self._ec_esibuf)
+        PyMem_Free(self._ec_esimap)
+
+    cdef _set_slave_table_size(self, int num_entries):
+        # slave objects of a previous config_init() keep the old table alive
+        self._slave_table = _allocate_block(num_entries * sizeof(cpysoem.ec_slavet))
+        self._ec_slave = <cpysoem.ec_slavet*>self._slave_table.ptr
+        self._ecx_contextt.slavelist = self._ec_slave
+        self._ecx_contextt.maxslave = num_entries
+
+    def _get_max_slaves(self):
+        """Number of slaves the slave list can currently hold.
+
+        .. versionadded:: 1.2.0
+        """
+        return self._ecx_contextt.maxslave - 1
+
+    cdef int _count_slaves(self):
+        """Count the slaves on the network by a broadcast read, returns the working counter."""
+        cdef cpysoem.uint16 w
+        cdef int wkc
+        with nogil:
+            wkc = cpysoem.ecx_BRD(self._ecx_contextt.port, 0x0000, cpysoem.ECT_REG_TYPE, sizeof(w), &w, cpysoem.EC_TIMEOUTSAFE)
+        return wkc
         
     def open(self, ifname, ifname_red=None):
         """Initialize and open network interface.
@@ -304,10 +581,21 @@ cdef class CdefMaster:
             ConnectionError: When the specified interface dose not exist or
                 you have no permission to open the interface
         """
+        if self._ecx_port == NULL:
+            self._ecx_port = <cpysoem.ecx_portt*>PyMem_Malloc(sizeof(cpysoem.ecx_portt))
+            if self._ecx_port == NULL:
+                raise MemoryError()
+            memset(self._ecx_port, 0, sizeof(cpysoem.ecx_portt))
+            self._ecx_contextt.port = self._ecx_port
         if ifname_red is None:
             ret_val = cpysoem.ecx_init(&self._ecx_contextt, ifname.encode('utf8'))
         else:
-            ret_val = cpysoem.ecx_init_redundant(&self._ecx_contextt, &self._ecx_redport, ifname.encode('utf8'), ifname_red.encode('utf8'))
+            if self._ecx_redport == NULL:
+                self._ecx_redport = <cpysoem.ecx_redportt*>PyMem_Malloc(sizeof(cpysoem.ecx_redportt))
+                if self._ecx_redport == NULL:
+                    raise MemoryError()
+                memset(self._ecx_redport, 0, sizeof(cpysoem.ecx_redportt))
+            ret_val = cpysoem.ecx_init_redundant(&self._ecx_contextt, self._ecx_redport, ifname.encode('utf8'), ifname_red.encode('utf8'))
         if ret_val == 0:
             raise ConnectionError('could not open interface {}'.format(ifname))
 
@@ -342,76 +630,299 @@ cdef class CdefMaster:
             return release_gil
         return self.always_release_gil
         
-    def config_init(self, usetable=False, *, release_gil=None):
+    def config_init(self, usetable=False, *, release_gil=None, parallel_sii=False):
         """Enumerate and init all slaves.
+
+        The duration of each phase is recorded in :py:attr:`config_init_timing`, a dict of the phase names
+        and their durations in seconds, in the order of the phases:
+
+        * ``'count'``: counting the slaves, to size the slave list
+        * ``'config_init'``: enumerating the slaves and reading their SII one after the other
+        * ``'detect'``, ``'sii'``, ``'configure'``: with parallel_sii, assigning the station addresses, reading the
+          SII of all slaves at the same time, and configuring the slaves from their SII
+        * ``'slaves'``: creating the slave objects
         
         Args:
             usetable (bool): True when using configtable to init slaves, False otherwise.
             release_gil (:obj:`bool`, optional): True to initialize the slaves releasing the GIL. Defaults to False.
+            parallel_sii (:obj:`bool`, optional): True to read the SII of all slaves at the same time, with one frame
+                for many slaves, instead of one slave after the other. The SII of a device type is read from one
+                slave only and kept in a cache, see
+                :py:attr:`pysoem.settings.sii_cache_dir <CdefSettings.sii_cache_dir>`. Can not be combined with
+                usetable. Defaults to False.
         
         Returns:
             int: Working counter of slave discover datagram = number of slaves found, -1 when no slave is connected
+
+        Raises:
+            ValueError: if both usetable and parallel_sii are given
+
+        .. versionchanged:: 1.2.0
+           The slave list grows to the number of slaves found, unless max_slaves was given to the constructor.
+           Added parallel_sii and :py:attr:`config_init_timing`.
         """
+        if usetable and parallel_sii:
+            raise ValueError('parallel_sii can not be used with usetable')
         release_gil = self.check_release_gil(release_gil)
         self.check_context_is_initialized()
+        self._check_cyclic_not_running()
         self.slaves = []
-        
+        self._startup_actions = None
+        timing = {}
+        self.config_init_timing = timing
+
+        cdef int num_slaves
+        start = time.monotonic()
+        if self._max_slaves is None:
+            num_slaves = self._count_slaves()
+            if num_slaves + 1 > self._ecx_contextt.maxslave:
+                self._set_slave_table_size(num_slaves + 1)
+            timing['count'] = time.monotonic() - start
+
         cdef int ret_val
-        if release_gil:
+        start = time.monotonic()
+        if parallel_sii:
+            ret_val = self._config_init_parallel(release_gil, timing)
+        elif release_gil:
             ret_val = self.__config_init_nogil(usetable)
         else:
             ret_val = cpysoem.ecx_config_init(&self._ecx_contextt, usetable)
+        if not parallel_sii:
+            timing['config_init'] = time.monotonic() - start
 
+        start = time.monotonic()
         if ret_val > 0:
           for i in range(self._ec_slavecount):
               self.slaves.append(self._get_slave(i))
+        timing['slaves'] = time.monotonic() - start
         return ret_val
+
+    cdef int _config_init_parallel(self, bint release_gil, dict timing) except? -100:
+        """ecx_config_init() with the SII of all slaves read at the same time.
+
+        The SII headers are read first. The categories of a device type in the SII cache are taken from there,
+        otherwise they are read from one slave of the device type and added to the cache.
+        """
+        cdef int wkc
+        cdef int count
+        cdef int i
+        cdef cpysoem.soem_sii_readt* reads
+        start = time.monotonic()
+        if release_gil:
+            with nogil:
+                wkc = cpysoem.soem_enum_detect(&self._ecx_contextt)
+        else:
+            wkc = cpysoem.soem_enum_detect(&self._ecx_contextt)
+        timing['detect'] = time.monotonic() - start
+        if wkc <= 0:
+            return wkc
+        count = self._ec_slavecount
+        reads = <cpysoem.soem_sii_readt*>PyMem_Malloc(count * sizeof(cpysoem.soem_sii_readt))
+        if reads == NULL:
+            raise MemoryError()
+        memset(reads, 0, count * sizeof(cpysoem.soem_sii_readt))
+        try:
+            for i in range(count):
+                reads[i].slave = i + 1
+                reads[i].words = SII_CHECK_WORDS
+            start = time.monotonic()
+            self._read_sii_parallel(reads, count, release_gil)
+            pending = list(range(count))
+            while pending:
+                # one slave per device type that is not cached is read, the others wait for the cache
+                readers = {}
+                waiting = []
+                for i in pending:
+                    identity = None
+                    if reads[i].complete:
+                        header = PyBytes_FromStringAndSize(<char*>reads[i].image, 2 * SII_CHECK_WORDS)
+                        identity = _sii_identity(header)
+                        cached = _get_cached_sii(identity)
+                        if cached is not None and _sii_matches(cached, header):
+                            _set_sii_read(&reads[i], header[:2 * cpysoem.SOEM_SII_FIRST_CATEGORY] +
+                                          cached[2 * cpysoem.SOEM_SII_FIRST_CATEGORY:])
+                            continue
+                        if identity in readers:
+                            waiting.append(i)
+                            continue
+                        readers[identity] = i
+                    reads[i].words = 0
+                self._read_sii_parallel(reads, count, release_gil)
+                for identity, i in readers.items():
+                    if reads[i].complete:
+                        _store_cached_sii(identity, PyBytes_FromStringAndSize(<char*>reads[i].image, reads[i].length))
+                pending = waiting
+            timing['sii'] = time.monotonic() - start
+            for i in range(count):
+                if not reads[i].complete:
+                    logger.warning('SII of slave {} could not be read completely'.format(i))
+            start = time.monotonic()
+            if release_gil:
+                with nogil:
+                    _configure_slaves(&self._ecx_contextt, reads, count)
+            else:
+                _configure_slaves(&self._ecx_contextt, reads, count)
+            timing['configure'] = time.monotonic() - start
+        finally:
+            for i in range(count):
+                free(reads[i].image)
+            PyMem_Free(reads)
+        return wkc
+
+    cdef _read_sii_parallel(self, cpysoem.soem_sii_readt* reads, int count, bint release_gil):
+        if release_gil:
+            with nogil:
+                cpysoem.soem_sii_read_parallel(&self._ecx_contextt, reads, count, cpysoem.soem_timeouts.eeprom)
+        else:
+            cpysoem.soem_sii_read_parallel(&self._ecx_contextt, reads, count, cpysoem.soem_timeouts.eeprom)
         
     def config_map(self):
         """Map all slaves PDOs in IO map.
+
+        If slaves were assigned to groups by :py:attr:`CdefSlave.group`, each group is mapped
+        into its own region of the IO map, in the order of the group numbers.
         
         Returns:
             int: IO map size (sum of all PDO in an out data)
+
+        .. versionchanged:: 1.2.0
+           Maps each group of slaves separately.
         """
-        self.check_context_is_initialized()
-        cdef _CallbackData cd
-        # ecx_config_map_group returns the actual IO map size (not an error value), expect the value to be less than EC_IOMAPSIZE
-        ret_val = cpysoem.ecx_config_map_group(&self._ecx_contextt, &self.io_map, 0)
-        # check for exceptions raised in the config functions
-        for slave in self.slaves:
-            cd = slave._cd
-            if cd.exc_raised:
-                raise cd.exc_info[0], cd.exc_info[1], cd.exc_info[2]
-        logger.debug('io map size: {}'.format(ret_val))
-        # raise an exception if one or more mailbox errors occured within ecx_config_map_group call
-        error_list = self._collect_mailbox_errors()
-        if len(error_list) > 0:
-            raise ConfigMapError(error_list)
-        return ret_val
+        return self._config_map(False)
         
     def config_overlap_map(self):
         """Map all slaves PDOs to overlapping IO map.
+
+        If slaves were assigned to groups by :py:attr:`CdefSlave.group`, each group is mapped
+        into its own region of the IO map, in the order of the group numbers.
         
         Returns:
             int: IO map size (sum of all PDO in an out data)
+
+        .. versionchanged:: 1.2.0
+           Maps each group of slaves separately.
         """
+        return self._config_map(True)
+
+    def _config_map(self, overlap):
         self.check_context_is_initialized()
+        self._check_cyclic_not_running()
         cdef _CallbackData cd
-        # ecx_config_map_group returns the actual IO map size (not an error value), expect the value to be less than EC_IOMAPSIZE
-        ret_val = cpysoem.ecx_config_overlap_map_group(&self._ecx_contextt, &self.io_map, 0)
+        groups = self._groups_to_map()
+        cdef int ret_val = 0
+        cdef int i
+        # the SDO writes and SYNC settings of the config functions are kept for save_config()
+        self._startup_actions = []
+        self._recording_startup = True
+        try:
+            for i, group in enumerate(groups):
+                # ecx_config_map_group returns the actual IO map size (not an error value)
+                if overlap:
+                    ret_val += cpysoem.ecx_config_overlap_map_group(&self._ecx_contextt, self._io_map + ret_val, group)
+                else:
+                    ret_val += cpysoem.ecx_config_map_group(&self._ecx_contextt, self._io_map + ret_val, group)
+                self._mapped_groups[i] = group
+        finally:
+            self._recording_startup = False
+        self._num_mapped_groups = len(groups)
+        self._resize_io_map(ret_val)
+        for slave in self.slaves:
+            # the PDO offsets depend on the mapping
+            (<CdefSlave>slave)._pdo = None
+        self._is_overlap_map = overlap
+        self._cache_expected_wkc()
+        self._init_input_snapshot()
         # check for exceptions raised in the config functions
         for slave in self.slaves:
             cd = slave._cd
             if cd.exc_raised:
-                raise cd.exc_info[0],cd.exc_info[1],cd.exc_info[2]
+                raise cd.exc_info[0], cd.exc_info[1], cd.exc_info[2]
         logger.debug('io map size: {}'.format(ret_val))
-        # raise an exception if one or more mailbox errors occured within ecx_config_overlap_map_group call
+        # raise an exception if one or more mailbox errors occured within the ecx_config_map_group calls
         error_list = self._collect_mailbox_errors()
         if len(error_list) > 0:
             raise ConfigMapError(error_list)
-
         return ret_val
 
+    def _groups_to_map(self):
+        groups = sorted(set(self._ec_slave[i].group for i in range(1, self._ec_slavecount + 1)))
+        if len(groups) > 1 and groups[0] == 0:
+            # SOEM maps all slaves into group 0
+            raise ValueError('some slaves are in group 0 and others not, assign all slaves to groups 1 to {}'.format(EC_MAXGROUP - 1))
+        return groups if groups else [0]
+
+    cdef _resize_io_map(self, int size):
+        """Move the IO map into a new buffer of the given size.
+
+        Mapping only calculates the pointers of the slaves and groups into the
+        IO map, so the IO map is sized after mapping and the pointers are moved.
+        Views of the previous mapping keep the old buffer alive.
+        """
+        cdef _MemoryBlock block = _allocate_block(size)
+        cdef char* old_base = self._io_map
+        cdef char* new_base = <char*>block.ptr
+        cdef int i
+        for i in range(self._ec_slavecount + 1):
+            self._ec_slave[i].outputs = <cpysoem.uint8*>_move_pointer(<char*>self._ec_slave[i].outputs, old_base, new_base, size)
+            self._ec_slave[i].inputs = <cpysoem.uint8*>_move_pointer(<char*>self._ec_slave[i].inputs, old_base, new_base, size)
+        for i in range(EC_MAXGROUP):
+            self._ec_group[i].outputs = <cpysoem.uint8*>_move_pointer(<char*>self._ec_group[i].outputs, old_base, new_base, size)
+            self._ec_group[i].inputs = <cpysoem.uint8*>_move_pointer(<char*>self._ec_group[i].inputs, old_base, new_base, size)
+        self._io_map_block = block
+        self._io_map = new_base
+        self._io_map_size = size
+
+    cdef int _check_cyclic_not_running(self) except -1:
+        if cpysoem.soem_cyclic_is_running(&self._cyclic):
+            raise RuntimeError('not allowed while the cyclic processdata exchange is running, call stop_cyclic() first')
+
+    cdef _init_input_snapshot(self):
+        # with several groups the inputs of all groups are copied, together with the outputs between them
+        cdef cpysoem.ec_groupt* first_group = &self._ec_group[self._mapped_groups[0]]
+        cdef cpysoem.ec_groupt* last_group = &self._ec_group[self._mapped_groups[self._num_mapped_groups - 1]]
+        cdef int size = 0
+        if first_group.inputs == NULL or last_group.inputs == NULL:
+            self._input_snapshot_offset = 0
+        else:
+            self._input_snapshot_offset = <char*>first_group.inputs - &self._io_map[0]
+            size = <int>(last_group.inputs + last_group.Ibytes - first_group.inputs)
+        if cpysoem.soem_snapshot_init(&self._input_snapshot, first_group.inputs, size) != 0:
+            raise MemoryError()
+
+    def io_map_layout(self):
+        """Describe where the process data of each slave is located in the IO map.
+
+        Offsets are given in bytes relative to the start of :py:attr:`io_map`, start bits
+        are the bit positions within the first byte. Slaves that have no inputs or outputs
+        have an offset of None for that direction.
+
+        .. versionadded:: 1.2.0
+
+        Returns:
+            list[IoMapLayout]: One element per slave in the order of the slaves list.
+        """
+        cdef cpysoem.ec_slavet* slave
+        layout = []
+        for i in range(1, self._ec_slavecount + 1):
+            slave = &self._ec_slave[i]
+            layout.append(IoMapLayout(i - 1,
+                                      (<bytes>slave.name).decode('utf8'),
+                                      self._io_map_offset(slave.outputs, slave.Obits),
+                                      slave.Obytes,
+                                      slave.Obits,
+                                      slave.Ostartbit,
+                                      self._io_map_offset(slave.inputs, slave.Ibits),
+                                      slave.Ibytes,
+                                      slave.Ibits,
+                                      slave.Istartbit,
+                                      slave.group))
+        return layout
+
+    cdef object _io_map_offset(self, cpysoem.uint8* ptr, int bits):
+        if ptr == NULL or bits == 0:
+            return None
+        return <char*>ptr - &self._io_map[0]
+
     def _collect_mailbox_errors(self):
         # collect SDO or mailbox errors that occurred during PDO configuration read in ecx_config_map_group
         error_list = []
@@ -441,14 +952,266 @@ cdef class CdefMaster:
         """
         self.check_context_is_initialized()
         return cpysoem.ecx_configdc(&self._ecx_contextt)
-        
+
+    cdef _record_startup(self, tuple action):
+        if self._recording_startup:
+            self._startup_actions.append(action)
+
+    def save_config(self, path):
+        """Save the configuration of the network to a file, for a warm restart with :py:meth:`restore_config`.
+
+        The file holds the slaves found by :py:meth:`config_init` with their sync managers and FMMUs, the layout
+        of the IO map, the results of :py:meth:`config_dc`, and the SDO writes and :py:meth:`CdefSlave.dc_sync`
+        calls made by the config functions of the slaves during :py:meth:`config_map`. It can only be restored
+        by the same versions of pysoem and SOEM.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            path (str): Path of the file, an existing file is replaced.
+
+        Raises:
+            RuntimeError: if the slaves were not mapped by :py:meth:`config_map` or :py:meth:`config_overlap_map`
+        """
+        if self._startup_actions is None:
+            raise RuntimeError('the slaves are not mapped, call config_map() first')
+        config = {
+            'format': SAVED_CONFIG_FORMAT,
+            'pysoem_version': _pysoem_version(),
+            'soem_version': _SOEM_VERSION,
+            'slave_size': sizeof(cpysoem.ec_slavet),
+            'group_size': sizeof(cpysoem.ec_groupt),
+            'overlap': bool(self._is_overlap_map),
+            'io_map_size': self._io_map_size,
+            'mapped_groups': [self._mapped_groups[i] for i in range(self._num_mapped_groups)],
+            'dc': bool(self._ec_slave[0].hasdc),
+            'slaves': [self._save_slave(i) for i in range(self._ec_slavecount + 1)],
+            'groups': [self._save_group(i) for i in range(EC_MAXGROUP)],
+            'startup': [_startup_action_to_json(action) for action in self._startup_actions],
+        }
+        with builtins.open(path, 'w') as f:
+            json.dump(config, f)
+
+    cdef dict _save_slave(self, int i):
+        cdef cpysoem.ec_slavet record = self._ec_slave[i]
+        outputs = self._io_map_pointer_offset(record.outputs)
+        inputs = self._io_map_pointer_offset(record.inputs)
+        # pointers are not valid in another process
+        record.outputs = NULL
+        record.inputs = NULL
+        record.PO2SOconfig = NULL
+        record.PO2SOconfigx = NULL
+        record.user = NULL
+        return {'man': record.eep_man,
+                'id': record.eep_id,
+                'rev': record.eep_rev,
+                'serial': record.eep_sn,
+                'outputs': outputs,
+                'inputs': inputs,
+                'record': PyBytes_FromStringAndSize(<char*>&record, sizeof(record)).hex()}
+
+    cdef dict _save_group(self, int i):
+        cdef cpysoem.ec_groupt record = self._ec_group[i]
+        outputs = self._io_map_pointer_offset(record.outputs)
+        inputs = self._io_map_pointer_offset(record.inputs)
+        record.outputs = NULL
+        record.inputs = NULL
+        return {'outputs': outputs,
+                'inputs': inputs,
+                'record': PyBytes_FromStringAndSize(<char*>&record, sizeof(record)).hex()}
+
+    cdef object _io_map_pointer_offset(self, cpysoem.uint8* ptr):
+        if ptr == NULL or <char*>ptr < self._io_map or <char*>ptr > self._io_map + self._io_map_size:
+            return None
+        return <char*>ptr - self._io_map
+
+    cdef cpysoem.uint8* _io_map_pointer(self, offset):
+        if offset is None:
+            return NULL
+        return <cpysoem.uint8*>(self._io_map + <int>offset)
+
+    def restore_config(self, path, *, release_gil=None):
+        """Configure the network from a file written by :py:meth:`save_config`, instead of discovering it again.
+
+        The slaves are counted and get their station addresses, and the vendor ID, product code, revision and
+        serial number in the SII header of each slave are read. Only if the network is the same as in the file,
+        the slaves are configured with the saved sync managers and FMMUs, DC is configured if it was
+        before, and the saved SDO writes and SYNC settings are made again. The config functions of the
+        slaves are not called. Afterwards the slaves are requested to go to SAFE-OP, as after
+        :py:meth:`config_map`.
+
+        If False is returned, the network has to be configured as usual:
+
+        .. code-block:: python
+
+           if not master.restore_config(path):
+               master.config_init()
+               # set the config functions of the slaves
+               master.config_dc()
+               master.config_map()
+               master.save_config(path)
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            path (str): Path of the file.
+            release_gil (:obj:`bool`, optional): True to configure the slaves releasing the GIL. Defaults to False.
+
+        Returns:
+            bool: True if the configuration was restored, False if the file does not exist, was saved by another
+            version of pysoem or SOEM, is not valid, or the network changed.
+
+        Raises:
+            SdoError: if a saved SDO write fails
+            WkcError: if a saved SDO write is not answered
+        """
+        release_gil = self.check_release_gil(release_gil)
+        self.check_context_is_initialized()
+        self._check_cyclic_not_running()
+        self.slaves = []
+        self._startup_actions = None
+        try:
+            with builtins.open(path, 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return False
+        except ValueError as e:
+            logger.info('{} is not valid: {}'.format(path, e))
+            return False
+        reason = _check_saved_config(config)
+        if reason is not None:
+            logger.info('{} can not be restored: {}'.format(path, reason))
+            return False
+        saved_slaves = config['slaves']
+        cdef int count = len(saved_slaves) - 1
+        if self._count_slaves() != count:
+            logger.info('the number of slaves changed')
+            return False
+        if count + 1 > self._ecx_contextt.maxslave:
+            if self._max_slaves is not None:
+                logger.info('the slave list is too small for {} slaves'.format(count))
+                return False
+            self._set_slave_table_size(count + 1)
+        if not self._detect_saved_slaves(saved_slaves, release_gil):
+            return False
+
+        cdef int i
+        cdef cpysoem.ec_slavet* slave
+        cdef cpysoem.ec_groupt* group
+        cdef bytes record
+        self._resize_io_map(config['io_map_size'])
+        for i, saved in enumerate(saved_slaves):
+            record = bytes.fromhex(saved['record'])
+            slave = &self._ec_slave[i]
+            memcpy(slave, <char*>record, sizeof(cpysoem.ec_slavet))
+            slave.outputs = self._io_map_pointer(saved['outputs'])
+            slave.inputs = self._io_map_pointer(saved['inputs'])
+            slave.state = cpysoem.EC_STATE_INIT
+            slave.ALstatuscode = 0
+            slave.mbx_cnt = 0
+            slave.islost = False
+        for i, saved in enumerate(config['groups']):
+            record = bytes.fromhex(saved['record'])
+            group = &self._ec_group[i]
+            memcpy(group, <char*>record, sizeof(cpysoem.ec_groupt))
+            group.outputs = self._io_map_pointer(saved['outputs'])
+            group.inputs = self._io_map_pointer(saved['inputs'])
+        for i, group_number in enumerate(config['mapped_groups']):
+            self._mapped_groups[i] = group_number
+        self._num_mapped_groups = len(config['mapped_groups'])
+        self._is_overlap_map = config['overlap']
+
+        if release_gil:
+            with nogil:
+                _restore_slaves(&self._ecx_contextt, count)
+        else:
+            _restore_slaves(&self._ecx_contextt, count)
+        for i in range(count):
+            self.slaves.append(self._get_slave(i))
+        if config['dc']:
+            cpysoem.ecx_configdc(&self._ecx_contextt)
+        self._startup_actions = []
+        self._recording_startup = True
+        try:
+            for action in config['startup']:
+                if action[0] == 'sdo':
+                    self.slaves[action[1]].sdo_write(action[2], action[3], bytes.fromhex(action[4]), action[5])
+                else:
+                    self.slaves[action[1]].dc_sync(*action[2:])
+        finally:
+            self._recording_startup = False
+        if release_gil:
+            with nogil:
+                _restore_slaves_map(&self._ecx_contextt, count)
+        else:
+            _restore_slaves_map(&self._ecx_contextt, count)
+
+        self._cache_expected_wkc()
+        self._init_input_snapshot()
+        return True
+
+    cdef bint _detect_saved_slaves(self, list saved_slaves, bint release_gil) except -1:
+        """Assign the station addresses and check the slaves against the saved ones."""
+        cdef int wkc
+        cdef int count = len(saved_slaves) - 1
+        cdef int i
+        cdef cpysoem.ec_slavet* slave
+        cdef cpysoem.ec_slavet* saved
+        cdef bytes record
+        cdef cpysoem.soem_sii_readt* reads
+        if release_gil:
+            with nogil:
+                wkc = cpysoem.soem_enum_detect(&self._ecx_contextt)
+        else:
+            wkc = cpysoem.soem_enum_detect(&self._ecx_contextt)
+        if wkc != count:
+            logger.info('the number of slaves changed')
+            return False
+        reads = <cpysoem.soem_sii_readt*>PyMem_Malloc(count * sizeof(cpysoem.soem_sii_readt))
+        if reads == NULL:
+            raise MemoryError()
+        memset(reads, 0, count * sizeof(cpysoem.soem_sii_readt))
+        try:
+            for i in range(count):
+                reads[i].slave = i + 1
+                reads[i].words = SII_IDENTITY_WORDS
+            self._read_sii_parallel(reads, count, release_gil)
+            for i in range(count):
+                record = bytes.fromhex(saved_slaves[i + 1]['record'])
+                if len(record) != sizeof(cpysoem.ec_slavet) or not reads[i].complete:
+                    return False
+                saved = <cpysoem.ec_slavet*><char*>record
+                slave = &self._ec_slave[i + 1]
+                identity = struct.unpack_from('<4I', PyBytes_FromStringAndSize(<char*>reads[i].image,
+                                                                              2 * SII_IDENTITY_WORDS),
+                                              2 * SiiOffset.MAN)
+                if (identity != (saved.eep_man, saved.eep_id, saved.eep_rev, saved.eep_sn) or
+                        slave.configadr != saved.configadr or slave.aliasadr != saved.aliasadr or
+                        slave.topology != saved.topology or slave.activeports != saved.activeports or
+                        slave.parent != saved.parent):
+                    logger.info('slave {} changed'.format(i))
+                    return False
+        finally:
+            for i in range(count):
+                free(reads[i].image)
+            PyMem_Free(reads)
+        return True
+
     def close(self):
         """Close the network interface.
-        
+
+        A running cyclic process data exchange and the mailbox monitor are stopped before,
+        after the pending asynchronous mailbox transfers are finished.
         """
+        self.stop_mailbox_monitor()
+        if self._mailbox_executor is not None:
+            self._mailbox_executor.shutdown(wait=True)
+            self._mailbox_executor = None
+        self.stop_cyclic()
         # ecx_close returns nothing
         self.context_initialized = False
-        cpysoem.ecx_close(&self._ecx_contextt)
+        if self._ecx_port != NULL:
+            cpysoem.ecx_close(&self._ecx_contextt)
 
     def read_state(self):
         """Read all slaves states.
@@ -486,18 +1249,58 @@ cdef class CdefMaster:
         self.check_context_is_initialized()
         return cpysoem.ecx_statecheck(&self._ecx_contextt, 0, expected_state, timeout)
 
-    cdef int __send_processdata_nogil(self):
+    cdef _cache_expected_wkc(self):
+        """Calculate the expected working counters of all groups after mapping."""
+        cdef int group
+        cdef int i
+        for group in range(EC_MAXGROUP):
+            self._group_expected_wkc[group] = cpysoem.soem_expected_wkc(&self._ecx_contextt, group)
+        self._expected_wkc = 0
+        for i in range(self._num_mapped_groups):
+            self._expected_wkc += self._group_expected_wkc[self._mapped_groups[i]]
+        self._sent_expected_wkc = self._expected_wkc
+
+    cdef int _cached_expected_wkc(self, group) except -1:
+        """Expected working counter of a group, or of all mapped groups if group is None."""
+        if group is None:
+            return self._expected_wkc
+        cdef int number = group
+        if not 0 <= number < EC_MAXGROUP:
+            raise ValueError('group must be in the range 0 to {}'.format(EC_MAXGROUP - 1))
+        return self._group_expected_wkc[number]
+
+    def _check_group(self, group):
+        if not 0 <= group < EC_MAXGROUP:
+            raise ValueError('group must be in the range 0 to {}'.format(EC_MAXGROUP - 1))
+
+    cdef int _send_groups(self, int group, cpysoem.boolean overlap) noexcept nogil:
+        """Send the processdata of one group, or of all mapped groups if group is -1."""
+        cdef int i
+        cdef int result = 1
+        if group >= 0:
+            if overlap:
+                return cpysoem.ecx_send_overlap_processdata_group(&self._ecx_contextt, group)
+            return cpysoem.ecx_send_processdata_group(&self._ecx_contextt, group)
+        for i in range(self._num_mapped_groups):
+            if overlap:
+                if not cpysoem.ecx_send_overlap_processdata_group(&self._ecx_contextt, self._mapped_groups[i]):
+                    result = 0
+            elif not cpysoem.ecx_send_processdata_group(&self._ecx_contextt, self._mapped_groups[i]):
+                result = 0
+        return result
+
+    cdef int __send_processdata_nogil(self, int group, cpysoem.boolean overlap):
         """Transmit processdata to slaves without GIL."""
         cdef int result
         
         Py_INCREF(self)
         with nogil:
-            result = cpysoem.ecx_send_processdata(&self._ecx_contextt)
+            result = self._send_groups(group, overlap)
         Py_DECREF(self)
         
         return result
         
-    def send_processdata(self, *, release_gil=None):
+    def send_processdata(self, *, group=None, release_gil=None):
         """Transmit processdata to slaves.
         
         Uses LRW, or LRD/LWR if LRW is not allowed (blockLRW).
@@ -509,25 +1312,43 @@ cdef class CdefMaster:
         In order to recombine the slave response, a stack is used.
 
         Args:
+            group (:obj:`int`, optional): Only transmit the processdata of this group. By default the
+                processdata of all groups mapped by config_map() is transmitted.
             release_gil (:obj:`bool`, optional): True to transmit processdata releasing the GIL. Defaults to False.
         
         Returns:
             int: >0 if processdata is transmitted, might only by 0 if config map is not configured properly
+
+        .. versionchanged:: 1.2.0
+           Added the group parameter.
         """
         release_gil = self.check_release_gil(release_gil)
         self.check_context_is_initialized()
+        self._check_cyclic_not_running()
+        self._sent_expected_wkc = self._cached_expected_wkc(group)
+        cpysoem.soem_stats_record_send(&self._cycle_stats)
         if release_gil:
-            return self.__send_processdata_nogil()
-        return cpysoem.ecx_send_processdata(&self._ecx_contextt)
+            return self.__send_processdata_nogil(-1 if group is None else group, False)
+        return self._send_groups(-1 if group is None else group, False)
 
-    def send_overlap_processdata(self):
+    def send_overlap_processdata(self, *, group=None):
         """Transmit overlap processdata to slaves.
+
+        Args:
+            group (:obj:`int`, optional): Only transmit the processdata of this group. By default the
+                processdata of all groups mapped by config_overlap_map() is transmitted.
         
         Returns:
             int: >0 if processdata is transmitted, might only by 0 if config map is not configured properly
+
+        .. versionchanged:: 1.2.0
+           Added the group parameter.
         """
         self.check_context_is_initialized()
-        return cpysoem.ecx_send_overlap_processdata(&self._ecx_contextt)
+        self._check_cyclic_not_running()
+        self._sent_expected_wkc = self._cached_expected_wkc(group)
+        cpysoem.soem_stats_record_send(&self._cycle_stats)
+        return self._send_groups(-1 if group is None else group, True)
 
     cdef int __receive_processdata_nogil(self, int timeout):
         """Receive processdata from slaves without GIL.
@@ -539,7 +1360,7 @@ cdef class CdefMaster:
         
         Py_INCREF(self)
         with nogil:
-            result = cpysoem.ecx_receive_processdata(&self._ecx_contextt, timeout)
+            result = cpysoem.ecx_receive_processdata_group(&self._ecx_contextt, self._mapped_groups[0], timeout)
         Py_DECREF(self)
         
         return result
@@ -550,6 +1371,8 @@ cdef class CdefMaster:
         Second part from send_processdata().
         Received datagrams are recombined with the processdata with help from the stack.
         If a datagram contains input processdata it copies it to the processdata structure.
+        The processdata of all groups transmitted since the last call is received,
+        the working counter is the sum of the working counters of these groups.
 
         Args:
             timeout (int): Timeout in us.
@@ -559,10 +1382,619 @@ cdef class CdefMaster:
         """
         release_gil = self.check_release_gil(release_gil)
         self.check_context_is_initialized()
+        self._check_cyclic_not_running()
+        cdef int wkc
         if release_gil:
-            return self.__receive_processdata_nogil(timeout)
-        return cpysoem.ecx_receive_processdata(&self._ecx_contextt, timeout)
+            wkc = self.__receive_processdata_nogil(timeout)
+        else:
+            wkc = cpysoem.ecx_receive_processdata_group(&self._ecx_contextt, self._mapped_groups[0], timeout)
+        cpysoem.soem_stats_record_receive(&self._cycle_stats, wkc, self._sent_expected_wkc)
+        cpysoem.soem_snapshot_publish(&self._input_snapshot, wkc, self._ec_DCtime)
+        return wkc
+
+    def exchange_processdata(self, int timeout=2000, *, group=None):
+        """Transmit processdata to the slaves and receive it back in one call.
+
+        Combines send_processdata() and receive_processdata(), or send_overlap_processdata()
+        when the IO map was created by config_overlap_map(). Both are done in a single section
+        that releases the GIL. The working counter is compared against the expected working
+        counter that was calculated by the last config_map() call, mismatches are also counted
+        in :py:meth:`cycle_stats`.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            timeout (int): Timeout in us for receiving the processdata.
+            group (:obj:`int`, optional): Only exchange the processdata of this group. By default the
+                processdata of all mapped groups is exchanged.
+
+        Returns:
+            tuple[int, bool]: Working counter, and True if it equals the expected working counter.
+        """
+        if not self.context_initialized:
+            self.check_context_is_initialized()
+        self._check_cyclic_not_running()
+        cdef int expected_wkc = self._cached_expected_wkc(group)
+        cdef int send_group = -1 if group is None else group
+        cdef int wkc
+
+        Py_INCREF(self)
+        with nogil:
+            cpysoem.soem_stats_record_send(&self._cycle_stats)
+            self._send_groups(send_group, self._is_overlap_map)
+            wkc = cpysoem.ecx_receive_processdata_group(&self._ecx_contextt, self._mapped_groups[0], timeout)
+            cpysoem.soem_stats_record_receive(&self._cycle_stats, wkc, expected_wkc)
+            cpysoem.soem_snapshot_publish(&self._input_snapshot, wkc, self._ec_DCtime)
+        Py_DECREF(self)
+
+        return wkc, wkc == expected_wkc
     
+    def start_cyclic(self, period_ns, timeout=2000, *, rt_priority=0, dc_sync_offset_ns=None, group_periods=None):
+        """Start exchanging processdata cyclically in a native background thread.
+
+        The thread calls send_processdata() and receive_processdata() every period_ns nanoseconds,
+        or send_overlap_processdata() when the IO map was created by config_overlap_map().
+        The cycles are scheduled on absolute deadlines of a monotonic clock, no Python code and no GIL
+        is involved in a cycle. Use :py:attr:`cyclic_wkc` and :py:attr:`cycle_count` to observe the
+        exchange, and the slaves input and output views to access the process data.
+
+        While the cyclic exchange is running, send_processdata(), receive_processdata() and
+        exchange_processdata() raise RuntimeError.
+
+        With dc_sync_offset_ns, the cycles are locked to the DC reference clock: after each cycle the next deadline
+        is corrected by a PI controller, so that the frames pass the reference clock dc_sync_offset_ns after
+        its SYNC0 events. This requires config_dc(), and SYNC0 activated with a cycle time of period_ns.
+        The SOEM examples use 50 us as offset. The controller is observed with :py:meth:`cycle_stats`.
+
+        If the slaves were assigned to several groups before config_map(), each group can be exchanged with its
+        own cycle time given in group_periods. Groups that are due in the same cycle are exchanged one after
+        the other, the groups with the shortest cycle time first. :py:attr:`cycle_count` then counts the wakeups
+        of the thread, :py:meth:`cyclic_group_count` the exchanges of a group. The DC synchronization uses the
+        first of these groups with DC slaves, its cycle time must be the SYNC0 cycle time.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            period_ns (int): Cycle time in ns.
+            timeout (int): Timeout in us for receiving the processdata.
+            rt_priority (:obj:`int`, optional): If greater than 0, run the thread with this real-time priority
+                (SCHED_FIFO on Linux and macOS, time critical on Windows). This usually requires elevated privileges.
+            dc_sync_offset_ns (:obj:`int`, optional): If given, synchronize the cycles to the SYNC0 events
+                of the DC reference clock, with this offset in ns.
+            group_periods (:obj:`dict`, optional): Cycle time in ns of a group, keyed by the group number.
+                Mapped groups that are not contained are exchanged every period_ns.
+
+        Raises:
+            RuntimeError: if the cyclic exchange is already running, or DC synchronization
+                was requested but no DC slaves are configured
+            ValueError: if a cycle time is not greater than 0, or group_periods contains a group that is not mapped
+            OSError: if the thread could not be started
+        """
+        self.check_context_is_initialized()
+        if cpysoem.soem_cyclic_is_running(&self._cyclic):
+            raise RuntimeError('cyclic processdata exchange is already running')
+        mapped_groups = [self._mapped_groups[i] for i in range(self._num_mapped_groups)]
+        periods = {group: period_ns for group in mapped_groups}
+        if group_periods is not None:
+            for group, group_period_ns in group_periods.items():
+                if group not in periods:
+                    raise ValueError('group {} is not mapped'.format(group))
+                periods[group] = group_period_ns
+        if any(period <= 0 for period in periods.values()):
+            raise ValueError('period_ns must be greater than 0')
+        schedule = sorted(periods.items(), key=lambda item: (item[1], item[0]))
+        cdef cpysoem.uint8 groups[EC_MAXGROUP]
+        cdef cpysoem.int64 periods_ns[EC_MAXGROUP]
+        for i, (group, group_period_ns) in enumerate(schedule):
+            groups[i] = group
+            periods_ns[i] = group_period_ns
+        cdef int dc_sync = dc_sync_offset_ns is not None
+        if dc_sync and not any(self._ecx_contextt.grouplist[group].hasdc for group in mapped_groups):
+            raise RuntimeError('no DC slaves configured, call config_dc() first')
+        cdef int ret_val = cpysoem.soem_cyclic_start(&self._cyclic, &self._ecx_contextt, &self._cycle_stats,
+                                                     &self._input_snapshot, groups, periods_ns, len(schedule),
+                                                     timeout, self._is_overlap_map, rt_priority,
+                                                     dc_sync, dc_sync_offset_ns if dc_sync else 0)
+        if ret_val != 0:
+            raise OSError(ret_val, 'could not start the cyclic processdata thread')
+
+    def stop_cyclic(self):
+        """Stop the cyclic processdata exchange started with start_cyclic().
+
+        Blocks until the current cycle is finished. Does nothing if the exchange is not running.
+
+        .. versionadded:: 1.2.0
+        """
+        with nogil:
+            cpysoem.soem_cyclic_stop(&self._cyclic)
+
+    def read_input_snapshot(self, buffer=None):
+        """Get a consistent copy of the input processdata of the last successful receive.
+
+        Every receive_processdata(), exchange_processdata() and every cycle of the cyclic exchange that
+        received frames publishes a copy of the inputs into one of two buffers. Reading it never blocks the
+        receiving thread, and the copy is never mixed from two different cycles, even if it is read by
+        another thread while new processdata is received.
+
+        The inputs are copied into ``buffer`` at the same offsets they have in :py:attr:`io_map`,
+        so the offsets from :py:meth:`io_map_layout` can be used. Other parts of ``buffer`` are not touched,
+        except with several groups, where the outputs between the inputs of the groups are copied too.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            buffer (:obj:`bytearray`, optional): Writable bytes-like object with at least the size of
+                the IO map, to be reused for each call. A new bytearray is created if not given.
+
+        Returns:
+            InputSnapshot: The snapshot, or None if no inputs were received since config_map().
+            ``cycle`` counts the receives since config_map(), ``timestamp_ns`` is the time of the receive
+            on the monotonic clock, as returned by :func:`time.monotonic_ns` on most platforms,
+            ``dc_time`` the DC time and ``wkc`` the working counter of that receive, and ``data``
+            is the buffer holding the inputs.
+        """
+        if buffer is None:
+            buffer = bytearray(self._io_map_size)
+        cdef unsigned char[:] out = buffer
+        cdef int offset = self._input_snapshot_offset
+        if out.shape[0] < offset + self._input_snapshot.size:
+            raise ValueError('buffer must have at least {} bytes'.format(offset + self._input_snapshot.size))
+        cdef unsigned char dummy
+        cdef unsigned char* pout = &out[0] + offset if out.shape[0] > 0 else &dummy
+        cdef uint64_t cycle
+        cdef int64_t timestamp_ns
+        cdef int64_t dc_time
+        cdef int wkc
+        cdef int is_published
+        with nogil:
+            is_published = cpysoem.soem_snapshot_read(&self._input_snapshot, pout, &cycle, &timestamp_ns, &dc_time, &wkc)
+        if not is_published:
+            return None
+        return InputSnapshot(cycle, timestamp_ns, dc_time, wkc, buffer)
+
+    def cycle_stats(self):
+        """Get a snapshot of the timing statistics of the processdata exchange.
+
+        The statistics are recorded natively by send_processdata() / receive_processdata()
+        and by the cyclic exchange started with start_cyclic(). Wakeup latency and overruns
+        are only recorded by the cyclic exchange, as only there the cycles have a deadline.
+        A cycle is an overrun when it ended after the start of the next cycle was due.
+
+        The histograms have one bin per power of two, bin i counts durations in the
+        range [2**i, 2**(i+1)) ns, the last bin also counts all longer durations.
+
+        The ``dc_*`` values are only recorded by a cyclic exchange synchronized with
+        ``dc_sync_offset_ns``: ``dc_offset`` is the histogram of the absolute phase error to the
+        SYNC0 events, ``dc_offset_ns`` the signed phase error of the last cycle (positive if the frame
+        was late), ``dc_correction_ns`` the correction of the last deadline and ``dc_drift_ns`` its
+        integral part, which follows the drift between the local clock and the reference clock.
+
+        .. versionadded:: 1.2.0
+
+        Returns:
+            CycleStats: The statistics since the start or the last reset_cycle_stats() call.
+        """
+        cdef cpysoem.soem_cyclestatst snapshot
+        with nogil:
+            cpysoem.soem_stats_snapshot(&self._cycle_stats, &snapshot)
+        return CycleStats(snapshot.cycles,
+                          snapshot.wkc_mismatches,
+                          snapshot.overruns,
+                          _timing_stats(&snapshot.wakeup_latency),
+                          _timing_stats(&snapshot.roundtrip),
+                          _timing_stats(&snapshot.dc_offset),
+                          snapshot.dc_offset_ns,
+                          snapshot.dc_correction_ns,
+                          snapshot.dc_drift_ns)
+
+    def reset_cycle_stats(self):
+        """Clear the timing statistics of the processdata exchange.
+
+        .. versionadded:: 1.2.0
+        """
+        if cpysoem.soem_cyclic_is_running(&self._cyclic):
+            # the cyclic thread is the only writer, let it do the reset
+            cpysoem.soem_stats_request_reset(&self._cycle_stats)
+        else:
+            cpysoem.soem_stats_reset(&self._cycle_stats)
+
+    def _get_cyclic_running(self):
+        """True while the cyclic processdata exchange started with start_cyclic() is running.
+
+        .. versionadded:: 1.2.0
+        """
+        return cpysoem.soem_cyclic_is_running(&self._cyclic) != 0
+
+    def _get_cyclic_wkc(self):
+        """Working counter of the last cycle of the cyclic processdata exchange.
+
+        .. versionadded:: 1.2.0
+        """
+        return cpysoem.soem_cyclic_wkc(&self._cyclic)
+
+    def _get_cycle_count(self):
+        """Number of cycles done since the cyclic processdata exchange was started.
+
+        .. versionadded:: 1.2.0
+        """
+        return cpysoem.soem_cyclic_count(&self._cyclic)
+
+    def cyclic_group_wkc(self, group):
+        """Working counter of the last exchange of a group by the cyclic processdata exchange.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            group (int): Group number.
+
+        Returns:
+            int: Working counter, -1 if the group is not exchanged cyclically.
+        """
+        self._check_group(group)
+        return cpysoem.soem_cyclic_group_wkc(&self._cyclic, group)
+
+    def cyclic_group_count(self, group):
+        """Number of exchanges of a group since the cyclic processdata exchange was started.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            group (int): Group number.
+
+        Returns:
+            int: Number of exchanges.
+        """
+        self._check_group(group)
+        return cpysoem.soem_cyclic_group_count(&self._cyclic, group)
+
+    def sdo_read_all(self, index, uint8_t subindex, int size=0, ca=False, *, slaves=None, data_type=None):
+        """Read the same CoE object from many slaves concurrently.
+
+        In contrast to calling :py:meth:`CdefSlave.sdo_read` for each slave, the upload requests are placed
+        in the mailboxes of all slaves at once, and the mailboxes of all slaves that did not answer yet are
+        polled with shared frames. So the slaves process the requests in parallel, and reading an object
+        from many slaves takes about as long as reading it from the slowest one. Responses that need a
+        segmented transfer are finished one after the other at the end.
+        The GIL is released while the objects are read.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            index (int): Index of the object.
+            subindex (int): Subindex of the object.
+            size (:obj:`int`, optional): The size of the reading buffer of each slave.
+                Without a size, objects up to 256 bytes can be read.
+            ca (:obj:`bool`, optional): complete access.
+            slaves (:obj:`list[int]`, optional): Positions of the slaves in :py:attr:`slaves` to read from.
+                By default all slaves that support CoE are read.
+            data_type (:obj:`ec_datatype`, optional): Convert the content like :py:meth:`CdefSlave.sdo_read_typed`.
+
+        Returns:
+            dict[int, SdoResult]: The result of each slave by its position, in the order the reads
+            were finished. See :py:meth:`CdefSlave.sdo_read_many`.
+
+        Raises:
+            IndexError: if a slave position is out of range
+            ValueError: if a slave position is given twice
+        """
+        self.check_context_is_initialized()
+        if slaves is None:
+            positions = [pos for pos in range(self._ec_slavecount)
+                         if self._ec_slave[pos + 1].mbx_proto & cpysoem.ECT_MBXPROT_COE]
+        else:
+            positions = list(slaves)
+            if len(set(positions)) != len(positions):
+                raise ValueError('every slave can only be read once')
+            for pos in positions:
+                if not 0 <= pos < self._ec_slavecount:
+                    raise IndexError('requested slave device is not available')
+        if size == 0:
+            size = STATIC_SDO_READ_BUFFER_SIZE
+        elif size < 0:
+            raise ValueError('size must be greater than 0')
+
+        cdef int count = len(positions)
+        cdef cpysoem.soem_sdo_requestt* requests = <cpysoem.soem_sdo_requestt*>PyMem_Malloc(max(count, 1) * sizeof(cpysoem.soem_sdo_requestt))
+        cdef unsigned char* buffer = <unsigned char*>PyMem_Malloc(max(count, 1) * size)
+        cdef cpysoem.soem_emergenciest emergencies
+        emergencies.capacity = 4 * count + 16
+        emergencies.count = 0
+        emergencies.errors = <cpysoem.ec_errort*>PyMem_Malloc(emergencies.capacity * sizeof(cpysoem.ec_errort))
+        cdef int timeout = self.sdo_read_timeout
+        cdef cpysoem.soem_sdo_requestt* request
+        cdef CdefSlave slave
+        cdef int i
+        try:
+            if requests == NULL or buffer == NULL or emergencies.errors == NULL:
+                raise MemoryError()
+            for i, pos in enumerate(positions):
+                requests[i].slave = pos + 1
+                requests[i].index = index
+                requests[i].subindex = subindex
+                requests[i].ca = ca
+                requests[i].size = size
+                requests[i].data = buffer + i * size
+
+            Py_INCREF(self)
+            with nogil:
+                cpysoem.soem_sdo_read_parallel(&self._ecx_contextt, requests, count, timeout, &emergencies)
+            Py_DECREF(self)
+
+            for i in range(emergencies.count):
+                if not 0 < emergencies.errors[i].Slave <= len(self.slaves):
+                    # not from a slave, e.g. an error of the master with slave 0
+                    logger.warning('emergency without a slave: error code 0x{:04X}'.format(
+                        emergencies.errors[i].ErrorCode))
+                    continue
+                slave = self.slaves[emergencies.errors[i].Slave - 1]
+                if len(slave._emcy_callbacks) > 0:
+                    slave._on_emergency(&emergencies.errors[i])
+
+            results = []
+            for i in range(count):
+                request = &requests[i]
+                slave = self.slaves[request.slave - 1]
+                data = None
+                abort_code = 0
+                error = None
+                if request.has_error:
+                    error = slave._make_exception(&request.error)
+                    if request.error.Etype == cpysoem.EC_ERR_TYPE_SDO_ERROR:
+                        abort_code = request.error.AbortCode
+                elif not request.wkc > 0:
+                    error = WkcError(wkc=request.wkc)
+                else:
+                    data = PyBytes_FromStringAndSize(<char*>request.data, request.size)
+                results.append((request.completion, request.slave - 1,
+                                SdoResult(index, subindex, data, request.wkc, abort_code, error)))
+            results.sort()
+            if data_type is not None:
+                return {pos: _decode_sdo_result(result, data_type) for _, pos, result in results}
+            return {pos: result for _, pos, result in results}
+        finally:
+            PyMem_Free(emergencies.errors)
+            PyMem_Free(buffer)
+            PyMem_Free(requests)
+
+    def _submit_mailbox_transfer(self, fn, *args, **kwargs):
+        """Run a mailbox transfer in the mailbox worker thread of the master."""
+        self.check_context_is_initialized()
+        if self._mailbox_executor is None:
+            self._mailbox_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                                           thread_name_prefix='pysoem-mailbox')
+        return self._mailbox_executor.submit(fn, *args, **kwargs)
+
+    def start_mailbox_monitor(self, callback=None, interval_us=10000, *, max_events=1024):
+        """Watch the mailboxes of all CoE slaves for emergencies in a background thread.
+
+        Every interval_us the mailbox status of all slaves is read, with one frame for up to 64 slaves, and the
+        mailboxes that have something in are read out. The received emergencies, and any other error the master
+        recorded meanwhile, are taken from the error list of the master, so it can not overflow, and are queued as
+        :py:class:`MailboxEvent`. The polls are done by the mailbox worker thread, in turn with the transfers of
+        :py:meth:`CdefSlave.sdo_read_async` and :py:meth:`CdefSlave.sdo_write_async`, releasing the GIL.
+        Blocking mailbox transfers from other threads should be avoided while the monitor is running,
+        their responses or errors could be taken by the monitor.
+
+        With a callback, it gets the new events of each poll as a list, called from the monitor thread.
+        Without one, the events are kept until they are fetched by :py:meth:`get_mailbox_events`.
+        Callbacks added with :py:meth:`CdefSlave.add_emergency_callback` are notified as well.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            callback (:obj:`callable`, optional): Called with a list of :py:class:`MailboxEvent`.
+            interval_us (:obj:`int`, optional): Time in us between two polls.
+            max_events (:obj:`int`, optional): Number of events kept in the queue. When it is full, the oldest
+                events are dropped and counted in :py:attr:`mailbox_events_dropped`.
+
+        Raises:
+            RuntimeError: if the mailbox monitor is already running
+            ValueError: if interval_us or max_events is not greater than 0
+        """
+        self.check_context_is_initialized()
+        if self._mailbox_monitor is not None:
+            raise RuntimeError('mailbox monitor is already running')
+        if interval_us <= 0 or max_events <= 0:
+            raise ValueError('interval_us and max_events must be greater than 0')
+        self._mailbox_events = collections.deque(self._mailbox_events, maxlen=max_events)
+        self._mailbox_monitor_stop = threading.Event()
+        self._mailbox_monitor = threading.Thread(target=self._run_mailbox_monitor,
+                                                 args=(self._mailbox_monitor_stop, callback, interval_us / 1e6),
+                                                 name='pysoem-mailbox-monitor',
+                                                 daemon=True)
+        self._mailbox_monitor.start()
+
+    def stop_mailbox_monitor(self):
+        """Stop the mailbox monitor started with start_mailbox_monitor().
+
+        Blocks until the current poll is finished. Does nothing if the monitor is not running.
+
+        .. versionadded:: 1.2.0
+        """
+        if self._mailbox_monitor is None:
+            return
+        self._mailbox_monitor_stop.set()
+        if self._mailbox_monitor is not threading.current_thread():
+            self._mailbox_monitor.join()
+        self._mailbox_monitor = None
+
+    def get_mailbox_events(self):
+        """Take the events queued by the mailbox monitor.
+
+        .. versionadded:: 1.2.0
+
+        Returns:
+            list[MailboxEvent]: The events in the order they were received, an empty list if there are none.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._mailbox_events.popleft())
+            except IndexError:
+                return events
+
+    def _run_mailbox_monitor(self, stop, callback, interval):
+        while not stop.wait(interval):
+            try:
+                num_events = self._submit_mailbox_transfer(self._poll_mailboxes).result()
+            except Exception:
+                logger.exception('mailbox monitor stopped')
+                return
+            if callback is not None and num_events > 0:
+                events = self.get_mailbox_events()
+                try:
+                    callback(events)
+                except Exception:
+                    logger.exception('mailbox monitor callback failed')
+
+    def _poll_mailboxes(self):
+        self.check_context_is_initialized()
+        positions = [pos for pos in range(1, self._ec_slavecount + 1)
+                     if self._ec_slave[pos].mbx_proto & cpysoem.ECT_MBXPROT_COE]
+        cdef int count = len(positions)
+        cdef uint16_t* slaves = <uint16_t*>PyMem_Malloc(max(count, 1) * sizeof(uint16_t))
+        cdef cpysoem.soem_emergenciest errors
+        errors.capacity = 2 * count + EC_MAXELIST
+        errors.count = 0
+        errors.errors = <cpysoem.ec_errort*>PyMem_Malloc(errors.capacity * sizeof(cpysoem.ec_errort))
+        cdef cpysoem.ec_errort* err
+        cdef CdefSlave slave
+        cdef int i
+        try:
+            if slaves == NULL or errors.errors == NULL:
+                raise MemoryError()
+            for i in range(count):
+                slaves[i] = positions[i]
+            Py_INCREF(self)
+            with nogil:
+                cpysoem.soem_mbx_poll_emergencies(&self._ecx_contextt, slaves, count, &errors)
+            Py_DECREF(self)
+
+            for i in range(errors.count):
+                err = &errors.errors[i]
+                if err.Etype == cpysoem.EC_ERR_TYPE_EMERGENCY:
+                    error = Emergency(err.Slave, err.ErrorCode, err.ErrorReg, err.b1, err.w1, err.w2)
+                else:
+                    error = _exception_from_error(err)
+                if len(self._mailbox_events) == self._mailbox_events.maxlen:
+                    self.mailbox_events_dropped += 1
+                self._mailbox_events.append(MailboxEvent(err.Time.sec + err.Time.usec / 1e6, err.Slave, error))
+                if err.Etype == cpysoem.EC_ERR_TYPE_EMERGENCY and 0 < err.Slave <= len(self.slaves):
+                    slave = self.slaves[err.Slave - 1]
+                    if len(slave._emcy_callbacks) > 0:
+                        slave._on_emergency(err)
+            return errors.count
+        finally:
+            PyMem_Free(errors.errors)
+            PyMem_Free(slaves)
+
+    def update_firmware(self, filename, files, password=0, timeout=6_000_000, *, progress=None,
+                        progress_interval_us=100000, state_timeout=3_000_000):
+        """Update the firmware of several slaves in parallel.
+
+        This does for all slaves together, what an update of a single slave does step by step: request the INIT
+        state, change the mailboxes to the boot mailbox configuration of the SII, request the BOOT state,
+        download the file with FoE, and request the INIT state again. The state changes are requested for all
+        slaves at once, the boot mailbox configuration is read once per vendor ID, product code and revision, and
+        the downloads run concurrently, one thread per slave, releasing the GIL. Each download keeps its errors
+        in an own error list, as the error list of SOEM is not thread safe.
+
+        A slave that fails a step is left out from the following ones, the others continue.
+        Call config_init() after the update, to configure the slaves with their new firmware.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            filename (str): Name of the file on the slaves, many devices expect a particular name for a firmware.
+            files (dict): The firmware by the position of the slave in :py:attr:`slaves`,
+                anything :py:meth:`CdefSlave.foe_write` accepts as data, e.g. the path of the firmware file.
+            password (:obj:`int`, optional): FoE password.
+            timeout (:obj:`int`, optional): FoE timeout in us.
+            progress (:obj:`callable`, optional): Called with the position of a slave, the number of bytes
+                written so far and the size of its firmware, from the download threads.
+            progress_interval_us (:obj:`int`, optional): Minimum time in us between two progress calls per slave.
+            state_timeout (:obj:`int`, optional): Time in us the slaves get to reach a requested state.
+
+        Returns:
+            dict[int, FirmwareUpdateResult]: The result by the position of the slave, with the size of the firmware,
+            the duration of the download in seconds, and the exception that stopped the update of the slave,
+            None on success.
+
+        Raises:
+            IndexError: if a slave position is out of range
+        """
+        self.check_context_is_initialized()
+        for pos in files:
+            if not 0 <= pos < self._ec_slavecount:
+                raise IndexError('requested slave device is not available')
+        slaves = {pos: self.slaves[pos] for pos in files}
+        sizes = {pos: os.path.getsize(data) if isinstance(data, (str, os.PathLike)) else memoryview(data).nbytes
+                 for pos, data in files.items()}
+        durations = {pos: 0.0 for pos in files}
+        errors = {}
+
+        self._request_slave_states(slaves, INIT_STATE, state_timeout, errors)
+        boot_mailboxes = {}
+        for pos, slave in slaves.items():
+            if pos in errors:
+                continue
+            try:
+                identity = (slave.man, slave.id, slave.rev)
+                if identity not in boot_mailboxes:
+                    boot_mailboxes[identity] = struct.unpack('<HHHH', slave.eeprom_read(SiiOffset.BOOT_RX_MBX) +
+                                                                      slave.eeprom_read(SiiOffset.BOOT_TX_MBX))
+                rx_mbx_addr, rx_mbx_len, tx_mbx_addr, tx_mbx_len = boot_mailboxes[identity]
+                slave.amend_mbx(mailbox='out', start_address=rx_mbx_addr, size=rx_mbx_len)
+                slave.amend_mbx(mailbox='in', start_address=tx_mbx_addr, size=tx_mbx_len)
+            except Exception as ex:
+                errors[pos] = ex
+        self._request_slave_states(slaves, BOOT_STATE, state_timeout, errors)
+
+        def download(pos):
+            slave_progress = None
+            if progress is not None:
+                slave_progress = lambda written, total: progress(pos, written, total)
+            start = time.monotonic()
+            try:
+                return (<CdefSlave>slaves[pos])._foe_write(filename, password, files[pos], timeout, True,
+                                                           slave_progress, progress_interval_us, True)
+            finally:
+                durations[pos] = time.monotonic() - start
+
+        downloads = [pos for pos in slaves if pos not in errors]
+        logger.debug('FoE download to {} slaves'.format(len(downloads)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(downloads), 1),
+                                                   thread_name_prefix='pysoem-foe') as executor:
+            futures = {pos: executor.submit(download, pos) for pos in downloads}
+        for pos, future in futures.items():
+            if pos not in errors:
+                if future.exception() is not None:
+                    errors[pos] = future.exception()
+                elif not future.result() > 0:
+                    errors[pos] = WkcError(wkc=future.result())
+
+        self._request_slave_states({pos: slaves[pos] for pos in downloads}, INIT_STATE, state_timeout, errors)
+        return {pos: FirmwareUpdateResult(sizes[pos], durations[pos], errors.get(pos)) for pos in files}
+
+    def _request_slave_states(self, slaves, state, timeout_us, errors):
+        """Request a state for the slaves not in errors, and wait for them. Slaves that do not reach it are
+        added to errors."""
+        pending = {}
+        for pos, slave in slaves.items():
+            if pos not in errors:
+                slave.state = state
+                slave.write_state()
+                pending[pos] = slave
+        deadline = time.monotonic() + timeout_us / 1e6
+        while pending:
+            self.read_state()
+            pending = {pos: slave for pos, slave in pending.items() if slave.state & 0x0F != state}
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        for pos in pending:
+            errors[pos] = FirmwareUpdateError(pos, state, 'slave {} did not reach state {:#x}'.format(pos, state))
+
     def _get_slave(self, int pos):
         if pos < 0:
             raise IndexError('requested slave device is not available')
@@ -572,6 +2004,7 @@ cdef class CdefMaster:
         ethercat_slave._master = self
         ethercat_slave._ecx_contextt = &self._ecx_contextt
         ethercat_slave._ec_slave = &self._ec_slave[pos+1] # +1 as _ec_slave[0] is reserved
+        ethercat_slave._slave_table = self._slave_table
         ethercat_slave._the_masters_settings = &self._settings
         return ethercat_slave
         
@@ -586,14 +2019,38 @@ cdef class CdefMaster:
         self._ec_slave[0].state = value
     
     def _get_expected_wkc(self):
-        """Calculates the expected Working Counter"""
-        return (self._ec_group[0].outputsWKC * 2) + self._ec_group[0].inputsWKC
-    
-    def _get_dc_time(self):
-        """DC time in ns required to synchronize the EtherCAT cycle with SYNC0 cycles.
+        """Expected Working Counter, summed over all groups mapped by config_map()"""
+        return self._expected_wkc
 
-        Note EtherCAT cycle here means the call of send_processdata and receive_processdata."""
-        return self._ec_DCtime
+    def group_expected_wkc(self, group):
+        """Expected working counter of the processdata of one group.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            group (int): Group number.
+
+        Returns:
+            int: Expected working counter.
+        """
+        return self._cached_expected_wkc(group)
+    
+    def _get_io_map(self):
+        """Writable view on the complete IO map, with the size returned by the last config_map() call.
+
+        The :class:`memoryview` points directly into the process image, so it can be turned into
+        a NumPy array without copying the data: ``numpy.frombuffer(master.io_map, dtype=numpy.uint8)``.
+        Use :py:meth:`io_map_layout` to find the process data of a certain slave.
+
+        .. versionadded:: 1.2.0
+        """
+        return _make_process_data_view(self._io_map_block, &self._io_map[0], self._io_map_size, False)
+
+    def _get_dc_time(self):
+        """DC time in ns required to synchronize the EtherCAT cycle with SYNC0 cycles.
+
+        Note EtherCAT cycle here means the call of send_processdata and receive_processdata."""
+        return self._ec_DCtime
     
     def _set_manual_state_change(self, int manual_state_change):
         """Set manualstatechange variable in context.
@@ -742,11 +2199,139 @@ class WkcError(Exception):
         self.message = message
         self.wkc = wkc
 
+class FirmwareUpdateError(Exception):
+    """Firmware update error
+
+    A device did not take the state required for the firmware update in time.
+
+    .. versionadded:: 1.2.0
+
+    Attributes:
+        slave_pos (int): Position of the slave
+        state (int): The requested state
+    """
+
+    def __init__(self, slave_pos, state, message):
+        self.slave_pos = slave_pos
+        self.state = state
+        self.message = message
+
+
 class NetworkInterfaceNotOpenError(Exception):
     """Error when a master or slave method is used and the context has not been initialized."""
     pass
 
 
+cdef int _set_sii_read(cpysoem.soem_sii_readt* read, bytes data) except -1:
+    """Replace the image of a read, it is complete."""
+    cdef int size = len(data)
+    cdef uint8_t* image = <uint8_t*>realloc(read.image, size)
+    if image == NULL:
+        raise MemoryError()
+    memcpy(image, <const char*>data, size)
+    read.image = image
+    read.size = size
+    read.length = size
+    read.words = 0
+    return 0
+
+
+cdef void _configure_slaves(cpysoem.ecx_contextt* context, cpysoem.soem_sii_readt* reads, int count) noexcept nogil:
+    cdef int i
+    for i in range(count):
+        cpysoem.soem_enum_configure(context, reads[i].slave, reads[i].image, reads[i].length)
+
+
+cdef void _restore_slaves(cpysoem.ecx_contextt* context, int count) noexcept nogil:
+    cdef int slave
+    for slave in range(1, count + 1):
+        cpysoem.soem_enum_restore(context, slave)
+    if context.manualstatechange == 0:
+        cpysoem.ecx_statecheck(context, 0, cpysoem.EC_STATE_PRE_OP, cpysoem.soem_timeouts.state)
+
+
+cdef void _restore_slaves_map(cpysoem.ecx_contextt* context, int count) noexcept nogil:
+    cdef int slave
+    for slave in range(1, count + 1):
+        cpysoem.soem_enum_restore_map(context, slave)
+
+
+def _startup_action_to_json(action):
+    if action[0] == 'sdo':
+        return list(action[:4]) + [action[4].hex(), action[5]]
+    return list(action)
+
+
+def _pysoem_version():
+    # the package sets its version before it imports this module
+    from . import __version__
+    return __version__
+
+
+def _is_saved_int(value, low, high):
+    return type(value) is int and low <= value <= high
+
+
+def _check_saved_config(config):
+    """The reason a configuration of save_config() can not be restored, None if it can."""
+    if not isinstance(config, dict) or config.get('format') != SAVED_CONFIG_FORMAT:
+        return 'unknown format'
+    if config.get('pysoem_version') != _pysoem_version() or config.get('soem_version') != _SOEM_VERSION:
+        return 'saved by pysoem {} with SOEM {}'.format(config.get('pysoem_version'), config.get('soem_version'))
+    if config.get('slave_size') != sizeof(cpysoem.ec_slavet) or config.get('group_size') != sizeof(cpysoem.ec_groupt):
+        return 'saved with other SOEM structures'
+    try:
+        io_map_size = config['io_map_size']
+        slaves = config['slaves']
+        groups = config['groups']
+        mapped_groups = config['mapped_groups']
+        if not _is_saved_int(io_map_size, 0, sys.maxsize):
+            return 'invalid IO map size'
+        if not isinstance(slaves, list) or not slaves:
+            return 'invalid slave list'
+        if not isinstance(groups, list) or len(groups) > EC_MAXGROUP:
+            return 'more than {} groups'.format(EC_MAXGROUP)
+        if (not isinstance(mapped_groups, list) or len(mapped_groups) > EC_MAXGROUP or
+                not all(_is_saved_int(group, 0, EC_MAXGROUP - 1) for group in mapped_groups)):
+            return 'invalid mapped groups'
+        if not isinstance(config['dc'], bool) or not isinstance(config['overlap'], bool):
+            return 'invalid flags'
+        records = [(saved, sizeof(cpysoem.ec_slavet)) for saved in slaves]
+        records += [(saved, sizeof(cpysoem.ec_groupt)) for saved in groups]
+        for saved, size in records:
+            if len(bytes.fromhex(saved['record'])) != size:
+                return 'invalid record size'
+            for offset in [saved['outputs'], saved['inputs']]:
+                if offset is not None and not _is_saved_int(offset, 0, io_map_size):
+                    return 'IO map offset out of range'
+        for action in config['startup']:
+            if action[0] not in ('sdo', 'dc_sync') or not _is_saved_int(action[1], 0, len(slaves) - 2):
+                return 'invalid startup action'
+            if action[0] == 'sdo' and (len(action) != 6 or not isinstance(action[4], str)):
+                return 'invalid startup action'
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        return 'invalid content ({!r})'.format(e)
+    return None
+
+
+cdef object _exception_from_error(cpysoem.ec_errort* err):
+    if err.Etype == cpysoem.EC_ERR_TYPE_SDO_ERROR:
+        return SdoError(err.Slave,
+                        err.Index,
+                        err.SubIdx,
+                        err.AbortCode,
+                        cpysoem.ec_sdoerror2string(err.AbortCode).decode('utf8'))
+    elif err.Etype == cpysoem.EC_ERR_TYPE_MBX_ERROR:
+        return MailboxError(err.Slave,
+                            err.ErrorCode,
+                            cpysoem.ec_mbxerror2string(err.ErrorCode).decode('utf8'))
+    elif err.Etype == cpysoem.EC_ERR_TYPE_PACKET_ERROR:
+        return PacketError(err.Slave,
+                           err.ErrorCode)
+    else:
+        return Exception('unexpected error, Etype: {}'.format(err.Etype))
+
+
 cdef class _CallbackData:
     cdef:
         object slave
@@ -768,9 +2353,775 @@ class SiiOffset:
     MBX_PROTO = 0x001C
 
 
+class SiiCategory:
+    """Types of the SII categories."""
+    STRINGS = 10
+    DATA_TYPES = 20
+    GENERAL = 30
+    FMMU = 40
+    SYNC_MANAGER = 41
+    TX_PDO = 50
+    RX_PDO = 51
+    DC = 60
+    END = 0xFFFF
+    INVALID = 0x0000
+
+
+def _sii_checksum(data):
+    """CRC-8 (polynomial 0x07, initial value 0xFF) of the words 0 to 6 of an SII."""
+    cdef int crc = 0xFF
+    for byte in data[:14]:
+        crc ^= byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+    return crc
+
+
+def parse_sii_image(data):
+    """Parse an SII image, as read by :py:meth:`CdefSlave.eeprom_read_image`.
+
+    .. versionadded:: 1.2.0
+
+    Args:
+        data (bytes): The SII, starting at word address 0.
+
+    Returns:
+        SiiImage: The header values and the standard categories. Mailboxes are tuples of offset and size,
+        string references are resolved to :py:class:`str`, or None for no string. ``categories`` is a list of
+        the type and the content of all categories, including the ones not parsed.
+
+    Raises:
+        ValueError: if data is too short for the SII header
+        EepromError: if the category list contains a category of type 0, as an empty or unreadable EEPROM does
+    """
+    data = bytes(data)
+    if len(data) < 2 * cpysoem.SOEM_SII_FIRST_CATEGORY:
+        raise ValueError('the SII image must contain at least the {} bytes of the header'.format(
+            2 * cpysoem.SOEM_SII_FIRST_CATEGORY))
+    vendor_id, product_code, revision, serial_number = struct.unpack_from('<4I', data, 2 * SiiOffset.MAN)
+    mailboxes = struct.unpack_from('<9H', data, 2 * SiiOffset.BOOT_RX_MBX)
+
+    categories = []
+    offset = 2 * cpysoem.SOEM_SII_FIRST_CATEGORY
+    while offset + 4 <= len(data):
+        category_type, words = struct.unpack_from('<HH', data, offset)
+        if category_type == SiiCategory.END:
+            break
+        if category_type == SiiCategory.INVALID:
+            raise EepromError('invalid SII category type 0 at word address {:#06x}'.format(offset // 2))
+        categories.append((category_type, data[offset + 4:offset + 4 + 2 * words]))
+        offset += 4 + 2 * words
+    contents = {}
+    for category_type, content in categories:
+        contents.setdefault(category_type, content)
+
+    strings = []
+    content = contents.get(SiiCategory.STRINGS, b'')
+    offset = 1
+    for _ in range(content[0] if content else 0):
+        if offset >= len(content):
+            break
+        strings.append(content[offset + 1:offset + 1 + content[offset]].decode('utf8', 'replace'))
+        offset += 1 + content[offset]
+
+    def string(index):
+        return strings[index - 1] if 0 < index <= len(strings) else None
+
+    general = None
+    if SiiCategory.GENERAL in contents:
+        values = struct.unpack_from('<12BhBBH', contents[SiiCategory.GENERAL].ljust(18, b'\x00'))
+        general = SiiGeneral(string(values[0]), string(values[1]), string(values[2]), string(values[3]),
+                             values[5], values[6], values[7], values[11], values[12], values[15])
+
+    content = contents.get(SiiCategory.SYNC_MANAGER, b'')
+    sync_managers = [SiiSyncManager(*(values[:3] + values[4:]))
+                     for values in struct.iter_unpack('<HHBBBB', content[:len(content) // 8 * 8])]
+
+    def pdos(content):
+        result = []
+        offset = 0
+        while offset + 8 <= len(content):
+            index, num_entries, sync_manager, dc_sync, name, flags = struct.unpack_from('<HBBBBH', content, offset)
+            offset += 8
+            entries = []
+            for _ in range(num_entries):
+                if offset + 8 > len(content):
+                    break
+                entry = struct.unpack_from('<HBBBBH', content, offset)
+                offset += 8
+                entries.append(SiiPdoEntry(entry[0], entry[1], string(entry[2]), entry[3], entry[4], entry[5]))
+            result.append(SiiPdo(index, sync_manager, dc_sync, string(name), flags, entries))
+        return result
+
+    return SiiImage(data, vendor_id, product_code, revision, serial_number,
+                    mailboxes[0:2], mailboxes[2:4], mailboxes[4:6], mailboxes[6:8], mailboxes[8],
+                    strings, general, list(contents.get(SiiCategory.FMMU, b'')), sync_managers,
+                    pdos(contents.get(SiiCategory.TX_PDO, b'')), pdos(contents.get(SiiCategory.RX_PDO, b'')),
+                    categories)
+
+
+_sii_cache = {}
+
+
+def _sii_cache_path(identity):
+    return os.path.join(settings.sii_cache_dir, 'sii_{:08x}_{:08x}_{:08x}.bin'.format(*identity))
+
+
+def _sii_identity(data):
+    """Vendor ID, product code and revision in the header of an SII."""
+    return struct.unpack_from('<3I', data, 2 * SiiOffset.MAN)
+
+
+def _sii_matches(cached, header):
+    """Check the header of an SII against the cached SII of its device type.
+
+    Besides the identity, the mailbox configuration and the header of the first category must be the same.
+    """
+    mailboxes = slice(2 * SiiOffset.BOOT_RX_MBX, 2 * (SiiOffset.MBX_PROTO + 1))
+    first_category = slice(2 * cpysoem.SOEM_SII_FIRST_CATEGORY, 2 * SII_CHECK_WORDS)
+    return (_sii_identity(cached) == _sii_identity(header) and cached[mailboxes] == header[mailboxes]
+            and cached[first_category] == header[first_category])
+
+
+def _get_cached_sii(identity):
+    """The SII of a device type from memory or disk, None if it is not cached."""
+    data = _sii_cache.get(identity)
+    if data is None and settings.sii_cache_dir is not None:
+        try:
+            with builtins.open(_sii_cache_path(identity), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < 2 * SII_CHECK_WORDS or _sii_identity(data) != identity:
+            return None
+        _sii_cache[identity] = data
+    return data
+
+
+def _store_cached_sii(identity, data):
+    _sii_cache[identity] = data
+    if settings.sii_cache_dir is not None:
+        try:
+            with builtins.open(_sii_cache_path(identity), 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            logger.warning('could not store the SII cache: {}'.format(e))
+
+
+def _remove_cached_sii(identity):
+    _sii_cache.pop(identity, None)
+    if settings.sii_cache_dir is not None:
+        try:
+            os.remove(_sii_cache_path(identity))
+        except OSError:
+            pass
+
+
+def clear_sii_cache():
+    """Remove all SIIs from the SII cache in memory.
+
+    Files in :py:attr:`pysoem.settings.sii_cache_dir <CdefSettings.sii_cache_dir>` are not removed.
+
+    .. versionadded:: 1.2.0
+    """
+    _sii_cache.clear()
+
+
 cdef enum:
     EC_TIMEOUTRXM = 700000
     STATIC_SDO_READ_BUFFER_SIZE = 256
+    # the EEPROM is addressed by 16 bit word addresses
+    SII_MAX_SIZE = 0x20000
+    # the header and the first category header of the SII, checked against the SII cache
+    SII_CHECK_WORDS = 0x44
+    # the header of the SII up to the serial number, checked by restore_config()
+    SII_IDENTITY_WORDS = 0x10
+    SAVED_CONFIG_FORMAT = 1
+
+
+cdef struct _SdoTransfer:
+    uint16_t index
+    uint8_t subindex
+    int size
+    unsigned char* data
+    int wkc
+    bint has_error
+    cpysoem.ec_errort error
+
+
+cdef struct _ErrorList:
+    cpysoem.ec_errort* errors
+    int count
+    int capacity
+
+
+cdef int _sdo_transfer_many(cpysoem.ecx_contextt* context, uint16_t slave, _SdoTransfer* transfers, int count,
+                            bint write, bint ca, int timeout, _ErrorList* emergencies) noexcept nogil:
+    """Do the SDO transfers one after the other, and pop the errors of each transfer.
+
+    The first error that is not an emergency is stored in the transfer, emergencies are appended to
+    emergencies. Returns 0, or -1 if the emergency list could not be grown.
+    """
+    cdef int i
+    cdef _SdoTransfer* transfer
+    cdef cpysoem.ec_errort err
+    cdef cpysoem.ec_errort* errors
+    cdef int result = 0
+    for i in range(count):
+        transfer = &transfers[i]
+        if write:
+            transfer.wkc = cpysoem.ecx_SDOwrite(context, slave, transfer.index, transfer.subindex, ca,
+                                                transfer.size, transfer.data, timeout)
+        else:
+            transfer.wkc = cpysoem.ecx_SDOread(context, slave, transfer.index, transfer.subindex, ca,
+                                               &transfer.size, transfer.data, timeout)
+        while cpysoem.ecx_poperror(context, &err):
+            if err.Etype != cpysoem.EC_ERR_TYPE_EMERGENCY:
+                if not transfer.has_error:
+                    transfer.has_error = True
+                    transfer.error = err
+                continue
+            if emergencies.count == emergencies.capacity:
+                errors = <cpysoem.ec_errort*>realloc(emergencies.errors,
+                                                      (emergencies.capacity * 2 + 8) * sizeof(cpysoem.ec_errort))
+                if errors == NULL:
+                    result = -1
+                    continue
+                emergencies.errors = errors
+                emergencies.capacity = emergencies.capacity * 2 + 8
+            emergencies.errors[emergencies.count] = err
+            emergencies.count += 1
+    return result
+
+
+_SDO_ARRAY_TYPECODES = {
+    ECT_BOOLEAN: 'B',
+    ECT_INTEGER8: 'b',
+    ECT_UNSIGNED8: 'B',
+    ECT_INTEGER16: 'h',
+    ECT_UNSIGNED16: 'H',
+    ECT_INTEGER24: 'i',
+    ECT_UNSIGNED24: 'I',
+    ECT_INTEGER32: 'i',
+    ECT_UNSIGNED32: 'I',
+    ECT_REAL32: 'f',
+    ECT_INTEGER64: 'q',
+    ECT_UNSIGNED64: 'Q',
+    ECT_REAL64: 'd',
+}
+
+
+cdef int _sdo_element_size(int data_type) noexcept:
+    """Size in bytes of a value of a scalar ec_datatype, 0 for strings and other variable length types."""
+    if data_type == ECT_BOOLEAN or data_type == ECT_INTEGER8 or data_type == ECT_UNSIGNED8:
+        return 1
+    if ECT_BIT1 <= data_type <= ECT_BIT8:
+        return 1
+    if data_type == ECT_INTEGER16 or data_type == ECT_UNSIGNED16:
+        return 2
+    if data_type == ECT_INTEGER24 or data_type == ECT_UNSIGNED24:
+        return 3
+    if data_type == ECT_INTEGER32 or data_type == ECT_UNSIGNED32 or data_type == ECT_REAL32:
+        return 4
+    if data_type == ECT_INTEGER64 or data_type == ECT_UNSIGNED64 or data_type == ECT_REAL64:
+        return 8
+    return 0
+
+
+cdef inline int _sdo_element_bits(int data_type) noexcept:
+    if ECT_BIT1 <= data_type <= ECT_BIT8:
+        return data_type - ECT_BIT1 + 1
+    return _sdo_element_size(data_type) * 8
+
+
+cdef inline cpysoem.boolean _sdo_is_signed(int data_type) noexcept:
+    return (data_type == ECT_INTEGER8 or data_type == ECT_INTEGER16 or data_type == ECT_INTEGER24 or
+            data_type == ECT_INTEGER32 or data_type == ECT_INTEGER64)
+
+
+cdef object _decode_sdo_element(int data_type, const unsigned char* data):
+    cdef int size = _sdo_element_size(data_type)
+    cdef int bits = _sdo_element_bits(data_type)
+    cdef int shift
+    cdef int i
+    cdef uint64_t raw = 0
+    cdef uint32_t raw32
+    cdef float value32
+    cdef double value64
+    for i in range(size - 1, -1, -1):
+        raw = (raw << 8) | data[i]
+    if data_type == ECT_BOOLEAN:
+        return raw != 0
+    if data_type == ECT_REAL32:
+        raw32 = <uint32_t>raw
+        memcpy(&value32, &raw32, sizeof(value32))
+        return value32
+    if data_type == ECT_REAL64:
+        memcpy(&value64, &raw, sizeof(value64))
+        return value64
+    if _sdo_is_signed(data_type):
+        shift = 64 - size * 8
+        return (<int64_t>(raw << shift)) >> shift
+    if bits < 64:
+        raw &= (<uint64_t>1 << bits) - 1
+    return raw
+
+
+cdef object _decode_sdo_value(int data_type, bytes data, bint as_array=False):
+    """Convert the content of a CoE object to a Python value of the given ec_datatype.
+
+    The content must be exactly one value of a scalar type, with as_array any number of values,
+    e.g. an array read with complete access, returned as array.array.
+    """
+    cdef int element_size = _sdo_element_size(data_type)
+    cdef const unsigned char* ptr = data
+    cdef Py_ssize_t size = len(data)
+    cdef Py_ssize_t offset
+    if element_size == 0:
+        if data_type == ECT_VISIBLE_STRING:
+            return data.split(b'\0', 1)[0].decode('utf8', 'replace')
+        if data_type == ECT_UNICODE_STRING:
+            return data[:size - size % 2].decode('utf-16-le', 'replace').split('\0', 1)[0]
+        if data_type in (ECT_OCTET_STRING, ECT_DOMAIN, ECT_TIME_OF_DAY, ECT_TIME_DIFFERENCE):
+            return data
+        raise ValueError('unsupported data type {:#x}'.format(data_type))
+    if size == 0 or size % element_size != 0:
+        raise ValueError('{} bytes do not hold values of data type {:#x}'.format(size, data_type))
+    if not as_array:
+        if size != element_size:
+            raise ValueError('{} bytes do not hold one value of data type {:#x}'.format(size, data_type))
+        return _decode_sdo_element(data_type, ptr)
+    values = array.array(_SDO_ARRAY_TYPECODES.get(data_type, 'B'))
+    if element_size == 3 or ECT_BIT1 <= data_type <= ECT_BIT8:
+        for offset in range(0, size, element_size):
+            values.append(_decode_sdo_element(data_type, ptr + offset))
+    else:
+        values.frombytes(data)
+        if sys.byteorder == 'big':
+            values.byteswap()
+    return values
+
+
+cdef object _decode_sdo_result(object result, int data_type):
+    """Convert the data of a successful SdoResult, a failing conversion is stored as its error."""
+    if result.data is None:
+        return result
+    try:
+        return result._replace(data=_decode_sdo_value(data_type, result.data))
+    except ValueError as e:
+        return result._replace(data=None, error=e)
+
+
+cdef int _encode_sdo_element(int data_type, object value, unsigned char* data) except -1:
+    cdef int size = _sdo_element_size(data_type)
+    cdef int bits = _sdo_element_bits(data_type)
+    cdef int i
+    cdef uint64_t raw
+    cdef int64_t signed_value
+    cdef uint32_t raw32
+    cdef float value32
+    cdef double value64
+    if data_type == ECT_REAL32:
+        value32 = value
+        memcpy(&raw32, &value32, sizeof(raw32))
+        raw = raw32
+    elif data_type == ECT_REAL64:
+        value64 = value
+        memcpy(&raw, &value64, sizeof(raw))
+    elif data_type == ECT_BOOLEAN:
+        raw = 1 if value else 0
+    elif _sdo_is_signed(data_type):
+        signed_value = value
+        if bits < 64 and not -(<int64_t>1 << (bits - 1)) <= signed_value < (<int64_t>1 << (bits - 1)):
+            raise OverflowError('value {} out of range for data type {:#x}'.format(value, data_type))
+        raw = <uint64_t>signed_value
+    else:
+        raw = value
+        if bits < 64 and raw >> bits:
+            raise OverflowError('value {} out of range for data type {:#x}'.format(value, data_type))
+    for i in range(size):
+        data[i] = raw & 0xFF
+        raw >>= 8
+    return 0
+
+
+cdef bytes _encode_sdo_value(int data_type, object value):
+    """Convert a Python value to the content of a CoE object of the given ec_datatype.
+
+    For scalar types, a sequence of values is converted into consecutive elements.
+    """
+    cdef int element_size = _sdo_element_size(data_type)
+    if element_size == 0:
+        if data_type == ECT_VISIBLE_STRING and isinstance(value, str):
+            return value.encode('utf8')
+        if data_type == ECT_UNICODE_STRING and isinstance(value, str):
+            return value.encode('utf-16-le')
+        if data_type in (ECT_VISIBLE_STRING, ECT_UNICODE_STRING, ECT_OCTET_STRING,
+                         ECT_DOMAIN, ECT_TIME_OF_DAY, ECT_TIME_DIFFERENCE):
+            return bytes(value)
+        raise ValueError('unsupported data type {:#x}'.format(data_type))
+    if isinstance(value, (bytes, bytearray, str)):
+        raise TypeError('expected a number or a sequence of numbers for data type {:#x}'.format(data_type))
+    try:
+        values = list(value)
+    except TypeError:
+        values = [value]
+    cdef bytearray out = bytearray(len(values) * element_size)
+    cdef unsigned char* ptr = out
+    cdef Py_ssize_t i
+    for i, element in enumerate(values):
+        _encode_sdo_element(data_type, element, ptr + i * element_size)
+    return bytes(out)
+
+
+cdef enum:
+    EC_MAXNAME = 40
+
+
+cdef struct _OdEntryInfo:
+    uint16_t item
+    uint8_t subindex
+    uint16_t data_type
+    uint16_t bit_length
+    uint16_t access
+    char name[EC_MAXNAME + 1]
+
+
+cdef int _upload_od(cpysoem.ecx_contextt* context, cpysoem.ec_ODlistt* odlist,
+                    cpysoem.ec_OElistt* oelist, uint8_t* selected,
+                    _OdEntryInfo** entries, int* count) noexcept nogil:
+    """Read the description and the entries of the selected objects of the list.
+
+    selected[item] is cleared for objects that could not be read. The entries are appended to entries,
+    which is grown with realloc(). Returns 0, or -1 if out of memory.
+    """
+    cdef int capacity = count[0]
+    cdef int item
+    cdef int subindex
+    cdef int num_entries
+    cdef _OdEntryInfo* grown
+    cdef _OdEntryInfo* entry
+    for item in range(odlist.Entries):
+        if not selected[item]:
+            continue
+        memset(oelist, 0, sizeof(cpysoem.ec_OElistt))
+        if (cpysoem.ecx_readODdescription(context, item, odlist) <= 0 or
+                cpysoem.ecx_readOE(context, item, odlist, oelist) <= 0):
+            selected[item] = 0
+            continue
+        num_entries = odlist.MaxSub[item] + 1
+        if count[0] + num_entries > capacity:
+            capacity = 2 * capacity + num_entries + 64
+            grown = <_OdEntryInfo*>realloc(entries[0], capacity * sizeof(_OdEntryInfo))
+            if grown == NULL:
+                return -1
+            entries[0] = grown
+        for subindex in range(num_entries):
+            entry = &entries[0][count[0]]
+            entry.item = item
+            entry.subindex = subindex
+            entry.data_type = oelist.DataType[subindex]
+            entry.bit_length = oelist.BitLength[subindex]
+            entry.access = oelist.ObjAccess[subindex]
+            strncpy(entry.name, oelist.Name[subindex], EC_MAXNAME)
+            entry.name[EC_MAXNAME] = 0
+            count[0] += 1
+    return 0
+
+
+cdef class _ProcessDataBuffer:
+    """Exposes a region of a masters IO map via the buffer protocol.
+
+    Do not use this class directly, wrap it into a :class:`memoryview` instead.
+    The buffer holds a reference to the master that owns the IO map, so the
+    memory stays valid as long as a view on it exists.
+    """
+    cdef object _owner
+    cdef char* _ptr
+    cdef Py_ssize_t _size
+    cdef cpysoem.boolean _readonly
+
+    def __getbuffer__(self, Py_buffer* buffer, int flags):
+        PyBuffer_FillInfo(buffer, self, self._ptr, self._size, self._readonly, flags)
+
+    def __releasebuffer__(self, Py_buffer* buffer):
+        pass
+
+
+cdef object _make_process_data_view(object owner, void* ptr, Py_ssize_t size, cpysoem.boolean readonly):
+    cdef _ProcessDataBuffer buf = _ProcessDataBuffer.__new__(_ProcessDataBuffer)
+    buf._owner = owner
+    buf._ptr = <char*>ptr
+    buf._size = size
+    buf._readonly = readonly
+    return memoryview(buf)
+
+
+cdef inline int _get_bit(const uint8_t* ptr, Py_ssize_t bit) noexcept nogil:
+    return (ptr[bit >> 3] >> (bit & 7)) & 1
+
+
+cdef inline void _put_bit(uint8_t* ptr, Py_ssize_t bit, int value) noexcept nogil:
+    if value:
+        ptr[bit >> 3] |= <uint8_t>(1 << (bit & 7))
+    else:
+        ptr[bit >> 3] &= <uint8_t>~(1 << (bit & 7))
+
+
+cdef void _copy_bits(uint8_t* dst, Py_ssize_t dst_bit, const uint8_t* src, Py_ssize_t num_bits) noexcept nogil:
+    """Copy num_bits bits from the start of src to dst, starting at dst_bit, other bits of dst are kept."""
+    cdef Py_ssize_t i
+    if dst_bit == 0 and num_bits % 8 == 0:
+        memcpy(dst, src, num_bits // 8)
+        return
+    for i in range(num_bits):
+        _put_bit(dst, dst_bit + i, _get_bit(src, i))
+
+
+cdef class ProcessDataBits:
+    """Bit-granular view on the process data of a slave.
+
+    Do not create instances of this class, get them by the CdefSlave.input_bits and
+    CdefSlave.output_bits properties. Element i is the i-th bit of the slave, counted
+    from its start bit in the IO map, so bits of neighbouring slaves sharing a byte are never touched.
+
+    Indexing with an int gets or sets one bit as bool. Indexing with a slice gets a
+    bytes object with one element (0 or 1) per bit, and sets the bits from a bytes-like
+    object or a sequence with one element per bit, or from a single bool for all bits.
+    The bits are converted in one native loop.
+
+    .. versionadded:: 1.2.0
+    """
+    cdef object _owner
+    cdef uint8_t* _ptr
+    cdef Py_ssize_t _start_bit
+    cdef Py_ssize_t _num_bits
+    cdef cpysoem.boolean _readonly
+
+    def __len__(self):
+        return self._num_bits
+
+    cdef Py_ssize_t _check_index(self, Py_ssize_t index) except -1:
+        if index < 0:
+            index += self._num_bits
+        if index < 0 or index >= self._num_bits:
+            raise IndexError('bit index out of range')
+        return index
+
+    def __getitem__(self, key):
+        cdef Py_ssize_t start, stop, step, length, i
+        cdef uint8_t* pout
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._num_bits)
+            length = len(range(start, stop, step))
+            result = PyBytes_FromStringAndSize(NULL, length)
+            pout = <uint8_t*><char*>result
+            with nogil:
+                for i in range(length):
+                    pout[i] = _get_bit(self._ptr, self._start_bit + start + i * step)
+            return result
+        return _get_bit(self._ptr, self._start_bit + self._check_index(key)) == 1
+
+    def __setitem__(self, key, value):
+        cdef Py_ssize_t start, stop, step, length, i
+        cdef const unsigned char[::1] values
+        cdef int fill
+        if self._readonly:
+            raise TypeError('input bits can not be written')
+        if not isinstance(key, slice):
+            _put_bit(self._ptr, self._start_bit + self._check_index(key), 1 if value else 0)
+            return
+        start, stop, step = key.indices(self._num_bits)
+        length = len(range(start, stop, step))
+        if isinstance(value, (bool, int)):
+            fill = 1 if value else 0
+            with nogil:
+                for i in range(length):
+                    _put_bit(self._ptr, self._start_bit + start + i * step, fill)
+            return
+        try:
+            values = value
+        except (TypeError, ValueError, BufferError):
+            # sequences of other types, and strided buffers
+            values = bytes(bytearray(1 if v else 0 for v in value))
+        if values.shape[0] != length:
+            raise ValueError('expected {} values, got {}'.format(length, values.shape[0]))
+        if length == 0:
+            return
+        cdef const unsigned char* pvalues = &values[0]
+        with nogil:
+            for i in range(length):
+                _put_bit(self._ptr, self._start_bit + start + i * step, pvalues[i] != 0)
+
+    def __repr__(self):
+        return '<ProcessDataBits {}>'.format(''.join(str(bit) for bit in self[:]))
+
+
+cdef object _make_process_data_bits(object owner, uint8_t* ptr, int start_bit, Py_ssize_t num_bits, cpysoem.boolean readonly):
+    cdef ProcessDataBits bits = ProcessDataBits.__new__(ProcessDataBits)
+    bits._owner = owner
+    bits._ptr = ptr
+    bits._start_bit = start_bit
+    bits._num_bits = num_bits
+    bits._readonly = readonly
+    return bits
+
+
+_PDO_STRUCT_FORMATS = {
+    ECT_INTEGER8: 'b',
+    ECT_UNSIGNED8: 'B',
+    ECT_BIT8: 'B',
+    ECT_INTEGER16: 'h',
+    ECT_UNSIGNED16: 'H',
+    ECT_INTEGER32: 'i',
+    ECT_UNSIGNED32: 'I',
+    ECT_REAL32: 'f',
+    ECT_INTEGER64: 'q',
+    ECT_UNSIGNED64: 'Q',
+    ECT_REAL64: 'd',
+}
+
+_PDO_SIGNED_TYPES = frozenset([ECT_INTEGER8, ECT_INTEGER16, ECT_INTEGER24, ECT_INTEGER32, ECT_INTEGER64])
+
+_PDO_BYTES_TYPES = frozenset([ECT_VISIBLE_STRING, ECT_OCTET_STRING, ECT_UNICODE_STRING])
+
+
+def _pdo_data_type_from_bit_length(bit_length):
+    """Guess the data type of a PDO entry for slaves without SDO info."""
+    if bit_length == 1:
+        return ECT_BOOLEAN
+    if bit_length == 8:
+        return ECT_UNSIGNED8
+    if bit_length == 16:
+        return ECT_UNSIGNED16
+    if bit_length == 24:
+        return ECT_UNSIGNED24
+    if bit_length == 32:
+        return ECT_UNSIGNED32
+    if bit_length == 64:
+        return ECT_UNSIGNED64
+    if bit_length < 8:
+        return ECT_BIT1 + bit_length - 1
+    return ECT_OCTET_STRING
+
+
+cdef class _PdoAccessor:
+    """Precompiled access to one PDO entry in a slaves input or output view."""
+    cdef readonly object variable
+    cdef object _struct
+    cdef Py_ssize_t _byte_offset
+    cdef Py_ssize_t _num_bytes
+    cdef int _shift
+    cdef uint64_t _mask
+    cdef cpysoem.boolean _is_signed
+    cdef cpysoem.boolean _is_bool
+    cdef cpysoem.boolean _is_bytes
+
+    def __init__(self, variable, int start_bit):
+        self.variable = variable
+        cdef int bit_pos = start_bit + variable.bit_offset
+        self._byte_offset = bit_pos // 8
+        self._shift = bit_pos % 8
+        self._num_bytes = (self._shift + variable.bit_length + 7) // 8
+        self._mask = (1 << variable.bit_length) - 1 if variable.bit_length < 64 else 0xFFFFFFFFFFFFFFFF
+        self._is_signed = variable.data_type in _PDO_SIGNED_TYPES
+        self._is_bool = variable.data_type == ECT_BOOLEAN
+        self._is_bytes = variable.data_type in _PDO_BYTES_TYPES or variable.bit_length > 64
+        self._struct = None
+        fmt = _PDO_STRUCT_FORMATS.get(variable.data_type)
+        if fmt is not None and self._shift == 0 and struct.calcsize(fmt) * 8 == variable.bit_length:
+            self._struct = struct.Struct('<' + fmt)
+
+    cdef object get(self, view):
+        if self._struct is not None:
+            return self._struct.unpack_from(view, self._byte_offset)[0]
+        if self._is_bytes:
+            return bytes(view[self._byte_offset:self._byte_offset + self._num_bytes])
+        value = (int.from_bytes(view[self._byte_offset:self._byte_offset + self._num_bytes], 'little') >> self._shift) & self._mask
+        if self._is_bool:
+            return value != 0
+        if self._is_signed and value >> (self.variable.bit_length - 1):
+            value -= 1 << self.variable.bit_length
+        return value
+
+    cdef set(self, view, value):
+        if self._struct is not None:
+            self._struct.pack_into(view, self._byte_offset, value)
+            return
+        cdef Py_ssize_t end = self._byte_offset + self._num_bytes
+        if self._is_bytes:
+            if len(value) != self._num_bytes:
+                raise ValueError('{} needs {} bytes'.format(self.variable.name, self._num_bytes))
+            view[self._byte_offset:end] = value
+            return
+        # keep the bits of neighbouring entries sharing the bytes, as Python int, the shifted mask
+        # of a 64 bit entry does not fit into 64 bits
+        mask = <object>self._mask
+        old = int.from_bytes(view[self._byte_offset:end], 'little')
+        new = (old & ~(mask << self._shift)) | ((int(value) & mask) << self._shift)
+        view[self._byte_offset:end] = new.to_bytes(self._num_bytes, 'little')
+
+
+class PdoMap:
+    """Symbolic access to the PDO entries of a slave.
+
+    Do not create instances of this class, get them by the CdefSlave.pdo property.
+    Entries are addressed by their name from the object dictionary, or by an
+    ``(index, subindex)`` tuple. Reading an input or output entry returns its current
+    value from the IO map, assigning to an output entry writes it into the IO map.
+
+    .. versionadded:: 1.2.0
+    """
+
+    def __init__(self, slave, variables, input_start_bit, output_start_bit):
+        self._slave = slave
+        self._accessors = {}
+        ambiguous = set()
+        for variable in variables:
+            accessor = _PdoAccessor(variable, input_start_bit if variable.is_input else output_start_bit)
+            self._accessors[(variable.index, variable.subindex)] = accessor
+            if variable.name in self._accessors:
+                ambiguous.add(variable.name)
+            self._accessors[variable.name] = accessor
+        for name in ambiguous:
+            del self._accessors[name]
+        self._ambiguous = frozenset(ambiguous)
+        self.variables = list(variables)
+
+    def _get_accessor(self, key):
+        try:
+            return self._accessors[key]
+        except KeyError:
+            if key in self._ambiguous:
+                raise KeyError('{!r} is mapped more than once, use (index, subindex) instead'.format(key)) from None
+            raise
+
+    def __getitem__(self, key):
+        cdef _PdoAccessor accessor = self._get_accessor(key)
+        if accessor.variable.is_input:
+            return accessor.get(self._slave.input)
+        return accessor.get(self._slave.output)
+
+    def __setitem__(self, key, value):
+        cdef _PdoAccessor accessor = self._get_accessor(key)
+        if accessor.variable.is_input:
+            raise TypeError('{!r} is an input and can not be written'.format(key))
+        accessor.set(self._slave.output, value)
+
+    def __contains__(self, key):
+        return key in self._accessors
+
+    def __iter__(self):
+        return iter(variable.name for variable in self.variables)
+
+    def __len__(self):
+        return len(self.variables)
+
+    def keys(self):
+        return [variable.name for variable in self.variables]
+
+    def items(self):
+        return [(variable.name, self[(variable.index, variable.subindex)]) for variable in self.variables]
 
 
 cdef class CdefSlave:
@@ -783,11 +3134,20 @@ cdef class CdefSlave:
     cdef readonly CdefMaster _master
     cdef cpysoem.ecx_contextt* _ecx_contextt
     cdef cpysoem.ec_slavet* _ec_slave
+    cdef _MemoryBlock _slave_table
     cdef CdefMasterSettings* _the_masters_settings
     cdef int _pos # keep in mind that first slave has pos 1  
     cdef public _CallbackData _cd
-    cdef cpysoem.ec_ODlistt _ex_odlist
+    cdef object _od
     cdef public _emcy_callbacks
+    cdef object _input_view
+    cdef uint8_t* _input_view_ptr
+    cdef object _output_view
+    cdef uint8_t* _output_view_ptr
+    cdef ProcessDataBits _input_bits
+    cdef ProcessDataBits _output_bits
+    cdef object _pdo
+    cdef dict _sdo_data_types
 
     name = property(_get_name)
     man = property(_get_eep_man)
@@ -798,15 +3158,20 @@ cdef class CdefSlave:
     state = property(_get_state, _set_state)
     input = property(_get_input)
     output = property(_get_output, _set_output)
+    input_bits = property(_get_input_bits)
+    output_bits = property(_get_output_bits)
     al_status = property(_get_al_status)
     is_lost = property(_get_is_lost, _set_is_lost)
+    group = property(_get_group, _set_group)
     od = property(_get_od)
+    pdo = property(_get_pdo)
 
     def __init__(self, pos):
         self._pos = pos
         self._cd = _CallbackData()
         self._cd.slave = self
         self._emcy_callbacks = []
+        self._sdo_data_types = {}
 
     def dc_sync(self, act, sync0_cycle_time, sync0_shift_time=0, sync1_cycle_time=None):
         """Activate or deactivate SYNC pulses at the slave.
@@ -824,6 +3189,8 @@ cdef class CdefSlave:
             cpysoem.ecx_dcsync0(self._ecx_contextt, self._pos, act, sync0_cycle_time, sync0_shift_time)
         else:
             cpysoem.ecx_dcsync01(self._ecx_contextt, self._pos, act, sync0_cycle_time, sync1_cycle_time, sync0_shift_time) 
+        self._master._record_startup(('dc_sync', self._pos - 1, bool(act), sync0_cycle_time, sync0_shift_time,
+                                      sync1_cycle_time))
 
     cdef int __sdo_read_nogil(self, uint16_t index, uint8_t subindex, int8_t ca, int size_inout, unsigned char* pbuf):
         """Read a CoE object without GIL.
@@ -970,6 +3337,362 @@ cdef class CdefSlave:
 
         if not result > 0:
             raise WkcError(wkc=result)
+        self._master._record_startup(('sdo', self._pos - 1, index, subindex, data, bool(ca)))
+
+    def sdo_read_typed(self, index, uint8_t subindex, data_type=None, int size=0, ca=False, *, release_gil=None,
+                       as_array=False):
+        """Read a CoE object and convert it to a Python value.
+
+        Integers of all sizes, including INTEGER24/UNSIGNED24 and BIT1 to BIT8, are returned as :py:class:`int`,
+        REAL32/REAL64 as :py:class:`float`, BOOLEAN as :py:class:`bool`, VISIBLE_STRING and UNICODE_STRING as
+        :py:class:`str` and all other types as :py:class:`bytes`. The object must hold exactly one value of a
+        numeric type. To read several values, like an array read with complete access, pass ``as_array=True``,
+        they are returned as :py:class:`array.array`, which can be turned into a NumPy array without copying with
+        ``numpy.asarray()``.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            index (int): Index of the object.
+            subindex (int): Subindex of the object.
+            data_type (:obj:`ec_datatype`, optional): Data type of the object. If not given, it is read
+                from the object dictionary of the slave by SDO info, and cached for further calls.
+                With complete access, the data type of the given subindex, but at least of subindex 1, is used.
+            size (:obj:`int`, optional): The size of the reading buffer, see :py:meth:`sdo_read`.
+            ca (:obj:`bool`, optional): complete access.
+            release_gil (:obj:`bool`, optional): True to read the CoE object releasing the GIL. Defaults to False.
+            as_array (:obj:`bool`, optional): True to return the values of a numeric type as array. Defaults to False.
+
+        Returns:
+            The value of the object.
+
+        Raises:
+            SdoError: if read fails, the exception includes the SDO abort code
+            SdoInfoError: if the data type is not given and can not be read from the object dictionary
+            ValueError: if the content does not fit to the data type, or holds more than one value without as_array
+        """
+        if data_type is None:
+            data_type = self._get_sdo_data_type(index, max(subindex, 1) if ca else subindex)
+        return _decode_sdo_value(data_type, self.sdo_read(index, subindex, size, ca, release_gil=release_gil),
+                                 as_array)
+
+    def sdo_write_typed(self, index, uint8_t subindex, value, data_type=None, ca=False, *, release_gil=None):
+        """Convert a Python value and write it to a CoE object.
+
+        The conversion is the reverse of :py:meth:`sdo_read_typed`. For numeric types,
+        a sequence of values (e.g. a list, :py:class:`array.array` or NumPy array) is written
+        as consecutive elements.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            index (int): Index of the object.
+            subindex (int): Subindex of the object.
+            value: Value to be written to the object.
+            data_type (:obj:`ec_datatype`, optional): Data type of the object. If not given, it is read
+                from the object dictionary of the slave, see :py:meth:`sdo_read_typed`.
+            ca (:obj:`bool`, optional): complete access.
+            release_gil (:obj:`bool`, optional): True to write to the CoE object releasing the GIL. Defaults to False.
+
+        Raises:
+            SdoError: if write fails, the exception includes the SDO abort code
+            SdoInfoError: if the data type is not given and can not be read from the object dictionary
+            OverflowError: if a value is out of the range of the data type
+        """
+        if data_type is None:
+            data_type = self._get_sdo_data_type(index, max(subindex, 1) if ca else subindex)
+        self.sdo_write(index, subindex, _encode_sdo_value(data_type, value), ca, release_gil=release_gil)
+
+    def sdo_read_async(self, index, uint8_t subindex, int size=0, ca=False):
+        """Read a CoE object without blocking the calling thread.
+
+        The transfer is done by the mailbox worker thread of the master, which runs the transfers of all slaves one
+        after the other, releasing the GIL while waiting for the slave. A thread exchanging the process data, with
+        send_processdata() and receive_processdata() or by :py:meth:`~CdefMaster.start_cyclic`, can so change
+        parameters in OP without missing cycles. Emergency callbacks are called from the mailbox worker thread.
+
+        Avoid blocking mailbox transfers from other threads while asynchronous transfers are pending,
+        as they share the error list of the master.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            index (int): Index of the object.
+            subindex (int): Subindex of the object.
+            size (:obj:`int`, optional): The size of the reading buffer.
+            ca (:obj:`bool`, optional): complete access.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the content of the object as bytes,
+            or to the exception sdo_read() would raise.
+        """
+        return self._master._submit_mailbox_transfer(self.sdo_read, index, subindex, size, ca, release_gil=True)
+
+    def sdo_write_async(self, index, uint8_t subindex, bytes data, ca=False):
+        """Write to a CoE object without blocking the calling thread.
+
+        The transfer is done by the mailbox worker thread of the master, see :py:meth:`sdo_read_async`.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            index (int): Index of the object.
+            subindex (int): Subindex of the object.
+            data (bytes): data to be written to the object.
+            ca (:obj:`bool`, optional): complete access.
+
+        Returns:
+            concurrent.futures.Future: Resolves to None when the object was written,
+            or to the exception sdo_write() would raise.
+        """
+        return self._master._submit_mailbox_transfer(self.sdo_write, index, subindex, data, ca, release_gil=True)
+
+    def _get_sdo_data_type(self, index, subindex):
+        """Data type of an object entry from the object dictionary, cached per slave."""
+        data_type = self._sdo_data_types.get((index, subindex))
+        if data_type is None:
+            data_type = self._get_object_dictionary().lookup_data_type(index, subindex)
+        if data_type is None:
+            for key, (_, entry_data_type) in self._read_pdo_entry_names([index]).items():
+                self._sdo_data_types[key] = entry_data_type
+            data_type = self._sdo_data_types.get((index, subindex))
+            if data_type is None:
+                raise SdoInfoError('no data type of object {:#06x}:{} in the object dictionary'.format(index, subindex))
+        return data_type
+
+    def sdo_read_many(self, requests, ca=False):
+        """Read several CoE objects in one call.
+
+        All objects are read one after the other without the GIL. A failing read does not stop
+        the others, the error is returned in its result instead of being raised.
+        Emergency messages received meanwhile are passed to the emergency callbacks after all reads are done.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            requests (iterable): Tuples of (index, subindex), (index, subindex, size) or
+                (index, subindex, size, data_type). Without a size or with size 0, objects up to 256 bytes
+                can be read. With a data type, the content is converted like :py:meth:`sdo_read_typed` does.
+            ca (:obj:`bool`, optional): complete access.
+
+        Returns:
+            list[SdoResult]: One result per request, in the order of the requests. ``data`` is the content
+            of the object, or None if the read failed. ``wkc`` is the working counter of the read,
+            ``abort_code`` the SDO abort code or 0, and ``error`` the exception that :py:meth:`sdo_read`
+            would have raised, or None.
+        """
+        requests = [tuple(request) for request in requests]
+        self._master.check_context_is_initialized()
+        cdef int count = len(requests)
+        cdef _SdoTransfer* transfers = <_SdoTransfer*>PyMem_Malloc(max(count, 1) * sizeof(_SdoTransfer))
+        if transfers == NULL:
+            raise MemoryError()
+        memset(transfers, 0, max(count, 1) * sizeof(_SdoTransfer))
+        cdef unsigned char* buffer = NULL
+        cdef Py_ssize_t total_size = 0
+        try:
+            for i, request in enumerate(requests):
+                transfers[i].index = request[0]
+                transfers[i].subindex = request[1]
+                transfers[i].size = request[2] if len(request) > 2 and request[2] else STATIC_SDO_READ_BUFFER_SIZE
+                if transfers[i].size < 0:
+                    raise ValueError('size must be greater than 0')
+                total_size += transfers[i].size
+            buffer = <unsigned char*>PyMem_Malloc(max(total_size, 1))
+            if buffer == NULL:
+                raise MemoryError()
+            total_size = 0
+            for i in range(count):
+                transfers[i].data = buffer + total_size
+                total_size += transfers[i].size
+            results = self._sdo_transfer_many(transfers, count, False, ca, self._the_masters_settings.sdo_read_timeout[0])
+        finally:
+            PyMem_Free(buffer)
+            PyMem_Free(transfers)
+        return [_decode_sdo_result(result, request[3]) if len(request) > 3 else result
+                for request, result in zip(requests, results)]
+
+    def sdo_write_many(self, requests, ca=False):
+        """Write to several CoE objects in one call.
+
+        All objects are written one after the other without the GIL. A failing write does not stop
+        the others, the error is returned in its result instead of being raised.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            requests (iterable): Tuples of (index, subindex, data), with data as bytes, or
+                (index, subindex, value, data_type) to convert the value like :py:meth:`sdo_write_typed` does.
+            ca (:obj:`bool`, optional): complete access.
+
+        Returns:
+            list[SdoResult]: One result per request, in the order of the requests, ``data`` is always None.
+            See :py:meth:`sdo_read_many`.
+        """
+        requests = [(request[0], request[1], _encode_sdo_value(request[3], request[2])) if len(request) > 3 else tuple(request)
+                    for request in requests]
+        self._master.check_context_is_initialized()
+        cdef int count = len(requests)
+        cdef _SdoTransfer* transfers = <_SdoTransfer*>PyMem_Malloc(max(count, 1) * sizeof(_SdoTransfer))
+        if transfers == NULL:
+            raise MemoryError()
+        memset(transfers, 0, max(count, 1) * sizeof(_SdoTransfer))
+        cdef bytes data
+        try:
+            for i, (index, subindex, data) in enumerate(requests):
+                transfers[i].index = index
+                transfers[i].subindex = subindex
+                transfers[i].size = len(data)
+                transfers[i].data = <unsigned char*>data
+            results = self._sdo_transfer_many(transfers, count, True, ca, self._the_masters_settings.sdo_write_timeout[0])
+        finally:
+            PyMem_Free(transfers)
+        for (index, subindex, data), result in zip(requests, results):
+            if result.error is None:
+                self._master._record_startup(('sdo', self._pos - 1, index, subindex, data, bool(ca)))
+        return results
+
+    cdef list _sdo_transfer_many(self, _SdoTransfer* transfers, int count, bint write, bint ca, int timeout):
+        cdef _ErrorList emergencies
+        emergencies.errors = NULL
+        emergencies.count = 0
+        emergencies.capacity = 0
+        cdef int ret_val
+        Py_INCREF(self)
+        with nogil:
+            ret_val = _sdo_transfer_many(self._ecx_contextt, self._pos, transfers, count, write, ca, timeout, &emergencies)
+        Py_DECREF(self)
+
+        cdef _SdoTransfer* transfer
+        results = []
+        try:
+            for i in range(emergencies.count):
+                if len(self._emcy_callbacks) > 0:
+                    self._on_emergency(&emergencies.errors[i])
+            for i in range(count):
+                transfer = &transfers[i]
+                data = None
+                abort_code = 0
+                error = None
+                if transfer.has_error:
+                    error = self._make_exception(&transfer.error)
+                    if transfer.error.Etype == cpysoem.EC_ERR_TYPE_SDO_ERROR:
+                        abort_code = transfer.error.AbortCode
+                elif not transfer.wkc > 0:
+                    error = WkcError(wkc=transfer.wkc)
+                elif not write:
+                    data = PyBytes_FromStringAndSize(<char*>transfer.data, transfer.size)
+                results.append(SdoResult(transfer.index, transfer.subindex, data, transfer.wkc, abort_code, error))
+        finally:
+            free(emergencies.errors)
+        if ret_val != 0:
+            raise MemoryError()
+        return results
+
+    def read_pdo_map(self):
+        """Read the PDO assignment and mapping of the slave over CoE.
+
+        The assigned PDOs are read from 0x1C12 (outputs) and 0x1C13 (inputs), their entries
+        from the mapping objects 0x16xx and 0x1Axx. If the slave supports SDO info, names and
+        data types are taken from the object dictionary, otherwise the names are "0xINDEX:SUB"
+        and the data types are derived from the bit lengths.
+
+        The bit offsets are only valid for the IO map of the last config_map() call, so the map
+        must be read after config_map(), and after every change of the PDO mapping.
+        The result is also used for :py:attr:`pdo`.
+
+        .. versionadded:: 1.2.0
+
+        Returns:
+            PdoMap: Symbolic access to the PDO entries.
+
+        Raises:
+            SdoError: if a mapping object could not be read
+        """
+        self._master.check_context_is_initialized()
+        entries = []
+        if self._ec_slave.mbx_proto & cpysoem.ECT_MBXPROT_COE:
+            for assign_index, is_input in ((0x1C12, False), (0x1C13, True)):
+                entries.extend(self._read_pdo_assign(assign_index, is_input))
+        names = {}
+        if self._ec_slave.CoEdetails & ECT_COEDET_SDOINFO:
+            names = self._read_pdo_entry_names(sorted(set(entry[0] for entry in entries)))
+
+        variables = []
+        for index, subindex, is_input, bit_offset, bit_length in entries:
+            name, data_type = names.get((index, subindex), (None, 0))
+            if not name:
+                name = '0x{:04X}:{:02X}'.format(index, subindex)
+            if data_type == 0:
+                data_type = _pdo_data_type_from_bit_length(bit_length)
+            variables.append(PdoVariable(name, index, subindex, data_type, is_input, bit_offset, bit_length))
+        self._pdo = PdoMap(self, variables, self._ec_slave.Istartbit, self._ec_slave.Ostartbit)
+        return self._pdo
+
+    def _read_pdo_assign(self, assign_index, is_input):
+        try:
+            pdo_count = self.sdo_read(assign_index, 0)[0]
+        except SdoError:
+            # no PDOs of that direction
+            return []
+        entries = []
+        bit_offset = 0
+        for i in range(1, pdo_count + 1):
+            pdo_index, = struct.unpack('<H', self.sdo_read(assign_index, i)[:2])
+            entry_count = self.sdo_read(pdo_index, 0)[0]
+            for j in range(1, entry_count + 1):
+                mapping, = struct.unpack('<I', self.sdo_read(pdo_index, j)[:4])
+                index = mapping >> 16
+                bit_length = mapping & 0xFF
+                # index 0 is a gap in the PDO
+                if index != 0:
+                    entries.append((index, (mapping >> 8) & 0xFF, is_input, bit_offset, bit_length))
+                bit_offset += bit_length
+        return entries
+
+    def _read_pdo_entry_names(self, indexes):
+        """Get names and data types of the mapped objects by SDO info.
+
+        Objects that can not be described by the slave are missing in the result.
+        """
+        cdef cpysoem.ec_ODlistt* odlist = <cpysoem.ec_ODlistt*>malloc(sizeof(cpysoem.ec_ODlistt))
+        cdef cpysoem.ec_OElistt* oelist = <cpysoem.ec_OElistt*>malloc(sizeof(cpysoem.ec_OElistt))
+        cdef cpysoem.ec_errort err
+        cdef int item
+        if odlist == NULL or oelist == NULL:
+            free(odlist)
+            free(oelist)
+            raise MemoryError()
+        names = {}
+        try:
+            odlist.Slave = self._pos
+            odlist.Entries = len(indexes)
+            for item in range(odlist.Entries):
+                odlist.Index[item] = indexes[item]
+            for item in range(odlist.Entries):
+                if cpysoem.ecx_readODdescription(self._ecx_contextt, item, odlist) <= 0:
+                    continue
+                # ecx_readOE() only fills the entries it reads, and counts them in Entries
+                memset(oelist, 0, sizeof(cpysoem.ec_OElistt))
+                if cpysoem.ecx_readOE(self._ecx_contextt, item, odlist, oelist) <= 0:
+                    continue
+                object_name = (<bytes>odlist.Name[item]).decode('utf8', 'replace')
+                for subindex in range(odlist.MaxSub[item] + 1):
+                    if oelist.DataType[subindex] == 0 and oelist.BitLength[subindex] == 0:
+                        continue
+                    if odlist.MaxSub[item] == 0:
+                        name = object_name
+                    else:
+                        name = '{}.{}'.format(object_name, (<bytes>oelist.Name[subindex]).decode('utf8', 'replace'))
+                    names[(odlist.Index[item], subindex)] = (name, oelist.DataType[subindex])
+        finally:
+            free(odlist)
+            free(oelist)
+            # objects without description are reported as errors, they only lose their names
+            while cpysoem.ecx_poperror(self._ecx_contextt, &err):
+                if (err.Etype == cpysoem.EC_ERR_TYPE_EMERGENCY) and (len(self._emcy_callbacks) > 0):
+                    self._on_emergency(&err)
+        return names
 
     def mbx_receive(self):
         """Read out the slaves out mailbox - to check for emergency messages.
@@ -1067,37 +3790,126 @@ cdef class CdefSlave:
         if not result > 0:
             raise EepromError('EEPROM write error')
 
-    cdef int __foe_write_nogil(self, str filename, uint32_t password, int size, bytes data, int timeout):
-        """Write given data to device using FoE without GIL.
+    def eeprom_read_image(self, int timeout=20000):
+        """Read the SII of the slave from the EEPROM.
+
+        The SII is read up to the end of its category list by one native loop, without the GIL, with 8 bytes
+        per EEPROM access if the ESC supports it.
+
+        .. versionadded:: 1.2.0
 
         Args:
-            filename (string): name of the target file.
-            password (uint32_t): password for the target file, accepted range: 0 to 2^32 - 1.
-            size (int): size of the file buffer.
-            data (bytes): data.
-            timeout (int): Timeout value in us.
+            timeout (:obj:`int`, optional): Timeout value in us of an EEPROM access
+
+        Returns:
+            SiiImage: The SII, see :py:func:`parse_sii_image`. The raw image is in ``data``.
+
+        Raises:
+            EepromError: if an EEPROM read fails, or the category list is not valid
         """
-        cdef int result
-        cdef bytes encoded_filename = filename.encode('utf-8')
-        cdef char* c_filename = encoded_filename
-        cdef unsigned char* c_data = <unsigned char*> data
+        self._master.check_context_is_initialized()
+        cdef uint8_t* image = <uint8_t*>PyMem_Malloc(SII_MAX_SIZE)
+        if image == NULL:
+            raise MemoryError()
+        cdef int size
+        try:
+            Py_INCREF(self)
+            with nogil:
+                size = cpysoem.soem_sii_read_image(self._ecx_contextt, self._pos, image, SII_MAX_SIZE, timeout)
+            Py_DECREF(self)
+            if size < 0:
+                raise EepromError('EEPROM read error')
+            return parse_sii_image(PyBytes_FromStringAndSize(<char*>image, size))
+        finally:
+            PyMem_Free(image)
 
-        Py_INCREF(self)
-        with nogil:
-            result = cpysoem.ecx_FOEwrite(self._ecx_contextt, self._pos, c_filename, password, size, c_data, timeout)
-        Py_DECREF(self)
-        
-        return result
+    def eeprom_write_image(self, data, verify=True, *, update_checksum=False, int timeout=20000):
+        """Write an SII image to the EEPROM, only the words that differ from its content.
+
+        The EEPROM is compared with data, the differing words are written and, with verify, read back,
+        all in one native pass without the GIL.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            data (bytes): The SII from word address 0, or a :py:class:`SiiImage` of :py:meth:`eeprom_read_image`.
+            verify (:obj:`bool`, optional): True to read back the written words.
+            update_checksum (:obj:`bool`, optional): True to set the checksum in word 7 to the CRC of words 0 to 6
+                of data, instead of writing the checksum in data.
+            timeout (:obj:`int`, optional): Timeout value in us of an EEPROM access
+
+        Returns:
+            list[tuple[int, int]]: The word address and the number of words of each range that was written.
+
+        Raises:
+            ValueError: if data does not consist of whole words, or is larger than an EEPROM
+            EepromError: if a word could not be written, or was read back with a different content
+            MemoryError: if the memory for the comparison could not be allocated
+        """
+        self._master.check_context_is_initialized()
+        image = bytearray(data.data if isinstance(data, SiiImage) else data)
+        if len(image) % 2 != 0 or len(image) > SII_MAX_SIZE:
+            raise ValueError('data must consist of whole words and fit into {} bytes'.format(SII_MAX_SIZE))
+        if update_checksum:
+            if len(image) < 16:
+                raise ValueError('the checksum needs the words 0 to 7')
+            image[14] = _sii_checksum(image)
+        cdef int words = len(image) // 2
+        cdef const uint8_t[::1] view = image
+        cdef const uint8_t* c_image = &view[0] if words > 0 else NULL
+        cdef uint8_t* changed = <uint8_t*>PyMem_Malloc(max(words, 1))
+        if changed == NULL:
+            raise MemoryError()
+        cdef int c_verify = bool(verify)
+        cdef int failed_word = 0
+        cdef int result
+        cdef int start = -1
+        cdef int address
+        try:
+            Py_INCREF(self)
+            with nogil:
+                result = cpysoem.soem_sii_write_image(self._ecx_contextt, self._pos, c_image, words, changed,
+                                                      c_verify, timeout, &failed_word)
+            Py_DECREF(self)
+            if result == -1:
+                raise EepromError('EEPROM write error at word 0x{:04x}'.format(failed_word))
+            elif result == -2:
+                raise EepromError('EEPROM verify error at word 0x{:04x}'.format(failed_word))
+            elif result == -3:
+                raise MemoryError()
+            ranges = []
+            for address in range(words + 1):
+                if address < words and changed[address]:
+                    if start < 0:
+                        start = address
+                elif start >= 0:
+                    ranges.append((start, address - start))
+                    start = -1
+            if ranges:
+                # the SII cache may hold the old content
+                _remove_cached_sii((self.man, self.id, self.rev))
+            return ranges
+        finally:
+            PyMem_Free(changed)
 
-    def foe_write(self, filename, password, bytes data, timeout = 200000, *, release_gil=None):
+    def foe_write(self, filename, password, data, timeout = 200000, *, release_gil=None, progress=None,
+                  progress_interval_us=100000):
         """ Write given data to device using FoE
 
+        .. versionchanged:: 1.2.0
+            data can be any buffer or a file path, the progress can be reported.
+
         Args:
             filename (string): name of the target file
             password (int): password for the target file, accepted range: 0 to 2^32 - 1
-            data (bytes): data
+            data (bytes): data, any C-contiguous object supporting the buffer protocol, or the path of a file,
+                which is memory-mapped instead of read into memory
             timeout (int): Timeout value in us
             release_gil (:obj:`bool`, optional): True to FoE write releasing the GIL. Defaults to False.
+            progress (:obj:`callable`, optional): Called with the number of bytes written so far and the total size,
+                from the thread doing the transfer.
+            progress_interval_us (:obj:`int`, optional): Minimum time in us between two progress calls,
+                the call after the last packet is always made.
         """
         release_gil = self._master.check_release_gil(release_gil=release_gil)
         # error handling
@@ -1106,52 +3918,133 @@ cdef class CdefSlave:
 
         self._master.check_context_is_initialized()
 
+        return self._foe_write(filename, password, data, timeout, release_gil, progress, progress_interval_us, False)
+
+    cdef int _foe_write(self, str filename, uint32_t password, data, int timeout, bint release_gil, progress,
+                        int progress_interval_us, bint own_errors) except? -1:
+        if isinstance(data, (str, os.PathLike)):
+            with builtins.open(data, 'rb') as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return self._foe_write_buffer(filename, password, b'', timeout, release_gil, progress,
+                                                  progress_interval_us, own_errors)
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self._foe_write_buffer(filename, password, mapped, timeout, release_gil, progress,
+                                                  progress_interval_us, own_errors)
+        return self._foe_write_buffer(filename, password, data, timeout, release_gil, progress,
+                                      progress_interval_us, own_errors)
+
+    cdef int _foe_write_buffer(self, str filename, uint32_t password, data, int timeout, bint release_gil, progress,
+                               int progress_interval_us, bint own_errors) except? -1:
+        """Write with FoE. With own_errors, the write uses a copy of the context with an own error list, to run
+        concurrently with writes to other slaves, as the error list of SOEM is not thread safe. Emergencies in it
+        are dropped.
+        """
+        cdef const unsigned char[::1] view = memoryview(data).cast('B')
+        cdef int size = view.shape[0]
+        cdef const unsigned char* c_data = &view[0] if size > 0 else NULL
+        cdef bytes encoded_filename = filename.encode('utf8')
+        cdef char* c_filename = encoded_filename
+        cdef _FoeProgressData progress_data = _FoeProgressData(progress, size)
+        cdef cpysoem.soem_foe_progresst c_progress
+        cdef cpysoem.soem_foe_progresst* p_progress = NULL
+        if progress is not None:
+            c_progress.callback = _foe_progress
+            c_progress.user = <void*>progress_data
+            c_progress.interval_us = progress_interval_us
+            p_progress = &c_progress
+        cdef cpysoem.ecx_contextt* context = self._ecx_contextt
+        cdef cpysoem.ecx_contextt own_context
+        cdef cpysoem.ec_eringt own_elist
+        cdef cpysoem.boolean own_ecaterror = False
+        if own_errors:
+            own_context = self._ecx_contextt[0]
+            own_elist.head = 0
+            own_elist.tail = 0
+            own_context.elist = &own_elist
+            own_context.ecaterror = &own_ecaterror
+            context = &own_context
+
         cdef int result
-        cdef int size = len(data)
-        
         if release_gil:
-            result = self.__foe_write_nogil(filename, password, size, data, timeout)
+            Py_INCREF(self)
+            with nogil:
+                result = cpysoem.soem_foe_write(context, self._pos, c_filename, password, size,
+                                                <void*>c_data, timeout, p_progress)
+            Py_DECREF(self)
         else:
-            result = cpysoem.ecx_FOEwrite(self._ecx_contextt, self._pos, filename.encode('utf8'), password, size, <unsigned char*>data, timeout)
-        
+            result = cpysoem.soem_foe_write(context, self._pos, c_filename, password, size,
+                                            <void*>c_data, timeout, p_progress)
+
         # error handling
         cdef cpysoem.ec_errort err
-        if cpysoem.ecx_poperror(self._ecx_contextt, &err):
+        if own_errors:
+            while cpysoem.ecx_poperror(context, &err):
+                if err.Etype != cpysoem.EC_ERR_TYPE_EMERGENCY:
+                    self._raise_exception(&err)
+        elif cpysoem.ecx_poperror(context, &err):
             assert err.Slave == self._pos
             self._raise_exception(&err)
+        if progress_data.exc_raised:
+            raise progress_data.exc_info[0], progress_data.exc_info[1], progress_data.exc_info[2]
 
         return result
 
-    cdef int __foe_read_nogil(self, str filename, uint32_t password, int size_inout, unsigned char* pbuf, int timeout):
-        """Read given filename from device using FoE without GIL.
+    def foe_read(self, filename, password, size, timeout = 200000, *, release_gil=None, progress=None,
+                 progress_interval_us=100000):
+        """Read given filename from device using FoE
+
+        .. versionchanged:: 1.2.0
+            The progress can be reported.
 
         Args:
-            filename (string): name of the target file.
+            filename (string): name of the target file
             password (int): password for target file
-            size_inout (int): size in bytes of file buffer.
-            pbuf (unsigned char*): data.
-            timeout (int): Timeout value in us.
+            size (int): maximum file size
+            timeout (int): Timeout value in us
+            release_gil (:obj:`bool`, optional): True to FoE write releasing the GIL. Defaults to False.
+            progress (:obj:`callable`, optional): See :py:meth:`foe_read_into`.
+            progress_interval_us (:obj:`int`, optional): See :py:meth:`foe_read_into`.
         """
-        cdef int result
-        cdef bytes encoded_filename = filename.encode('utf-8')
-        cdef char* c_filename = encoded_filename
+        release_gil = self._master.check_release_gil(release_gil=release_gil)
+        if self._ecx_contextt == NULL:
+            raise UnboundLocalError()
 
-        Py_INCREF(self)
-        with nogil:
-            result = cpysoem.ecx_FOEread(self._ecx_contextt, self._pos, c_filename, password, &size_inout, pbuf, timeout)
-        Py_DECREF(self)
-        
-        return result
+        self._master.check_context_is_initialized()
 
-    def foe_read(self, filename, password, size, timeout = 200000, *, release_gil=None):
-        """Read given filename from device using FoE
+        # read into the bytes object that is returned, and shrink it in place, without a copy of the file
+        data = PyBytes_FromStringAndSize(NULL, size)
+        cdef int read_size = self._foe_read_buffer(filename, password, <unsigned char*>PyBytes_AS_STRING(data), size,
+                                                   timeout, release_gil, progress, progress_interval_us)
+        if read_size == size:
+            return data
+        cdef PyObject* raw = <PyObject*>data
+        Py_INCREF(data)
+        # _PyBytes_Resize() needs the only reference
+        data = None
+        _PyBytes_Resize(&raw, read_size)
+        data = <object>raw
+        Py_DECREF(data)
+        return data
+
+    def foe_read_into(self, filename, password, buffer, timeout = 200000, *, release_gil=None, progress=None,
+                      progress_interval_us=100000):
+        """Read given filename from device using FoE into a buffer.
+
+        .. versionadded:: 1.2.0
 
         Args:
             filename (string): name of the target file
             password (int): password for target file
-            size (int): maximum file size
+            buffer: writable C-contiguous object supporting the buffer protocol, its size is the maximum file size
             timeout (int): Timeout value in us
-            release_gil (:obj:`bool`, optional): True to FoE write releasing the GIL. Defaults to False.
+            release_gil (:obj:`bool`, optional): True to FoE read releasing the GIL. Defaults to False.
+            progress (:obj:`callable`, optional): Called with the number of bytes read so far and None,
+                as the total size is not known, from the thread doing the transfer.
+            progress_interval_us (:obj:`int`, optional): Minimum time in us between two progress calls,
+                the call after the last packet is always made.
+
+        Returns:
+            int: Number of bytes read into the buffer.
         """
         release_gil = self._master.check_release_gil(release_gil=release_gil)
         if self._ecx_contextt == NULL:
@@ -1159,30 +4052,79 @@ cdef class CdefSlave:
 
         self._master.check_context_is_initialized()
 
-        # prepare call of c function
-        cdef unsigned char* pbuf
-        cdef int size_inout
-        pbuf = <unsigned char*>PyMem_Malloc((size)*sizeof(unsigned char))
-        size_inout = size
+        cdef unsigned char[::1] view = memoryview(buffer).cast('B')
+        cdef int size = view.shape[0]
+        return self._foe_read_buffer(filename, password, &view[0] if size > 0 else NULL, size, timeout, release_gil,
+                                     progress, progress_interval_us)
+
+    cdef int _foe_read_buffer(self, filename, password, unsigned char* pbuf, int size, timeout, bint release_gil,
+                              progress, progress_interval_us) except? -1:
+        cdef int size_inout = size
+        cdef bytes encoded_filename = filename.encode('utf8')
+        cdef char* c_filename = encoded_filename
+        cdef uint32_t c_password = password
+        cdef int c_timeout = timeout
+        cdef _FoeProgressData progress_data = _FoeProgressData(progress, None)
+        cdef cpysoem.soem_foe_progresst c_progress
+        cdef cpysoem.soem_foe_progresst* p_progress = NULL
+        if progress is not None:
+            c_progress.callback = _foe_progress
+            c_progress.user = <void*>progress_data
+            c_progress.interval_us = progress_interval_us
+            p_progress = &c_progress
 
         cdef int result
         if release_gil:
-            result = self.__foe_read_nogil(filename, password, size_inout, pbuf, timeout)
+            Py_INCREF(self)
+            with nogil:
+                result = cpysoem.soem_foe_read(self._ecx_contextt, self._pos, c_filename, c_password, &size_inout, pbuf,
+                                               c_timeout, p_progress)
+            Py_DECREF(self)
         else:
-            result = cpysoem.ecx_FOEread(self._ecx_contextt, self._pos, filename.encode('utf8'), password, &size_inout, pbuf, timeout)
+            result = cpysoem.soem_foe_read(self._ecx_contextt, self._pos, c_filename, c_password, &size_inout, pbuf,
+                                           c_timeout, p_progress)
 
         # error handling
         cdef cpysoem.ec_errort err
         if cpysoem.ecx_poperror(self._ecx_contextt, &err):
-            PyMem_Free(pbuf)
             assert err.Slave == self._pos
             self._raise_exception(&err)
+        if progress_data.exc_raised:
+            raise progress_data.exc_info[0], progress_data.exc_info[1], progress_data.exc_info[2]
 
-        # return data
-        try:
-            return PyBytes_FromStringAndSize(<char*>pbuf, size_inout)
-        finally:
-            PyMem_Free(pbuf)
+        return size_inout
+
+    def foe_read_to_file(self, filename, password, path, max_size, timeout = 200000, *, release_gil=None,
+                         progress=None, progress_interval_us=100000):
+        """Read given filename from device using FoE into a file.
+
+        The file is memory-mapped with max_size and truncated to the size read afterwards,
+        so the content is never held in memory as a whole.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            filename (string): name of the target file
+            password (int): password for target file
+            path (str): path of the file to write, it is overwritten
+            max_size (int): maximum file size
+            timeout (int): Timeout value in us
+            release_gil (:obj:`bool`, optional): True to FoE read releasing the GIL. Defaults to False.
+            progress (:obj:`callable`, optional): See :py:meth:`foe_read_into`.
+            progress_interval_us (:obj:`int`, optional): See :py:meth:`foe_read_into`.
+
+        Returns:
+            int: Number of bytes read into the file.
+        """
+        with builtins.open(path, 'w+b') as file:
+            size = 0
+            if max_size > 0:
+                file.truncate(max_size)
+                with mmap.mmap(file.fileno(), max_size) as mapped:
+                    size = self.foe_read_into(filename, password, mapped, timeout, release_gil=release_gil,
+                                              progress=progress, progress_interval_us=progress_interval_us)
+            file.truncate(size)
+        return size
 
     def amend_mbx(self, mailbox, start_address, size):
         """Change the start address and size of a mailbox.
@@ -1315,13 +4257,7 @@ cdef class CdefSlave:
             raise WkcError()
 
     cdef _raise_exception(self, cpysoem.ec_errort* err):
-        if err.Etype == cpysoem.EC_ERR_TYPE_SDO_ERROR:
-            raise SdoError(err.Slave,
-                           err.Index,
-                           err.SubIdx,
-                           err.AbortCode,
-                           cpysoem.ec_sdoerror2string(err.AbortCode).decode('utf8'))
-        elif err.Etype == cpysoem.EC_ERR_TYPE_EMERGENCY:
+        if err.Etype == cpysoem.EC_ERR_TYPE_EMERGENCY:
             warnings.warn('This way of catching emergency messages is deprecated, use the add_emergency_callback() function!', FutureWarning)
             raise Emergency(err.Slave,
                             err.ErrorCode,
@@ -1329,15 +4265,10 @@ cdef class CdefSlave:
                             err.b1,
                             err.w1,
                             err.w2)
-        elif err.Etype == cpysoem.EC_ERR_TYPE_MBX_ERROR:
-            raise MailboxError(err.Slave,
-                               err.ErrorCode,
-                               cpysoem.ec_mbxerror2string(err.ErrorCode).decode('utf8'))
-        elif err.Etype == cpysoem.EC_ERR_TYPE_PACKET_ERROR:
-            raise PacketError(err.Slave,
-                              err.ErrorCode)
-        else:
-            raise Exception('unexpected error, Etype: {}'.format(err.Etype))
+        raise self._make_exception(err)
+
+    cdef object _make_exception(self, cpysoem.ec_errort* err):
+        return _exception_from_error(err)
     
     def _get_name(self):
         """Name of the slave, read out from the slaves SII during config_init."""
@@ -1403,21 +4334,113 @@ cdef class CdefSlave:
     def _set_state(self, value):
         self._ec_slave.state = value
 
-    def _get_input(self):
-        num_bytes = self._ec_slave.Ibytes
+    cdef Py_ssize_t _get_input_size(self):
         if (self._ec_slave.Ibytes == 0 and self._ec_slave.Ibits > 0):
-            num_bytes = 1
-        return PyBytes_FromStringAndSize(<char*>self._ec_slave.inputs, num_bytes)
+            return 1
+        return self._ec_slave.Ibytes
 
-    def _get_output(self):
-        num_bytes = self._ec_slave.Obytes
+    cdef Py_ssize_t _get_output_size(self):
         if (self._ec_slave.Obytes == 0 and self._ec_slave.Obits > 0):
-            num_bytes = 1
-        return PyBytes_FromStringAndSize(<char*>self._ec_slave.outputs, num_bytes)
+            return 1
+        return self._ec_slave.Obytes
+
+    def _get_input(self):
+        """Read-only view on the slaves input process data.
+
+        The returned :class:`memoryview` points directly into the masters IO map, no copy is made.
+        The content changes with every receive_processdata() call, use ``bytes(slave.input)``
+        to get a copy of the current values. Slaves with less than 8 input bits may share
+        the byte with other slaves, use :py:attr:`input_bits` for them.
+
+        .. versionchanged:: 1.2.0
+           Returns a memoryview instead of a new bytes object.
+        """
+        cdef Py_ssize_t num_bytes = self._get_input_size()
+        # the view is cached until config_map() moves the slaves inputs
+        if self._input_view is None or self._input_view_ptr != self._ec_slave.inputs or len(self._input_view) != num_bytes:
+            self._input_view = _make_process_data_view(self._master._io_map_block, self._ec_slave.inputs, num_bytes, True)
+            self._input_view_ptr = self._ec_slave.inputs
+        return self._input_view
+
+    def _get_output(self):
+        """Writable view on the slaves output process data.
+
+        The returned :class:`memoryview` points directly into the masters IO map,
+        so single byte and slice assignments like ``slave.output[3] = 0x02`` update the
+        process image in place. Assigning a contiguous bytes-like object to ``slave.output`` copies
+        the data into the process image, a ValueError is raised if it is longer than the outputs
+        of the slave, a BufferError if it is not contiguous.
+
+        Slaves with less than 8 output bits may share the byte with other slaves. Assigning
+        to ``slave.output`` only changes the bits of the slave, but writing through the view
+        changes the whole byte, use :py:attr:`output_bits` for them.
+
+        .. versionchanged:: 1.2.0
+           Returns a writable memoryview instead of a new bytes object.
+        """
+        cdef Py_ssize_t num_bytes = self._get_output_size()
+        # the view is cached until config_map() moves the slaves outputs
+        if self._output_view is None or self._output_view_ptr != self._ec_slave.outputs or len(self._output_view) != num_bytes:
+            self._output_view = _make_process_data_view(self._master._io_map_block, self._ec_slave.outputs, num_bytes, False)
+            self._output_view_ptr = self._ec_slave.outputs
+        return self._output_view
+
+    def _set_output(self, const unsigned char[::1] value):
+        cdef Py_ssize_t num_bits
+        if value.shape[0] > self._get_output_size():
+            raise ValueError('{} bytes do not fit into the {} output bytes of the slave'.format(
+                value.shape[0], self._get_output_size()))
+        if value.shape[0] == 0:
+            return
+        if self._ec_slave.Ostartbit == 0 and self._ec_slave.Obits % 8 == 0:
+            memcpy(<char*>self._ec_slave.outputs, &value[0], value.shape[0])
+        else:
+            # the slave shares bytes with other slaves, only touch its own bits
+            num_bits = min(<Py_ssize_t>value.shape[0] * 8, <Py_ssize_t>self._ec_slave.Obits)
+            _copy_bits(self._ec_slave.outputs, self._ec_slave.Ostartbit, &value[0], num_bits)
 
-    def _set_output(self, bytes value):
-        memcpy(<char*>self._ec_slave.outputs, <char*>value, len(value))
+    def _get_input_bits(self):
+        """Bit-granular view on the slaves inputs, see :class:`ProcessDataBits`.
+
+        Unlike :py:attr:`input`, the view starts at the start bit of the slave
+        and has exactly as many elements as the slave has input bits.
+
+        .. versionadded:: 1.2.0
+        """
+        if self._input_bits is None or self._input_bits._ptr != self._ec_slave.inputs or \
+                self._input_bits._start_bit != self._ec_slave.Istartbit or self._input_bits._num_bits != self._ec_slave.Ibits:
+            self._input_bits = _make_process_data_bits(self._master._io_map_block, self._ec_slave.inputs,
+                                                       self._ec_slave.Istartbit, self._ec_slave.Ibits, True)
+        return self._input_bits
+
+    def _get_output_bits(self):
+        """Bit-granular view on the slaves outputs, see :class:`ProcessDataBits`.
+
+        Unlike :py:attr:`output`, writing to the view never changes the outputs of
+        other slaves, even for slaves with less than 8 output bits that share a byte
+        of the IO map. For example ``slave.output_bits[:] = channels`` sets all outputs at once.
+
+        .. versionadded:: 1.2.0
+        """
+        if self._output_bits is None or self._output_bits._ptr != self._ec_slave.outputs or \
+                self._output_bits._start_bit != self._ec_slave.Ostartbit or self._output_bits._num_bits != self._ec_slave.Obits:
+            self._output_bits = _make_process_data_bits(self._master._io_map_block, self._ec_slave.outputs,
+                                                        self._ec_slave.Ostartbit, self._ec_slave.Obits, False)
+        return self._output_bits
     
+    def _get_pdo(self):
+        """Symbolic, typed access to the process data of the slave.
+
+        Read on first access by :py:meth:`read_pdo_map`, and again after each config_map().
+        For example ``slave.pdo['Statusword']`` reads an input and
+        ``slave.pdo['Controlword'] = 0x0F`` writes an output.
+
+        .. versionadded:: 1.2.0
+        """
+        if self._pdo is None:
+            return self.read_pdo_map()
+        return self._pdo
+
     def _get_al_status(self):
         return self._ec_slave.ALstatuscode
     
@@ -1426,22 +4449,346 @@ cdef class CdefSlave:
 
     def _set_is_lost(self, value):
         self._ec_slave.islost = value
+
+    def _get_group(self):
+        """Group of the slave, must be set before config_map().
+
+        Slaves of different groups are mapped into separate parts of the IO map, their processdata
+        can be exchanged independently, see :py:meth:`Master.start_cyclic`.
+        All slaves are in group 0 by default, which can not be combined with other groups.
+
+        .. versionadded:: 1.2.0
+        """
+        return self._ec_slave.group
+
+    def _set_group(self, value):
+        if not 0 <= value < EC_MAXGROUP:
+            raise ValueError('group must be in the range 0 to {}'.format(EC_MAXGROUP - 1))
+        self._ec_slave.group = value
     
+    def read_object_dictionary(self, first_index=0x0000, last_index=0xFFFF, *, release_gil=True):
+        """Read the complete object dictionary of the slave by SDO info in one pass.
+
+        In contrast to :py:attr:`od`, which reads the description and entries of an object when it is
+        accessed, the list, all descriptions and all entries are read by one native loop, without the GIL
+        by default. The result is stored in the cache of :py:attr:`od`, objects that are already cached are
+        not read again.
+
+        .. versionadded:: 1.2.0
+
+        Args:
+            first_index (:obj:`int`, optional): Only read objects with at least this index.
+            last_index (:obj:`int`, optional): Only read objects with at most this index.
+            release_gil (:obj:`bool`, optional): True to read the object dictionary releasing the GIL. Defaults to True.
+
+        Returns:
+            ObjectDictionaryTable: One column per attribute, with one row per object entry, ordered by index and
+            subindex. Entries that are not used by the object (no data type and bit length) are left out,
+            as well as objects the slave could not describe. ``index``, ``subindex``, ``object_code``,
+            ``data_type``, ``bit_length`` and ``access`` are :py:class:`array.array` columns,
+            ``object_name`` and ``name`` lists of :py:class:`str`.
+
+        Raises:
+            SdoInfoError: if the list of objects could not be read
+        """
+        self._master.check_context_is_initialized()
+        od = self._get_object_dictionary()
+        if od.indexes is None:
+            self._read_od_list(od)
+        rows = [row for row, index in enumerate(od.indexes)
+                if first_index <= index <= last_index and not od.has_entries(row)]
+        if rows:
+            self._upload_object_dictionary(od, rows, release_gil)
+        return od.table(first_index, last_index)
+
+    cdef _upload_object_dictionary(self, od, rows, bint release_gil):
+        cdef cpysoem.ec_ODlistt* odlist = <cpysoem.ec_ODlistt*>PyMem_Malloc(sizeof(cpysoem.ec_ODlistt))
+        cdef cpysoem.ec_OElistt* oelist = <cpysoem.ec_OElistt*>PyMem_Malloc(sizeof(cpysoem.ec_OElistt))
+        cdef uint8_t* selected = <uint8_t*>PyMem_Malloc(max(len(rows), 1))
+        cdef _OdEntryInfo* entries = NULL
+        cdef _OdEntryInfo* entry
+        cdef int count = 0
+        cdef int ret_val
+        cdef int item
+        cdef cpysoem.ec_errort err
+        try:
+            if odlist == NULL or oelist == NULL or selected == NULL:
+                raise MemoryError()
+            odlist.Slave = self._pos
+            odlist.Entries = len(rows)
+            for item, row in enumerate(rows):
+                odlist.Index[item] = od.indexes[row]
+                selected[item] = 1
+            logger.debug('ecx_readODdescription() and ecx_readOE() of {} objects'.format(len(rows)))
+            if release_gil:
+                Py_INCREF(self)
+                with nogil:
+                    ret_val = _upload_od(self._ecx_contextt, odlist, oelist, selected, &entries, &count)
+                Py_DECREF(self)
+            else:
+                ret_val = _upload_od(self._ecx_contextt, odlist, oelist, selected, &entries, &count)
+            if ret_val != 0:
+                raise MemoryError()
+
+            first = 0
+            for item, row in enumerate(rows):
+                if not selected[item]:
+                    continue
+                od.set_description(row, odlist.DataType[item], odlist.ObjectCode[item], odlist.MaxSub[item],
+                                   <bytes>odlist.Name[item])
+                while entries[first].item != item:
+                    first += 1
+                od.set_entries(row, [(<bytes>entries[i].name, entries[i].data_type, entries[i].bit_length, entries[i].access)
+                                     for i in range(first, first + odlist.MaxSub[item] + 1)])
+        finally:
+            PyMem_Free(odlist)
+            PyMem_Free(oelist)
+            PyMem_Free(selected)
+            free(entries)
+            # objects without description are reported as errors, they are left out
+            while cpysoem.ecx_poperror(self._ecx_contextt, &err):
+                if (err.Etype == cpysoem.EC_ERR_TYPE_EMERGENCY) and (len(self._emcy_callbacks) > 0):
+                    self._on_emergency(&err)
+
     def _get_od(self):
-        logger.debug('ecx_readODlist()')
-        cdef int result = cpysoem.ecx_readODlist(self._ecx_contextt, self._pos, &self._ex_odlist)
-        if not result > 0:
-            raise SdoInfoError('Sdo List Info read failed')
-        
-        coe_objects = []
-        for i in range(self._ex_odlist.Entries):
-            coe_object = CdefCoeObject(i)
-            coe_object._ecx_context = self._ecx_contextt
-            coe_object._ex_odlist = &self._ex_odlist
-            coe_objects.append(coe_object)
-            
-        return coe_objects
+        """Objects in the object dictionary of the slave, read by SDO info.
+
+        The SDO info is cached for all slaves with the same vendor ID, product code and revision number,
+        so only the first of several identical slaves reads it. Descriptions and entries of the objects are
+        read on first access. If :py:attr:`pysoem.settings.od_cache_dir <CdefSettings.od_cache_dir>` is set,
+        the cache is also loaded from and stored to this directory.
+
+        .. versionchanged:: 1.2.0
+           The SDO info is cached.
+        """
+        od = self._get_object_dictionary()
+        if od.indexes is None:
+            self._read_od_list(od)
+        return [CdefCoeObject._create(self, od, row) for row in range(len(od.indexes))]
+
+    def _get_object_dictionary(self):
+        identity = (self._ec_slave.eep_man, self._ec_slave.eep_id, self._ec_slave.eep_rev)
+        if identity == (0, 0, 0):
+            # slaves without identity do not share their SDO info
+            if self._od is None:
+                self._od = _ObjectDictionary(None)
+            return self._od
+        return _get_object_dictionary(identity)
+
+    cdef _read_od_list(self, od):
+        cdef cpysoem.ec_ODlistt* odlist = <cpysoem.ec_ODlistt*>PyMem_Malloc(sizeof(cpysoem.ec_ODlistt))
+        if odlist == NULL:
+            raise MemoryError()
+        try:
+            logger.debug('ecx_readODlist()')
+            if not cpysoem.ecx_readODlist(self._ecx_contextt, self._pos, odlist) > 0:
+                raise SdoInfoError('Sdo List Info read failed')
+            od.set_indexes([odlist.Index[i] for i in range(odlist.Entries)])
+        finally:
+            PyMem_Free(odlist)
+
+    cdef _read_od_description(self, od, int row):
+        cdef cpysoem.ec_ODlistt* odlist = <cpysoem.ec_ODlistt*>PyMem_Malloc(sizeof(cpysoem.ec_ODlistt))
+        if odlist == NULL:
+            raise MemoryError()
+        try:
+            odlist.Slave = self._pos
+            odlist.Entries = 1
+            odlist.Index[0] = od.indexes[row]
+            logger.debug('ecx_readODdescription()')
+            if not cpysoem.ecx_readODdescription(self._ecx_contextt, 0, odlist) > 0:
+                raise SdoInfoError('Sdo Object Info read failed')
+            od.set_description(row, odlist.DataType[0], odlist.ObjectCode[0], odlist.MaxSub[0], <bytes>odlist.Name[0])
+        finally:
+            PyMem_Free(odlist)
+
+    cdef _read_od_entries(self, od, int row):
+        cdef cpysoem.ec_ODlistt* odlist = <cpysoem.ec_ODlistt*>PyMem_Malloc(sizeof(cpysoem.ec_ODlistt))
+        cdef cpysoem.ec_OElistt* oelist = <cpysoem.ec_OElistt*>PyMem_Malloc(sizeof(cpysoem.ec_OElistt))
+        try:
+            if odlist == NULL or oelist == NULL:
+                raise MemoryError()
+            # ecx_readOE() only fills the entries it reads
+            memset(oelist, 0, sizeof(cpysoem.ec_OElistt))
+            odlist.Slave = self._pos
+            odlist.Entries = 1
+            odlist.Index[0] = od.indexes[row]
+            odlist.MaxSub[0] = od.max_subs[row]
+            logger.debug('ecx_readOE()')
+            if not cpysoem.ecx_readOE(self._ecx_contextt, 0, odlist, oelist) > 0:
+                raise SdoInfoError('Sdo ObjectEntry Info read failed')
+            od.set_entries(row, [(<bytes>oelist.Name[i], oelist.DataType[i], oelist.BitLength[i], oelist.ObjAccess[i])
+                                 for i in range(od.max_subs[row] + 1)])
+        finally:
+            PyMem_Free(odlist)
+            PyMem_Free(oelist)
+
+
+_od_cache = {}
+
 
+def _od_cache_path(identity):
+    return os.path.join(settings.od_cache_dir, 'od_{:08x}_{:08x}_{:08x}.json'.format(*identity))
+
+
+def _get_object_dictionary(identity):
+    """The shared SDO info of all slaves with this identity, from memory, disk, or a new empty one."""
+    od = _od_cache.get(identity)
+    if od is None:
+        if settings.od_cache_dir is not None:
+            try:
+                with builtins.open(_od_cache_path(identity), 'r') as f:
+                    od = _ObjectDictionary.from_json(identity, json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                od = None
+        if od is None:
+            od = _ObjectDictionary(identity)
+        _od_cache[identity] = od
+    return od
+
+
+def clear_od_cache():
+    """Remove all SDO info from the object dictionary cache in memory.
+
+    Files in :py:attr:`pysoem.settings.od_cache_dir <CdefSettings.od_cache_dir>` are not removed.
+
+    .. versionadded:: 1.2.0
+    """
+    _od_cache.clear()
+
+
+class _ObjectDictionary:
+    """SDO info of one device type, shared by all slaves with the same identity.
+
+    The objects and their entries are stored column wise, with one row per object and one row
+    per entry. Descriptions and entries are filled in as they are read from a slave.
+    """
+
+    def __init__(self, identity):
+        self.identity = identity
+        self.indexes = None
+        self.rows = {}
+        self.data_types = array.array('H')
+        self.object_codes = array.array('B')
+        self.max_subs = array.array('B')
+        self.names = []
+        # first entry row of an object, -1 while its entries are not read
+        self.entry_starts = array.array('i')
+        self.entry_data_types = array.array('H')
+        self.entry_bit_lengths = array.array('H')
+        self.entry_access = array.array('H')
+        self.entry_names = []
+        self._missing = 0
+
+    def set_indexes(self, indexes):
+        n = len(indexes)
+        self.indexes = array.array('H', indexes)
+        self.rows = {index: row for row, index in enumerate(indexes)}
+        self.data_types = array.array('H', bytes(2 * n))
+        self.object_codes = array.array('B', bytes(n))
+        self.max_subs = array.array('B', bytes(n))
+        self.names = [None] * n
+        self.entry_starts = array.array('i', [-1] * n)
+        self._missing = 2 * n
+        self._store_if_complete()
+
+    def is_described(self, row):
+        return self.names[row] is not None
+
+    def set_description(self, row, data_type, object_code, max_sub, name):
+        if self.names[row] is None:
+            self._missing -= 1
+        self.data_types[row] = data_type
+        self.object_codes[row] = object_code
+        self.max_subs[row] = max_sub
+        self.names[row] = name
+        self._store_if_complete()
+
+    def has_entries(self, row):
+        return self.entry_starts[row] >= 0
+
+    def set_entries(self, row, entries):
+        if self.entry_starts[row] < 0:
+            self._missing -= 1
+        self.entry_starts[row] = len(self.entry_names)
+        for name, data_type, bit_length, access in entries:
+            self.entry_names.append(name)
+            self.entry_data_types.append(data_type)
+            self.entry_bit_lengths.append(bit_length)
+            self.entry_access.append(access)
+        self._store_if_complete()
+
+    def table(self, first_index, last_index):
+        """The entries of the objects in the index range, that are described and have their entries read."""
+        table = ObjectDictionaryTable(array.array('H'), array.array('B'), array.array('B'), [], [],
+                                      array.array('H'), array.array('H'), array.array('H'))
+        for row in sorted(range(len(self.indexes)), key=self.indexes.__getitem__):
+            index = self.indexes[row]
+            if not first_index <= index <= last_index or not self.has_entries(row):
+                continue
+            object_name = self.names[row].decode('utf8', 'replace')
+            start = self.entry_starts[row]
+            for subindex in range(self.max_subs[row] + 1):
+                i = start + subindex
+                if self.entry_data_types[i] == 0 and self.entry_bit_lengths[i] == 0:
+                    continue
+                table.index.append(index)
+                table.subindex.append(subindex)
+                table.object_code.append(self.object_codes[row])
+                table.object_name.append(object_name)
+                table.name.append(self.entry_names[i].decode('utf8', 'replace'))
+                table.data_type.append(self.entry_data_types[i])
+                table.bit_length.append(self.entry_bit_lengths[i])
+                table.access.append(self.entry_access[i])
+        return table
+
+    def lookup_data_type(self, index, subindex):
+        """Data type of an entry, or None if it is not known yet."""
+        row = self.rows.get(index)
+        if row is None or not self.has_entries(row) or subindex > self.max_subs[row]:
+            return None
+        return self.entry_data_types[self.entry_starts[row] + subindex]
+
+    def _store_if_complete(self):
+        if self._missing == 0 and self.identity is not None and settings.od_cache_dir is not None:
+            try:
+                with builtins.open(_od_cache_path(self.identity), 'w') as f:
+                    json.dump(self.to_json(), f)
+            except OSError as e:
+                logger.warning('could not store the object dictionary cache: {}'.format(e))
+
+    def to_json(self):
+        objects = []
+        for row, index in enumerate(self.indexes):
+            obj = {'index': index}
+            if self.is_described(row):
+                obj.update(name=self.names[row].decode('latin-1'),
+                           data_type=self.data_types[row],
+                           object_code=self.object_codes[row],
+                           max_sub=self.max_subs[row])
+            if self.has_entries(row):
+                start = self.entry_starts[row]
+                obj['entries'] = [[self.entry_names[i].decode('latin-1'), self.entry_data_types[i],
+                                   self.entry_bit_lengths[i], self.entry_access[i]]
+                                  for i in range(start, start + self.max_subs[row] + 1)]
+            objects.append(obj)
+        return {'objects': objects}
+
+    @classmethod
+    def from_json(cls, identity, data):
+        # without identity while loading, so the cache file it comes from is not stored again
+        od = cls(None)
+        objects = data['objects']
+        od.set_indexes([obj['index'] for obj in objects])
+        for row, obj in enumerate(objects):
+            if 'name' in obj:
+                od.set_description(row, obj['data_type'], obj['object_code'], obj['max_sub'],
+                                   obj['name'].encode('latin-1'))
+            if 'entries' in obj:
+                od.set_entries(row, [(name.encode('latin-1'), data_type, bit_length, access)
+                                     for name, data_type, bit_length, access in obj['entries']])
+        od.identity = identity
+        return od
 
 
 cdef class CdefCoeObject:
@@ -1449,12 +4796,9 @@ cdef class CdefCoeObject:
 
     Do not create instances of this class, you get instances of this type by the CdefSlave.od property.
     """
-    cdef cpysoem.ecx_contextt* _ecx_context
-    cdef cpysoem.ec_ODlistt* _ex_odlist
-    cdef int _item
-    cdef cpysoem.boolean _is_description_read
-    cdef cpysoem.boolean _are_entries_read
-    cdef cpysoem.ec_OElistt _ex_oelist
+    cdef CdefSlave _slave
+    cdef object _od
+    cdef int _row
 
     index = property(_get_index)
     data_type = property(_get_data_type)
@@ -1463,102 +4807,119 @@ cdef class CdefCoeObject:
     entries = property(_get_entries)
     bit_length = property(_get_bit_length)
     obj_access = property(_get_obj_access)
-    
-    def __init__(self, int item):
-        self._item = item
-        self._is_description_read = False
-        self._are_entries_read = False
-        
+
+    @staticmethod
+    cdef CdefCoeObject _create(CdefSlave slave, object od, int row):
+        cdef CdefCoeObject coe_object = CdefCoeObject.__new__(CdefCoeObject)
+        coe_object._slave = slave
+        coe_object._od = od
+        coe_object._row = row
+        return coe_object
+
     def _read_description(self):
-        cdef int result
-        if not self._is_description_read:
-          logger.debug('ecx_readODdescription()')
-          result = cpysoem.ecx_readODdescription(self._ecx_context, self._item, self._ex_odlist)
-          if not result > 0:
-              raise SdoInfoError('Sdo Object Info read failed')
-          self._is_description_read = True
-          
+        if not self._od.is_described(self._row):
+            self._slave._read_od_description(self._od, self._row)
+
     def _read_entries(self):
-        cdef int result
-        if not self._are_entries_read:
-            logger.debug('ecx_readOE()')
-            result = cpysoem.ecx_readOE(self._ecx_context, self._item, self._ex_odlist, &self._ex_oelist)
-            if not result > 0:
-                raise SdoInfoError('Sdo ObjectEntry Info read failed')
-            self._are_entries_read = True
-            
+        self._read_description()
+        if not self._od.has_entries(self._row):
+            self._slave._read_od_entries(self._od, self._row)
+
     def _get_index(self):
-        return self._ex_odlist.Index[self._item]
+        return self._od.indexes[self._row]
     
     def _get_data_type(self):
         self._read_description()
-        return self._ex_odlist.DataType[self._item]
+        return self._od.data_types[self._row]
     
     def _get_object_code(self):
         self._read_description()
-        return self._ex_odlist.ObjectCode[self._item]
+        return self._od.object_codes[self._row]
         
     def _get_name(self):
         self._read_description()
-        return self._ex_odlist.Name[self._item]
+        return self._od.names[self._row]
     
     def _get_entries(self):
-        self._read_description()
         self._read_entries()
         
-        if self._ex_odlist.MaxSub[self._item] == 0:
+        cdef int max_sub = self._od.max_subs[self._row]
+        if max_sub == 0:
             return []
         else:
-            entries = []
-            for i in range(self._ex_odlist.MaxSub[self._item]+1):
-                entry = CdefCoeObjectEntry(i)
-                entry._ex_oelist = &self._ex_oelist
-                entries.append(entry)
-            return entries
+            start = self._od.entry_starts[self._row]
+            return [CdefCoeObjectEntry._create(self._od, start + i) for i in range(max_sub + 1)]
     
     def _get_bit_length(self):
-        cdef int sum = 0
-        self._read_description()
         self._read_entries()
-        if self._ex_odlist.MaxSub[self._item] == 0:
-            return self._ex_oelist.BitLength[0]
+        start = self._od.entry_starts[self._row]
+        if self._od.max_subs[self._row] == 0:
+            return self._od.entry_bit_lengths[start]
         else:
-            for i in range(self._ex_odlist.MaxSub[self._item]+1):
-                sum += self._ex_oelist.BitLength[i]
-            return sum
+            return sum(self._od.entry_bit_lengths[start:start + self._od.max_subs[self._row] + 1])
     
     def _get_obj_access(self):
-        if self._ex_odlist.MaxSub[self._item] == 0:
-            return self._ex_oelist.ObjAccess[0]
+        self._read_entries()
+        if self._od.max_subs[self._row] == 0:
+            return self._od.entry_access[self._od.entry_starts[self._row]]
         else:
             return 0
         
 
 cdef class CdefCoeObjectEntry:
-    cdef cpysoem.ec_OElistt* _ex_oelist
-    cdef int _item
+    cdef object _od
+    cdef int _row
 
     name = property(_get_name)
     data_type = property(_get_data_type)
     bit_length = property(_get_bit_length)
     obj_access = property(_get_obj_access)
 
-    def __init__(self, int item):
-        self._item = item
+    @staticmethod
+    cdef CdefCoeObjectEntry _create(object od, int row):
+        cdef CdefCoeObjectEntry entry = CdefCoeObjectEntry.__new__(CdefCoeObjectEntry)
+        entry._od = od
+        entry._row = row
+        return entry
         
     def _get_name(self):            
-        return self._ex_oelist.Name[self._item]
+        return self._od.entry_names[self._row]
 
     def _get_data_type(self):
-        return self._ex_oelist.DataType[self._item]
+        return self._od.entry_data_types[self._row]
 
     def _get_bit_length(self):
-        return self._ex_oelist.BitLength[self._item]
+        return self._od.entry_bit_lengths[self._row]
     
     def _get_obj_access(self):
-        return self._ex_oelist.ObjAccess[self._item]
+        return self._od.entry_access[self._row]
         
 
+cdef class _FoeProgressData:
+    cdef:
+        object func
+        object total
+        object exc_raised
+        object exc_info
+
+    def __init__(self, func, total):
+        self.func = func
+        self.total = total
+        self.exc_raised = False
+
+
+cdef void _foe_progress(void* user, int transferred) noexcept nogil:
+    with gil:
+        pd = <_FoeProgressData>user
+        if pd.exc_raised:
+            return
+        try:
+            pd.func(transferred, pd.total)
+        except:
+            pd.exc_raised = True
+            pd.exc_info = sys.exc_info()
+
+
 cdef int _xPO2SOconfig(cpysoem.uint16 slave, void* user) noexcept:
     cdef _CallbackData cd
     cd = <object>user
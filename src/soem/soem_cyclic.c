@@ -0,0 +1,566 @@
+#include <errno.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "soem_cyclic.h"
+
+#define NSEC_PER_SEC 1000000000LL
+
+int64 soem_monotonic_ns(void)
+{
+#if defined(_WIN32)
+    static LARGE_INTEGER freq;
+    LARGE_INTEGER count;
+    if (freq.QuadPart == 0)
+    {
+        QueryPerformanceFrequency(&freq);
+    }
+    QueryPerformanceCounter(&count);
+    return (int64)(count.QuadPart / freq.QuadPart) * NSEC_PER_SEC
+           + (int64)((count.QuadPart % freq.QuadPart) * NSEC_PER_SEC / freq.QuadPart);
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (int64)ts.tv_sec * NSEC_PER_SEC + ts.tv_nsec;
+#endif
+}
+
+int soem_expected_wkc(ecx_contextt *context, uint8 group)
+{
+    return (context->grouplist[group].outputsWKC * 2) + context->grouplist[group].inputsWKC;
+}
+
+static int soem_hist_bin(int64 value_ns)
+{
+    int bin = 0;
+    if (value_ns <= 1)
+    {
+        return 0;
+    }
+#if defined(__GNUC__) || defined(__clang__)
+    bin = 63 - __builtin_clzll((uint64)value_ns);
+#else
+    {
+        uint64 v = (uint64)value_ns;
+        while (v >>= 1)
+        {
+            bin++;
+        }
+    }
+#endif
+    return (bin < SOEM_HIST_BINS) ? bin : (SOEM_HIST_BINS - 1);
+}
+
+static void soem_hist_record(soem_histt *hist, int64 value_ns)
+{
+    if (value_ns < 0)
+    {
+        value_ns = 0;
+    }
+    if ((hist->count == 0) || (value_ns < hist->min_ns))
+    {
+        hist->min_ns = value_ns;
+    }
+    if (value_ns > hist->max_ns)
+    {
+        hist->max_ns = value_ns;
+    }
+    hist->sum_ns += value_ns;
+    hist->count++;
+    hist->bins[soem_hist_bin(value_ns)]++;
+}
+
+static void soem_stats_clear(soem_cyclestatst *stats)
+{
+    stats->cycles = 0;
+    stats->wkc_mismatches = 0;
+    stats->overruns = 0;
+    memset(&stats->wakeup_latency, 0, sizeof(stats->wakeup_latency));
+    memset(&stats->roundtrip, 0, sizeof(stats->roundtrip));
+    stats->send_ns = 0;
+    memset(&stats->dc_offset, 0, sizeof(stats->dc_offset));
+    stats->dc_offset_ns = 0;
+    stats->dc_correction_ns = 0;
+    stats->dc_drift_ns = 0;
+}
+
+/* seqlock: the sequence number is odd while the writer updates the statistics */
+static void soem_stats_write_begin(soem_cyclestatst *stats)
+{
+    SOEM_ATOMIC_STORE(&stats->seq, stats->seq + 1);
+    SOEM_ATOMIC_FENCE();
+    if (SOEM_ATOMIC_LOAD(&stats->reset_pending))
+    {
+        soem_stats_clear(stats);
+        SOEM_ATOMIC_STORE(&stats->reset_pending, 0);
+    }
+}
+
+static void soem_stats_write_end(soem_cyclestatst *stats)
+{
+    SOEM_ATOMIC_STORE(&stats->seq, stats->seq + 1);
+}
+
+void soem_stats_reset(soem_cyclestatst *stats)
+{
+    soem_stats_write_begin(stats);
+    soem_stats_clear(stats);
+    soem_stats_write_end(stats);
+}
+
+void soem_stats_request_reset(soem_cyclestatst *stats)
+{
+    SOEM_ATOMIC_STORE(&stats->reset_pending, 1);
+}
+
+void soem_stats_record_send(soem_cyclestatst *stats)
+{
+    stats->send_ns = soem_monotonic_ns();
+}
+
+void soem_stats_record_receive(soem_cyclestatst *stats, int wkc, int expected_wkc)
+{
+    int64 now_ns = soem_monotonic_ns();
+    soem_stats_write_begin(stats);
+    stats->cycles++;
+    if (stats->send_ns != 0)
+    {
+        soem_hist_record(&stats->roundtrip, now_ns - stats->send_ns);
+        stats->send_ns = 0;
+    }
+    if (wkc != expected_wkc)
+    {
+        stats->wkc_mismatches++;
+    }
+    soem_stats_write_end(stats);
+}
+
+void soem_stats_snapshot(soem_cyclestatst *stats, soem_cyclestatst *out)
+{
+    uint32 seq1, seq2;
+    do
+    {
+        seq1 = SOEM_ATOMIC_LOAD(&stats->seq);
+        memcpy(out, stats, sizeof(*out));
+        SOEM_ATOMIC_FENCE();
+        seq2 = SOEM_ATOMIC_LOAD(&stats->seq);
+    } while ((seq1 & 1) || (seq1 != seq2));
+}
+
+int soem_snapshot_init(soem_snapshott *self, const uint8 *source, int size)
+{
+    int i;
+    soem_snapshot_free(self);
+    self->source = source;
+    self->size = size;
+    for (i = 0; i < 2; i++)
+    {
+        /* allocate at least one byte, so a missing buffer always means an error */
+        self->buf[i].data = (uint8 *)malloc(size > 0 ? size : 1);
+        if (self->buf[i].data == NULL)
+        {
+            soem_snapshot_free(self);
+            return ENOMEM;
+        }
+    }
+    return 0;
+}
+
+void soem_snapshot_free(soem_snapshott *self)
+{
+    free(self->buf[0].data);
+    free(self->buf[1].data);
+    memset(self, 0, sizeof(*self));
+    self->current = -1;
+}
+
+void soem_snapshot_publish(soem_snapshott *self, int wkc, int64 dc_time)
+{
+    soem_snapshot_buft *buf;
+    int next;
+
+    if (self->buf[0].data == NULL)
+    {
+        return;
+    }
+    self->cycle++;
+    if (wkc <= 0)
+    {
+        return;
+    }
+    next = (self->current == 0) ? 1 : 0;
+    buf = &self->buf[next];
+    SOEM_ATOMIC_STORE(&buf->seq, buf->seq + 1);
+    SOEM_ATOMIC_FENCE();
+    memcpy(buf->data, self->source, self->size);
+    buf->cycle = self->cycle;
+    buf->timestamp_ns = soem_monotonic_ns();
+    buf->dc_time = dc_time;
+    buf->wkc = wkc;
+    SOEM_ATOMIC_STORE(&buf->seq, buf->seq + 1);
+    SOEM_ATOMIC_STORE(&self->current, next);
+}
+
+int soem_snapshot_read(soem_snapshott *self, uint8 *out, uint64 *cycle, int64 *timestamp_ns, int64 *dc_time, int *wkc)
+{
+    soem_snapshot_buft *buf;
+    uint32 seq1, seq2;
+    int idx;
+
+    for (;;)
+    {
+        idx = SOEM_ATOMIC_LOAD(&self->current);
+        if (idx < 0)
+        {
+            return 0;
+        }
+        buf = &self->buf[idx];
+        seq1 = SOEM_ATOMIC_LOAD(&buf->seq);
+        if (seq1 & 1)
+        {
+            continue;
+        }
+        memcpy(out, buf->data, self->size);
+        *cycle = buf->cycle;
+        *timestamp_ns = buf->timestamp_ns;
+        *dc_time = buf->dc_time;
+        *wkc = buf->wkc;
+        SOEM_ATOMIC_FENCE();
+        seq2 = SOEM_ATOMIC_LOAD(&buf->seq);
+        if (seq1 == seq2)
+        {
+            return 1;
+        }
+    }
+}
+
+static void soem_sleep_until(int64 deadline_ns)
+{
+#if defined(__linux__)
+    struct timespec ts;
+    ts.tv_sec = deadline_ns / NSEC_PER_SEC;
+    ts.tv_nsec = deadline_ns % NSEC_PER_SEC;
+    while (clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &ts, NULL) == EINTR)
+    {
+    }
+#else
+    /* no absolute sleep available, fall back to a relative one */
+    int64 remaining_ns = deadline_ns - soem_monotonic_ns();
+    if (remaining_ns > 0)
+    {
+#if defined(_WIN32)
+        osal_usleep((uint32)(remaining_ns / 1000));
+#else
+        struct timespec ts;
+        ts.tv_sec = remaining_ns / NSEC_PER_SEC;
+        ts.tv_nsec = remaining_ns % NSEC_PER_SEC;
+        nanosleep(&ts, NULL);
+#endif
+    }
+#endif
+}
+
+/* PI controller of the SOEM examples (ec_sync): the phase error of the frame
+ * at the reference clock is corrected by 1/100 per cycle, the integral part
+ * follows the drift between the reference clock and the local clock. */
+static int64 soem_dc_sync_correction(soem_cyclict *self, int64 dc_time, int64 period_ns,
+                                     int64 *offset_ns, int64 *drift_ns)
+{
+    int64 delta = (dc_time - self->dc_sync_offset_ns) % period_ns;
+
+    if (delta > (period_ns / 2))
+    {
+        delta -= period_ns;
+    }
+    else if (delta < -(period_ns / 2))
+    {
+        delta += period_ns;
+    }
+    if (delta > 0)
+    {
+        self->dc_integral++;
+    }
+    else if (delta < 0)
+    {
+        self->dc_integral--;
+    }
+    *offset_ns = delta;
+    *drift_ns = -(self->dc_integral / 20);
+    return -(delta / 100) + *drift_ns;
+}
+
+static int soem_cyclic_exchange_group(soem_cyclict *self, soem_cyclic_groupt *group)
+{
+    if (self->overlap)
+    {
+        ecx_send_overlap_processdata_group(self->context, group->group);
+    }
+    else
+    {
+        ecx_send_processdata_group(self->context, group->group);
+    }
+    return ecx_receive_processdata_group(self->context, group->group, self->timeout_us);
+}
+
+static void soem_cyclic_loop(soem_cyclict *self)
+{
+    soem_cyclestatst *stats = self->stats;
+    soem_cyclic_groupt *group;
+    int64 deadline_ns, wake_ns, end_ns;
+    int64 correction_ns = 0, dc_offset_ns = 0, dc_drift_ns = 0;
+    int i, wkc, cycle_wkc, total_wkc, wkc_mismatches, overruns, is_dc_synced;
+
+    deadline_ns = soem_monotonic_ns();
+    for (i = 0; i < self->ngroups; i++)
+    {
+        self->groups[i].next_ns = deadline_ns + self->groups[i].period_ns;
+    }
+
+    while (!SOEM_ATOMIC_LOAD(&self->stop))
+    {
+        deadline_ns = self->groups[0].next_ns;
+        for (i = 1; i < self->ngroups; i++)
+        {
+            if (self->groups[i].next_ns < deadline_ns)
+            {
+                deadline_ns = self->groups[i].next_ns;
+            }
+        }
+        soem_sleep_until(deadline_ns);
+        wake_ns = soem_monotonic_ns();
+
+        cycle_wkc = 0;
+        wkc_mismatches = 0;
+        overruns = 0;
+        is_dc_synced = 0;
+        for (i = 0; i < self->ngroups; i++)
+        {
+            group = &self->groups[i];
+            if (group->next_ns > wake_ns)
+            {
+                continue;
+            }
+            /* the exchanges of the groups can not overlap, as receiving
+             * collects the frames of all groups sent before */
+            wkc = soem_cyclic_exchange_group(self, group);
+            end_ns = soem_monotonic_ns();
+            SOEM_ATOMIC_STORE(&group->wkc, wkc);
+            SOEM_ATOMIC_STORE(&group->cycle_count, group->cycle_count + 1);
+            if (wkc > 0)
+            {
+                cycle_wkc += wkc;
+            }
+            if (wkc != group->expected_wkc)
+            {
+                wkc_mismatches++;
+            }
+            /* the DC time is only valid if the frames came back */
+            if (self->dc_sync && (i == self->dc_group) && (wkc > 0))
+            {
+                correction_ns = soem_dc_sync_correction(self, *(self->context->DCtime), group->period_ns,
+                                                        &dc_offset_ns, &dc_drift_ns);
+                is_dc_synced = 1;
+            }
+            group->next_ns += group->period_ns;
+            /* when the exchange ended after the next deadline, a complete period was missed:
+             * restart the schedule of the group one period from now instead of sending a
+             * burst of frames to catch up */
+            if (end_ns > group->next_ns)
+            {
+                overruns++;
+                group->next_ns = end_ns + group->period_ns;
+            }
+        }
+        end_ns = soem_monotonic_ns();
+
+        if (self->snapshot != NULL)
+        {
+            soem_snapshot_publish(self->snapshot, cycle_wkc, *(self->context->DCtime));
+        }
+        total_wkc = 0;
+        for (i = 0; i < self->ngroups; i++)
+        {
+            total_wkc += self->groups[i].wkc;
+        }
+        SOEM_ATOMIC_STORE(&self->wkc, total_wkc);
+        SOEM_ATOMIC_STORE(&self->cycle_count, self->cycle_count + 1);
+
+        if (stats != NULL)
+        {
+            soem_stats_write_begin(stats);
+            stats->cycles++;
+            soem_hist_record(&stats->wakeup_latency, wake_ns - deadline_ns);
+            soem_hist_record(&stats->roundtrip, end_ns - wake_ns);
+            stats->wkc_mismatches += wkc_mismatches;
+            stats->overruns += overruns;
+            if (is_dc_synced)
+            {
+                soem_hist_record(&stats->dc_offset, (dc_offset_ns < 0) ? -dc_offset_ns : dc_offset_ns);
+                stats->dc_offset_ns = dc_offset_ns;
+                stats->dc_correction_ns = correction_ns;
+                stats->dc_drift_ns = dc_drift_ns;
+            }
+            soem_stats_write_end(stats);
+        }
+        if (is_dc_synced)
+        {
+            for (i = 0; i < self->ngroups; i++)
+            {
+                self->groups[i].next_ns += correction_ns;
+            }
+        }
+    }
+}
+
+#if defined(_WIN32)
+static DWORD WINAPI soem_cyclic_thread(LPVOID param)
+{
+    soem_cyclic_loop((soem_cyclict *)param);
+    return 0;
+}
+#else
+static void *soem_cyclic_thread(void *param)
+{
+    soem_cyclic_loop((soem_cyclict *)param);
+    return NULL;
+}
+#endif
+
+int soem_cyclic_start(soem_cyclict *self, ecx_contextt *context, soem_cyclestatst *stats,
+                      soem_snapshott *snapshot, const uint8 *groups, const int64 *periods_ns, int ngroups,
+                      int timeout_us, int overlap, int rt_priority, int dc_sync, int64 dc_sync_offset_ns)
+{
+    int i;
+
+    if (SOEM_ATOMIC_LOAD(&self->running))
+    {
+        return EBUSY;
+    }
+    if ((ngroups <= 0) || (ngroups > SOEM_CYCLIC_MAXGROUPS))
+    {
+        return EINVAL;
+    }
+    self->dc_group = -1;
+    for (i = 0; i < ngroups; i++)
+    {
+        if (periods_ns[i] <= 0)
+        {
+            return EINVAL;
+        }
+        self->groups[i].group = groups[i];
+        self->groups[i].period_ns = periods_ns[i];
+        self->groups[i].expected_wkc = soem_expected_wkc(context, groups[i]);
+        self->groups[i].wkc = 0;
+        self->groups[i].cycle_count = 0;
+        if ((self->dc_group < 0) && context->grouplist[groups[i]].hasdc)
+        {
+            self->dc_group = i;
+        }
+    }
+    self->ngroups = ngroups;
+    self->context = context;
+    self->stats = stats;
+    self->snapshot = snapshot;
+    self->timeout_us = timeout_us;
+    self->overlap = overlap;
+    self->dc_sync = dc_sync;
+    self->dc_sync_offset_ns = dc_sync_offset_ns;
+    self->dc_integral = 0;
+    self->wkc = 0;
+    self->cycle_count = 0;
+    SOEM_ATOMIC_STORE(&self->stop, 0);
+
+#if defined(_WIN32)
+    self->thread = CreateThread(NULL, 0, soem_cyclic_thread, self, 0, NULL);
+    if (self->thread == NULL)
+    {
+        return (int)GetLastError();
+    }
+    if (rt_priority > 0)
+    {
+        SetThreadPriority(self->thread, THREAD_PRIORITY_TIME_CRITICAL);
+    }
+#else
+    {
+        int ret;
+        pthread_attr_t attr;
+        struct sched_param schparam;
+
+        pthread_attr_init(&attr);
+        if (rt_priority > 0)
+        {
+            memset(&schparam, 0, sizeof(schparam));
+            schparam.sched_priority = rt_priority;
+            pthread_attr_setinheritsched(&attr, PTHREAD_EXPLICIT_SCHED);
+            pthread_attr_setschedpolicy(&attr, SCHED_FIFO);
+            pthread_attr_setschedparam(&attr, &schparam);
+        }
+        ret = pthread_create(&self->thread, &attr, soem_cyclic_thread, self);
+        pthread_attr_destroy(&attr);
+        if (ret != 0)
+        {
+            return ret;
+        }
+    }
+#endif
+    SOEM_ATOMIC_STORE(&self->running, 1);
+    return 0;
+}
+
+void soem_cyclic_stop(soem_cyclict *self)
+{
+    if (!SOEM_ATOMIC_LOAD(&self->running))
+    {
+        return;
+    }
+    SOEM_ATOMIC_STORE(&self->stop, 1);
+#if defined(_WIN32)
+    WaitForSingleObject(self->thread, INFINITE);
+    CloseHandle(self->thread);
+#else
+    pthread_join(self->thread, NULL);
+#endif
+    SOEM_ATOMIC_STORE(&self->running, 0);
+}
+
+int soem_cyclic_is_running(soem_cyclict *self)
+{
+    return SOEM_ATOMIC_LOAD(&self->running);
+}
+
+int soem_cyclic_wkc(soem_cyclict *self)
+{
+    return SOEM_ATOMIC_LOAD(&self->wkc);
+}
+
+uint64 soem_cyclic_count(soem_cyclict *self)
+{
+    return SOEM_ATOMIC_LOAD(&self->cycle_count);
+}
+
+int soem_cyclic_group_wkc(soem_cyclict *self, uint8 group)
+{
+    int i;
+    for (i = 0; i < self->ngroups; i++)
+    {
+        if (self->groups[i].group == group)
+        {
+            return SOEM_ATOMIC_LOAD(&self->groups[i].wkc);
+        }
+    }
+    return -1;
+}
+
+uint64 soem_cyclic_group_count(soem_cyclict *self, uint8 group)
+{
+    int i;
+    for (i = 0; i < self->ngroups; i++)
+    {
+        if (self->groups[i].group == group)
+        {
+            return SOEM_ATOMIC_LOAD(&self->groups[i].cycle_count);
+        }
+    }
+    return 0;
+}
@@ -0,0 +1,186 @@
+#ifndef _SOEM_CYCLIC_H
+#define _SOEM_CYCLIC_H
+
+#include "ethercat.h"
+
+#if defined(_WIN32)
+#include <windows.h>
+typedef HANDLE soem_threadt;
+#else
+#include <pthread.h>
+typedef pthread_t soem_threadt;
+#endif
+
+/* Values shared between the cyclic thread and Python are accessed with these
+ * macros, readers never need a lock. MSVC gives volatile accesses acquire and
+ * release semantics on x86/x64. */
+#if defined(__GNUC__) || defined(__clang__)
+#define SOEM_ATOMIC_LOAD(p)      __atomic_load_n((p), __ATOMIC_ACQUIRE)
+#define SOEM_ATOMIC_STORE(p, v)  __atomic_store_n((p), (v), __ATOMIC_RELEASE)
+#define SOEM_ATOMIC_FENCE()      __atomic_thread_fence(__ATOMIC_SEQ_CST)
+#else
+#define SOEM_ATOMIC_LOAD(p)      (*(p))
+#define SOEM_ATOMIC_STORE(p, v)  (*(p) = (v))
+#define SOEM_ATOMIC_FENCE()      MemoryBarrier()
+#endif
+
+/** Number of bins of a timing histogram, bin i counts durations in [2^i, 2^(i+1)) ns. */
+#define SOEM_HIST_BINS 32
+
+typedef struct {
+    uint64 count;
+    int64 min_ns;
+    int64 max_ns;
+    int64 sum_ns;
+    uint64 bins[SOEM_HIST_BINS];
+} soem_histt;
+
+/** Timing statistics of the processdata cycle.
+ *
+ * Only one thread at a time records into it, readers get a consistent copy
+ * with soem_stats_snapshot() without blocking the writer. */
+typedef struct {
+    volatile uint32 seq;
+    volatile int reset_pending;
+    uint64 cycles;
+    uint64 wkc_mismatches;
+    uint64 overruns;
+    /** delay between the scheduled and the actual start of a cycle */
+    soem_histt wakeup_latency;
+    /** time from sending the processdata until it was received */
+    soem_histt roundtrip;
+    /** time of the last send, used by soem_stats_record_receive() */
+    int64 send_ns;
+    /** DC synchronized mode only: absolute phase error of the cycles to SYNC0 */
+    soem_histt dc_offset;
+    /** DC synchronized mode only: phase error of the last cycle, positive if it was late */
+    int64 dc_offset_ns;
+    /** DC synchronized mode only: correction of the last deadline */
+    int64 dc_correction_ns;
+    /** DC synchronized mode only: integral part of the correction, compensates the clock drift */
+    int64 dc_drift_ns;
+} soem_cyclestatst;
+
+typedef struct {
+    /** odd while the buffer is written */
+    volatile uint32 seq;
+    uint64 cycle;
+    int64 timestamp_ns;
+    int64 dc_time;
+    int wkc;
+    uint8 *data;
+} soem_snapshot_buft;
+
+/** Double buffered copy of the input processdata.
+ *
+ * The receiving thread writes into the buffer that is not published, then
+ * publishes it. Readers copy the published buffer and retry in the rare case
+ * that the writer started to overwrite it in the meantime. */
+typedef struct {
+    soem_snapshot_buft buf[2];
+    /** index of the published buffer, -1 if nothing was published yet */
+    volatile int current;
+    const uint8 *source;
+    int size;
+    uint64 cycle;
+} soem_snapshott;
+
+/** Maximum number of groups the cyclic thread can exchange. */
+#define SOEM_CYCLIC_MAXGROUPS 8
+
+typedef struct {
+    uint8 group;
+    int64 period_ns;
+    /** deadline of the next exchange */
+    int64 next_ns;
+    int expected_wkc;
+    /** working counter of the last exchange of the group */
+    volatile int wkc;
+    /** number of exchanges of the group since the start */
+    volatile uint64 cycle_count;
+} soem_cyclic_groupt;
+
+typedef struct {
+    ecx_contextt *context;
+    soem_cyclestatst *stats;
+    soem_snapshott *snapshot;
+    int ngroups;
+    soem_cyclic_groupt groups[SOEM_CYCLIC_MAXGROUPS];
+    int timeout_us;
+    /** use ecx_send_overlap_processdata() for an overlapping IO map */
+    int overlap;
+    /** != 0 to lock the cycles to the DC reference clock */
+    int dc_sync;
+    /** index in groups of the group whose DC time is used, -1 if none */
+    int dc_group;
+    /** target time of the frame at the reference clock, relative to SYNC0 */
+    int64 dc_sync_offset_ns;
+    /** integral of the PI controller */
+    int64 dc_integral;
+    volatile int running;
+    volatile int stop;
+    /** sum of the working counters of the last exchange of each group */
+    volatile int wkc;
+    /** number of cycles since the start, a cycle exchanges all groups that are due */
+    volatile uint64 cycle_count;
+    soem_threadt thread;
+} soem_cyclict;
+
+/** Monotonic time in ns, not related to the wall clock. */
+int64 soem_monotonic_ns(void);
+
+/** Expected working counter of a group, as calculated from the IO mapping. */
+int soem_expected_wkc(ecx_contextt *context, uint8 group);
+
+void soem_stats_reset(soem_cyclestatst *stats);
+/** Reset the statistics by the thread that records, a thread that only reads must use this. */
+void soem_stats_request_reset(soem_cyclestatst *stats);
+void soem_stats_record_send(soem_cyclestatst *stats);
+void soem_stats_record_receive(soem_cyclestatst *stats, int wkc, int expected_wkc);
+/** Copy the statistics, retries while the writer is updating them. */
+void soem_stats_snapshot(soem_cyclestatst *stats, soem_cyclestatst *out);
+
+/** Allocate the buffers for snapshots of size bytes at source.
+ * @return 0 on success, ENOMEM otherwise
+ */
+int soem_snapshot_init(soem_snapshott *self, const uint8 *source, int size);
+void soem_snapshot_free(soem_snapshott *self);
+/** Count a receive and publish a copy of the inputs if frames were received (wkc > 0). */
+void soem_snapshot_publish(soem_snapshott *self, int wkc, int64 dc_time);
+/** Copy the last published snapshot to out, which must hold size bytes.
+ * @return 1 if a snapshot was copied, 0 if nothing was published yet
+ */
+int soem_snapshot_read(soem_snapshott *self, uint8 *out, uint64 *cycle, int64 *timestamp_ns, int64 *dc_time, int *wkc);
+
+/** Start a thread that calls ecx_send_processdata_group() and ecx_receive_processdata_group()
+ * for each group every periods_ns[i] nanoseconds, scheduled on absolute deadlines.
+ * Groups that are due at the same time are exchanged one after the other, in the given order.
+ *
+ * @param[in] groups       the groups to exchange
+ * @param[in] periods_ns   the period of each group
+ * @param[in] ngroups      number of groups, at most SOEM_CYCLIC_MAXGROUPS
+ * @param[in] stats        timing statistics to record into, may be NULL
+ * @param[in] snapshot     input snapshots to publish after each cycle, may be NULL
+ * @param[in] overlap      != 0 if the IO map was created by ecx_config_overlap_map_group()
+ * @param[in] rt_priority  > 0 to run the thread with this real-time priority (POSIX SCHED_FIFO)
+ * @param[in] dc_sync      != 0 to adjust the deadlines, so that the frames pass the DC reference clock
+ *                         dc_sync_offset_ns after its SYNC0 events. The DC time is taken from the first
+ *                         group with DC slaves, its period must be the SYNC0 cycle time.
+ * @return 0 on success, otherwise an error number
+ */
+int soem_cyclic_start(soem_cyclict *self, ecx_contextt *context, soem_cyclestatst *stats,
+                      soem_snapshott *snapshot, const uint8 *groups, const int64 *periods_ns, int ngroups,
+                      int timeout_us, int overlap, int rt_priority, int dc_sync, int64 dc_sync_offset_ns);
+
+/** Request the thread to stop and wait until it has finished the current cycle. */
+void soem_cyclic_stop(soem_cyclict *self);
+
+int soem_cyclic_is_running(soem_cyclict *self);
+int soem_cyclic_wkc(soem_cyclict *self);
+uint64 soem_cyclic_count(soem_cyclict *self);
+/** Working counter of the last exchange of a group, -1 if the group is not exchanged. */
+int soem_cyclic_group_wkc(soem_cyclict *self, uint8 group);
+/** Number of exchanges of a group since the start. */
+uint64 soem_cyclic_group_count(soem_cyclict *self, uint8 group);
+
+#endif /* _SOEM_CYCLIC_H */
@@ -0,0 +1,408 @@
+#include <stdio.h>
+#include <string.h>
+
+#include "soem_enum.h"
+
+/* the defaults of ecx_config_init() */
+#define SOEM_ENUM_MBXSM0 0x00010026
+#define SOEM_ENUM_MBXSM1 0x00010022
+
+/* A byte of the SII, 0xff behind its end as for an empty EEPROM. */
+static uint8 soem_enum_byte(const uint8 *image, int length, int address)
+{
+    return (address < length) ? image[address] : 0xff;
+}
+
+static uint16 soem_enum_word(const uint8 *image, int length, int address)
+{
+    return (uint16)(soem_enum_byte(image, length, address) | (soem_enum_byte(image, length, address + 1) << 8));
+}
+
+static uint32 soem_enum_dword(const uint8 *image, int length, int word_address)
+{
+    return (uint32)soem_enum_word(image, length, 2 * word_address) |
+           ((uint32)soem_enum_word(image, length, 2 * word_address + 2) << 16);
+}
+
+/* The byte address of the length of a category, 0 if the SII has no such category, as ecx_siifind(). */
+static int soem_enum_find(const uint8 *image, int length, uint16 category)
+{
+    int address = ECT_SII_START << 1;
+    uint16 type = soem_enum_word(image, length, address);
+
+    while ((type != category) && (type != 0xffff))
+    {
+        address += 2 + (soem_enum_word(image, length, address + 2) << 1);
+        type = soem_enum_word(image, length, address);
+    }
+    return (type == category) ? address + 2 : 0;
+}
+
+int soem_enum_detect(ecx_contextt *context)
+{
+    uint16 slave, ADPh, configadr, topology, estat, val16, w;
+    int16 topoc, slavec, aliasadr;
+    uint8 b, h;
+    uint8 zbuf[64];
+    int wkc, lp;
+
+    /* ecx_init_context() */
+    *(context->slavecount) = 0;
+    memset(context->slavelist, 0x00, sizeof(ec_slavet) * context->maxslave);
+    memset(context->grouplist, 0x00, sizeof(ec_groupt) * context->maxgroup);
+    ecx_siigetbyte(context, 0, EC_MAXEEPBUF);
+    for (lp = 0; lp < context->maxgroup; lp++)
+    {
+        context->grouplist[lp].logstartaddr = lp << EC_LOGGROUPOFFSET;
+    }
+    /* ecx_detect_slaves() */
+    b = 0x00;
+    ecx_BWR(context->port, 0x0000, ECT_REG_DLALIAS, sizeof(b), &b, EC_TIMEOUTRET3);
+    w = htoes(EC_STATE_INIT | EC_STATE_ACK);
+    ecx_BWR(context->port, 0x0000, ECT_REG_ALCTL, sizeof(w), &w, EC_TIMEOUTRET3);
+    ecx_BWR(context->port, 0x0000, ECT_REG_ALCTL, sizeof(w), &w, EC_TIMEOUTRET3);
+    wkc = ecx_BRD(context->port, 0x0000, ECT_REG_TYPE, sizeof(w), &w, EC_TIMEOUTSAFE);
+    if (wkc <= 0)
+    {
+        return wkc;
+    }
+    if (wkc >= context->maxslave)
+    {
+        return EC_SLAVECOUNTEXCEEDED;
+    }
+    *(context->slavecount) = wkc;
+    /* ecx_set_slaves_to_default() */
+    memset(&zbuf, 0x00, sizeof(zbuf));
+    b = 0x00;
+    ecx_BWR(context->port, 0x0000, ECT_REG_DLPORT, sizeof(b), &b, EC_TIMEOUTRET3);
+    w = htoes(0x0004);
+    ecx_BWR(context->port, 0x0000, ECT_REG_IRQMASK, sizeof(w), &w, EC_TIMEOUTRET3);
+    ecx_BWR(context->port, 0x0000, ECT_REG_RXERR, 8, &zbuf, EC_TIMEOUTRET3);
+    ecx_BWR(context->port, 0x0000, ECT_REG_FMMU0, 16 * 3, &zbuf, EC_TIMEOUTRET3);
+    ecx_BWR(context->port, 0x0000, ECT_REG_SM0, 8 * 4, &zbuf, EC_TIMEOUTRET3);
+    b = 0x00;
+    ecx_BWR(context->port, 0x0000, ECT_REG_DCSYNCACT, sizeof(b), &b, EC_TIMEOUTRET3);
+    ecx_BWR(context->port, 0x0000, ECT_REG_DCSYSTIME, 4, &zbuf, EC_TIMEOUTRET3);
+    w = htoes(0x1000);
+    ecx_BWR(context->port, 0x0000, ECT_REG_DCSPEEDCNT, sizeof(w), &w, EC_TIMEOUTRET3);
+    w = htoes(0x0c00);
+    ecx_BWR(context->port, 0x0000, ECT_REG_DCTIMEFILT, sizeof(w), &w, EC_TIMEOUTRET3);
+    b = 0x00;
+    ecx_BWR(context->port, 0x0000, ECT_REG_DLALIAS, sizeof(b), &b, EC_TIMEOUTRET3);
+    w = htoes(EC_STATE_INIT | EC_STATE_ACK);
+    ecx_BWR(context->port, 0x0000, ECT_REG_ALCTL, sizeof(w), &w, EC_TIMEOUTRET3);
+    b = 2;
+    ecx_BWR(context->port, 0x0000, ECT_REG_EEPCFG, sizeof(b), &b, EC_TIMEOUTRET3);
+    b = 0;
+    ecx_BWR(context->port, 0x0000, ECT_REG_EEPCFG, sizeof(b), &b, EC_TIMEOUTRET3);
+
+    for (slave = 1; slave <= *(context->slavecount); slave++)
+    {
+        ADPh = (uint16)(1 - slave);
+        val16 = ecx_APRDw(context->port, ADPh, ECT_REG_PDICTL, EC_TIMEOUTRET3);
+        context->slavelist[slave].Itype = etohs(val16);
+        ecx_APWRw(context->port, ADPh, ECT_REG_STADR, htoes(slave + EC_NODEOFFSET), EC_TIMEOUTRET3);
+        /* kill non ecat frames for the first slave, pass them for the following ones */
+        b = (slave == 1) ? 1 : 0;
+        ecx_APWRw(context->port, ADPh, ECT_REG_DLCTL, htoes(b), EC_TIMEOUTRET3);
+        configadr = etohs(ecx_APRDw(context->port, ADPh, ECT_REG_STADR, EC_TIMEOUTRET3));
+        context->slavelist[slave].configadr = configadr;
+        ecx_FPRD(context->port, configadr, ECT_REG_ALIAS, sizeof(aliasadr), &aliasadr, EC_TIMEOUTRET3);
+        context->slavelist[slave].aliasadr = etohs(aliasadr);
+        ecx_FPRD(context->port, configadr, ECT_REG_EEPSTAT, sizeof(estat), &estat, EC_TIMEOUTRET3);
+        if (etohs(estat) & EC_ESTAT_R64)
+        {
+            context->slavelist[slave].eep_8byte = 1;
+        }
+        val16 = ecx_FPRDw(context->port, configadr, ECT_REG_ESCSUP, EC_TIMEOUTRET3);
+        context->slavelist[slave].hasdc = ((etohs(val16) & 0x04) > 0) ? TRUE : FALSE;
+        topology = etohs(ecx_FPRDw(context->port, configadr, ECT_REG_DLSTAT, EC_TIMEOUTRET3));
+        h = 0;
+        b = 0;
+        /* open ports with communication established */
+        for (lp = 0; lp < 4; lp++)
+        {
+            if (((topology >> (8 + 2 * lp)) & 0x03) == 0x02)
+            {
+                h++;
+                b |= (uint8)(1 << lp);
+            }
+        }
+        val16 = ecx_FPRDw(context->port, configadr, ECT_REG_PORTDES, EC_TIMEOUTRET3);
+        context->slavelist[slave].ptype = LO_BYTE(etohs(val16));
+        context->slavelist[slave].topology = h;
+        context->slavelist[slave].activeports = b;
+        /* search for parent */
+        context->slavelist[slave].parent = 0;
+        if (slave > 1)
+        {
+            topoc = 0;
+            slavec = slave - 1;
+            do
+            {
+                topology = context->slavelist[slavec].topology;
+                if (topology == 1)
+                {
+                    topoc--;
+                }
+                if (topology == 3)
+                {
+                    topoc++;
+                }
+                if (topology == 4)
+                {
+                    topoc += 2;
+                }
+                if (((topoc >= 0) && (topology > 1)) || (slavec == 1))
+                {
+                    context->slavelist[slave].parent = slavec;
+                    slavec = 1;
+                }
+                slavec--;
+            }
+            while (slavec > 0);
+        }
+    }
+    return wkc;
+}
+
+/* Copy the SII information of a previous slave with the same identity, as ecx_lookup_prev_sii(). */
+static int soem_enum_lookup_previous(ecx_contextt *context, uint16 slave)
+{
+    ec_slavet *current = &context->slavelist[slave];
+    ec_slavet *previous;
+    int i;
+    int nSM;
+
+    for (i = 1; i < slave; i++)
+    {
+        previous = &context->slavelist[i];
+        if ((previous->eep_man == current->eep_man) && (previous->eep_id == current->eep_id) &&
+            (previous->eep_rev == current->eep_rev))
+        {
+            current->CoEdetails = previous->CoEdetails;
+            current->FoEdetails = previous->FoEdetails;
+            current->EoEdetails = previous->EoEdetails;
+            current->SoEdetails = previous->SoEdetails;
+            if (previous->blockLRW > 0)
+            {
+                current->blockLRW = 1;
+                context->slavelist[0].blockLRW++;
+            }
+            current->Ebuscurrent = previous->Ebuscurrent;
+            context->slavelist[0].Ebuscurrent += current->Ebuscurrent;
+            memcpy(current->name, previous->name, EC_MAXNAME + 1);
+            for (nSM = 0; nSM < EC_MAXSM; nSM++)
+            {
+                current->SM[nSM].StartAddr = previous->SM[nSM].StartAddr;
+                current->SM[nSM].SMlength = previous->SM[nSM].SMlength;
+                current->SM[nSM].SMflags = previous->SM[nSM].SMflags;
+            }
+            current->FMMU0func = previous->FMMU0func;
+            current->FMMU1func = previous->FMMU1func;
+            current->FMMU2func = previous->FMMU2func;
+            current->FMMU3func = previous->FMMU3func;
+            return 1;
+        }
+    }
+    return 0;
+}
+
+/* Take the general information, name, sync managers and FMMUs of a slave from its SII. */
+static void soem_enum_configure_sii(ecx_contextt *context, uint16 slave, const uint8 *image, int length)
+{
+    ec_slavet *sl = &context->slavelist[slave];
+    int address;
+    int count;
+    int nSM;
+    int i;
+    uint8 n;
+    uint8 function;
+
+    address = soem_enum_find(image, length, ECT_SII_GENERAL);
+    if (address)
+    {
+        sl->CoEdetails = soem_enum_byte(image, length, address + 0x07);
+        sl->FoEdetails = soem_enum_byte(image, length, address + 0x08);
+        sl->EoEdetails = soem_enum_byte(image, length, address + 0x09);
+        sl->SoEdetails = soem_enum_byte(image, length, address + 0x0a);
+        if ((soem_enum_byte(image, length, address + 0x0d) & 0x02) > 0)
+        {
+            sl->blockLRW = 1;
+            context->slavelist[0].blockLRW++;
+        }
+        sl->Ebuscurrent = (int16)soem_enum_word(image, length, address + 0x0e);
+        context->slavelist[0].Ebuscurrent += sl->Ebuscurrent;
+    }
+    address = soem_enum_find(image, length, ECT_SII_STRING);
+    if (address)
+    {
+        /* the name is the first string */
+        sl->name[0] = 0;
+        address += 2;
+        if (soem_enum_byte(image, length, address++) >= 1)
+        {
+            n = soem_enum_byte(image, length, address++);
+            for (i = 0; i < n && i < EC_MAXNAME; i++)
+            {
+                sl->name[i] = (char)soem_enum_byte(image, length, address + i);
+            }
+            sl->name[i] = 0;
+        }
+    }
+    else
+    {
+        sprintf(sl->name, "? M:%8.8x I:%8.8x", (unsigned int)sl->eep_man, (unsigned int)sl->eep_id);
+    }
+    address = soem_enum_find(image, length, ECT_SII_SM);
+    if (address)
+    {
+        count = soem_enum_word(image, length, address) / 4;
+        address += 2;
+        for (nSM = 0; (nSM < count) && (nSM < EC_MAXSM); nSM++, address += 8)
+        {
+            sl->SM[nSM].StartAddr = htoes(soem_enum_word(image, length, address));
+            sl->SM[nSM].SMlength = htoes(soem_enum_word(image, length, address + 2));
+            sl->SM[nSM].SMflags = htoel((uint32)soem_enum_byte(image, length, address + 4) +
+                                        ((uint32)soem_enum_byte(image, length, address + 6) << 16));
+        }
+    }
+    address = soem_enum_find(image, length, ECT_SII_FMMU);
+    if (address)
+    {
+        count = 2 * soem_enum_word(image, length, address);
+        address += 2;
+        for (i = 0; (i < count) && (i < 4); i++)
+        {
+            function = soem_enum_byte(image, length, address + i);
+            if (function == 0xff)
+            {
+                continue;
+            }
+            switch (i)
+            {
+                case 0: sl->FMMU0func = function; break;
+                case 1: sl->FMMU1func = function; break;
+                case 2: sl->FMMU2func = function; break;
+                default: sl->FMMU3func = function; break;
+            }
+        }
+    }
+}
+
+void soem_enum_configure(ecx_contextt *context, uint16 slave, const uint8 *image, int length)
+{
+    ec_slavet *sl = &context->slavelist[slave];
+    uint32 mailbox;
+
+    sl->eep_man = soem_enum_dword(image, length, ECT_SII_MANUF);
+    sl->eep_sn = soem_enum_dword(image, length, ECT_SII_SN);
+    sl->eep_id = soem_enum_dword(image, length, ECT_SII_ID);
+    sl->eep_rev = soem_enum_dword(image, length, ECT_SII_REV);
+    mailbox = soem_enum_dword(image, length, ECT_SII_RXMBXADR);
+    sl->mbx_wo = (uint16)LO_WORD(mailbox);
+    sl->mbx_l = (uint16)HI_WORD(mailbox);
+    if (sl->mbx_l > 0)
+    {
+        mailbox = soem_enum_dword(image, length, ECT_SII_TXMBXADR);
+        sl->mbx_ro = (uint16)LO_WORD(mailbox);
+        sl->mbx_rl = (uint16)HI_WORD(mailbox);
+        if (sl->mbx_rl == 0)
+        {
+            sl->mbx_rl = sl->mbx_l;
+        }
+    }
+    (void)ecx_statecheck(context, slave, EC_STATE_INIT, EC_TIMEOUTSTATE);
+    /* default mailbox configuration */
+    if (sl->mbx_l > 0)
+    {
+        sl->SMtype[0] = 1;
+        sl->SMtype[1] = 2;
+        sl->SMtype[2] = 3;
+        sl->SMtype[3] = 4;
+        sl->SM[0].StartAddr = htoes(sl->mbx_wo);
+        sl->SM[0].SMlength = htoes(sl->mbx_l);
+        sl->SM[0].SMflags = htoel(SOEM_ENUM_MBXSM0);
+        sl->SM[1].StartAddr = htoes(sl->mbx_ro);
+        sl->SM[1].SMlength = htoes(sl->mbx_rl);
+        sl->SM[1].SMflags = htoel(SOEM_ENUM_MBXSM1);
+        sl->mbx_proto = soem_enum_word(image, length, 2 * ECT_SII_MBXPROTO);
+    }
+    if (!soem_enum_lookup_previous(context, slave))
+    {
+        soem_enum_configure_sii(context, slave, image, length);
+    }
+    if (sl->mbx_l > 0)
+    {
+        if (sl->SM[0].StartAddr == 0x0000)
+        {
+            sl->SM[0].StartAddr = htoes(0x1000);
+            sl->SM[0].SMlength = htoes(0x0080);
+            sl->SM[0].SMflags = htoel(SOEM_ENUM_MBXSM0);
+            sl->SMtype[0] = 1;
+        }
+        if (sl->SM[1].StartAddr == 0x0000)
+        {
+            sl->SM[1].StartAddr = htoes(0x1080);
+            sl->SM[1].SMlength = htoes(0x0080);
+            sl->SM[1].SMflags = htoel(SOEM_ENUM_MBXSM1);
+            sl->SMtype[1] = 2;
+        }
+        /* both mailbox sync managers in one datagram */
+        ecx_FPWR(context->port, sl->configadr, ECT_REG_SM0, sizeof(ec_smt) * 2, &(sl->SM[0]), EC_TIMEOUTRET3);
+    }
+    /* some slaves need the EEPROM in the transition from INIT to PRE-OP */
+    ecx_eeprom2pdi(context, slave);
+    if (context->manualstatechange == 0)
+    {
+        ecx_FPWRw(context->port, sl->configadr, ECT_REG_ALCTL, htoes(EC_STATE_PRE_OP | EC_STATE_ACK), EC_TIMEOUTRET3);
+    }
+}
+
+void soem_enum_restore(ecx_contextt *context, uint16 slave)
+{
+    ec_slavet *sl = &context->slavelist[slave];
+
+    (void)ecx_statecheck(context, slave, EC_STATE_INIT, EC_TIMEOUTSTATE);
+    if (sl->mbx_l > 0)
+    {
+        ecx_FPWR(context->port, sl->configadr, ECT_REG_SM0, sizeof(ec_smt) * 2, &(sl->SM[0]), EC_TIMEOUTRET3);
+    }
+    /* soem_enum_detect() gave the EEPROM to the master */
+    sl->eep_pdi = 0;
+    ecx_eeprom2pdi(context, slave);
+    if (context->manualstatechange == 0)
+    {
+        ecx_FPWRw(context->port, sl->configadr, ECT_REG_ALCTL, htoes(EC_STATE_PRE_OP | EC_STATE_ACK), EC_TIMEOUTRET3);
+    }
+}
+
+void soem_enum_restore_map(ecx_contextt *context, uint16 slave)
+{
+    ec_slavet *sl = &context->slavelist[slave];
+    int nSM;
+    int FMMUc;
+
+    /* the mailbox sync managers are written by soem_enum_restore() */
+    for (nSM = (sl->mbx_l > 0) ? 2 : 0; nSM < EC_MAXSM; nSM++)
+    {
+        if (sl->SM[nSM].StartAddr)
+        {
+            ecx_FPWR(context->port, sl->configadr, (uint16)(ECT_REG_SM0 + (nSM * sizeof(ec_smt))), sizeof(ec_smt),
+                     &(sl->SM[nSM]), EC_TIMEOUTRET3);
+        }
+    }
+    for (FMMUc = 0; FMMUc < sl->FMMUunused && FMMUc < EC_MAXFMMU; FMMUc++)
+    {
+        if (sl->FMMU[FMMUc].LogLength)
+        {
+            ecx_FPWR(context->port, sl->configadr, (uint16)(ECT_REG_FMMU0 + (sizeof(ec_fmmut) * FMMUc)),
+                     sizeof(ec_fmmut), &(sl->FMMU[FMMUc]), EC_TIMEOUTRET3);
+        }
+    }
+    ecx_eeprom2pdi(context, slave);
+    if (context->manualstatechange == 0)
+    {
+        ecx_FPWRw(context->port, sl->configadr, ECT_REG_ALCTL, htoes(EC_STATE_SAFE_OP), EC_TIMEOUTRET3);
+    }
+}
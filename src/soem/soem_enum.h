@@ -0,0 +1,42 @@
+#ifndef _SOEM_ENUM_H
+#define _SOEM_ENUM_H
+
+#include "ethercat.h"
+
+/** Detect the slaves and set them up for reading their SII.
+ *
+ * This is the part of ecx_config_init() before the SII is read: the slaves are reset to
+ * their defaults, get their station addresses, and their topology is found.
+ *
+ * @return working counter of the slave discover datagram = number of slaves found
+ */
+int soem_enum_detect(ecx_contextt *context);
+
+/** Configure a slave from its SII, as ecx_config_init() does after soem_enum_detect().
+ *
+ * The identity, mailboxes, general information, name, sync managers and FMMUs of the slave are
+ * taken from image instead of being read from the EEPROM. The mailbox sync managers are written
+ * and the slave is requested to go to PRE-OP, unless the state changes are manual.
+ *
+ * @param[in] slave   the slave
+ * @param[in] image   the SII of the slave, starting at word address 0
+ * @param[in] length  number of bytes in image, missing bytes are read as 0xff
+ */
+void soem_enum_configure(ecx_contextt *context, uint16 slave, const uint8 *image, int length);
+
+/** Bring a slave restored from a saved configuration to PRE-OP.
+ *
+ * The slave list entry must hold the saved configuration, after soem_enum_detect(). The mailbox
+ * sync managers are written and the slave is requested to go to PRE-OP, unless the state changes
+ * are manual, as soem_enum_configure() does.
+ */
+void soem_enum_restore(ecx_contextt *context, uint16 slave);
+
+/** Program the process data of a restored slave, as ecx_config_map_group() does.
+ *
+ * The sync managers and FMMUs of the slave list entry are written, without calculating them again,
+ * and the slave is requested to go to SAFE-OP, unless the state changes are manual.
+ */
+void soem_enum_restore_map(ecx_contextt *context, uint16 slave);
+
+#endif /* _SOEM_ENUM_H */
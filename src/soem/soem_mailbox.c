@@ -0,0 +1,439 @@
+#include <string.h>
+
+#include "soem_mailbox.h"
+
+/** Delay in us between two polls of the mailbox status, as used by SOEM. */
+#define SOEM_MBX_POLLDELAY 200
+/** FPRD datagrams of the mailbox status in one frame, 64 * 14 bytes fit well into a frame. */
+#define SOEM_MBX_POLLS_PER_FRAME 64
+
+/* The FOEhook gets no context, the progress of a transfer is found by the thread running it. */
+#if defined(_MSC_VER)
+#define SOEM_THREAD_LOCAL __declspec(thread)
+#else
+#define SOEM_THREAD_LOCAL __thread
+#endif
+
+static SOEM_THREAD_LOCAL soem_foe_progresst *soem_foe_current = NULL;
+
+enum {
+    SOEM_SDO_DONE,
+    SOEM_SDO_PENDING,
+    SOEM_SDO_SEGMENTED
+};
+
+/* Same layout as the SDO structure of ethercatcoe.c, which is not public. */
+PACKED_BEGIN
+typedef struct PACKED
+{
+    ec_mbxheadert   MbxHeader;
+    uint16          CANOpen;
+    uint8           Command;
+    uint16          Index;
+    uint8           SubIndex;
+    union
+    {
+        uint8   bdata[0x200];
+        uint16  wdata[0x100];
+        uint32  ldata[0x80];
+    };
+} soem_sdot;
+PACKED_END
+
+static void soem_sdo_upload_request(ecx_contextt *context, soem_sdo_requestt *request, ec_mbxbuft *mbx)
+{
+    soem_sdot *sdo = (soem_sdot *)mbx;
+    uint8 cnt;
+
+    ec_clearmbx(mbx);
+    sdo->MbxHeader.length = htoes(0x000a);
+    sdo->MbxHeader.address = htoes(0x0000);
+    sdo->MbxHeader.priority = 0x00;
+    cnt = ec_nextmbxcnt(context->slavelist[request->slave].mbx_cnt);
+    context->slavelist[request->slave].mbx_cnt = cnt;
+    sdo->MbxHeader.mbxtype = ECT_MBXT_COE + MBX_HDR_SET_CNT(cnt);
+    sdo->CANOpen = htoes(0x000 + (ECT_COES_SDOREQ << 12));
+    sdo->Command = request->ca ? ECT_SDO_UP_REQ_CA : ECT_SDO_UP_REQ;
+    sdo->Index = htoes(request->index);
+    sdo->SubIndex = (request->ca && (request->subindex > 1)) ? 1 : request->subindex;
+    sdo->ldata[0] = 0;
+}
+
+/* Evaluate the response like ecx_SDOread() does. */
+static void soem_sdo_upload_response(ecx_contextt *context, soem_sdo_requestt *request, ec_mbxbuft *mbx)
+{
+    soem_sdot *sdo = (soem_sdot *)mbx;
+    int bytesize;
+    int32 sdolen;
+    uint16 framedatasize;
+
+    request->state = SOEM_SDO_DONE;
+    if (((sdo->MbxHeader.mbxtype & 0x0f) == ECT_MBXT_COE) &&
+        ((etohs(sdo->CANOpen) >> 12) == ECT_COES_SDORES) &&
+        (etohs(sdo->Index) == request->index))
+    {
+        if ((sdo->Command & 0x02) > 0)
+        {
+            /* expedited frame response */
+            bytesize = 4 - ((sdo->Command >> 2) & 0x03);
+            if (request->size >= bytesize)
+            {
+                memcpy(request->data, &sdo->ldata[0], bytesize);
+                request->size = bytesize;
+            }
+            else
+            {
+                request->wkc = 0;
+                ecx_packeterror(context, request->slave, request->index, request->subindex, 3);
+            }
+        }
+        else
+        {
+            /* normal frame response */
+            sdolen = etohl(sdo->ldata[0]);
+            framedatasize = etohs(sdo->MbxHeader.length) - 10;
+            if (sdolen > request->size)
+            {
+                request->wkc = 0;
+                ecx_packeterror(context, request->slave, request->index, request->subindex, 3);
+            }
+            else if (framedatasize < sdolen)
+            {
+                request->state = SOEM_SDO_SEGMENTED;
+            }
+            else
+            {
+                memcpy(request->data, &sdo->ldata[1], sdolen);
+                request->size = sdolen;
+            }
+        }
+    }
+    else
+    {
+        if (sdo->Command == ECT_SDO_ABORT)
+        {
+            ecx_SDOerror(context, request->slave, request->index, request->subindex, etohl(sdo->ldata[0]));
+        }
+        else
+        {
+            ecx_packeterror(context, request->slave, request->index, request->subindex, 1);
+        }
+        request->wkc = 0;
+    }
+}
+
+/* Move the errors of the context into the requests of their slaves. */
+static void soem_mbx_pop_errors(ecx_contextt *context, soem_sdo_requestt *requests, int count,
+                                soem_emergenciest *emergencies)
+{
+    ec_errort err;
+    int i;
+
+    while (ecx_poperror(context, &err))
+    {
+        if (err.Etype == EC_ERR_TYPE_EMERGENCY)
+        {
+            if ((emergencies != NULL) && (emergencies->count < emergencies->capacity))
+            {
+                emergencies->errors[emergencies->count++] = err;
+            }
+            continue;
+        }
+        for (i = 0; i < count; i++)
+        {
+            if ((requests[i].slave == err.Slave) && !requests[i].has_error)
+            {
+                requests[i].has_error = 1;
+                requests[i].error = err;
+                break;
+            }
+        }
+    }
+}
+
+/* Read the mailbox status of n slaves in one frame.
+ * ready[i] is set to 1 if the read mailbox of slaves[i] is full. */
+static void soem_mbx_poll(ecx_contextt *context, const uint16 *slaves, int n, uint8 *ready)
+{
+    ecx_portt *port = context->port;
+    uint16 offsets[SOEM_MBX_POLLS_PER_FRAME];
+    uint16 status = 0;
+    uint16 wkc;
+    uint8 idx;
+    int i;
+
+    idx = ecx_getindex(port);
+    ecx_setupdatagram(port, &(port->txbuf[idx]), EC_CMD_FPRD, idx,
+                      context->slavelist[slaves[0]].configadr, ECT_REG_SM1STAT, sizeof(status), &status);
+    offsets[0] = EC_HEADERSIZE;
+    for (i = 1; i < n; i++)
+    {
+        offsets[i] = ecx_adddatagram(port, &(port->txbuf[idx]), EC_CMD_FPRD, idx, (i < n - 1),
+                                     context->slavelist[slaves[i]].configadr, ECT_REG_SM1STAT,
+                                     sizeof(status), &status);
+    }
+    memset(ready, 0, n);
+    if (ecx_srconfirm(port, idx, EC_TIMEOUTRET) != EC_NOFRAME)
+    {
+        for (i = 0; i < n; i++)
+        {
+            memcpy(&wkc, &(port->rxbuf[idx][offsets[i] + sizeof(status)]), sizeof(wkc));
+            memcpy(&status, &(port->rxbuf[idx][offsets[i]]), sizeof(status));
+            ready[i] = (etohs(wkc) > 0) && ((etohs(status) & 0x08) > 0);
+        }
+    }
+    ecx_setbufstat(port, idx, EC_BUF_EMPTY);
+}
+
+int soem_sdo_read_parallel(ecx_contextt *context, soem_sdo_requestt *requests, int count, int timeout,
+                           soem_emergenciest *emergencies)
+{
+    ec_mbxbuft mbx;
+    ec_mbxheadert *mbxh = (ec_mbxheadert *)&mbx;
+    soem_sdo_requestt *pending[SOEM_MBX_POLLS_PER_FRAME];
+    uint16 slaves[SOEM_MBX_POLLS_PER_FRAME];
+    uint8 ready[SOEM_MBX_POLLS_PER_FRAME];
+    soem_sdo_requestt *request;
+    osal_timert timer;
+    int npending = 0;
+    int completed = 0;
+    int successful = 0;
+    int received;
+    int first;
+    int n;
+    int i;
+    int j;
+
+    /* place the upload requests in all mailboxes */
+    for (i = 0; i < count; i++)
+    {
+        request = &requests[i];
+        request->state = SOEM_SDO_DONE;
+        request->completion = -1;
+        request->has_error = 0;
+        /* empty the out mailbox of the slave if something is in */
+        ec_clearmbx(&mbx);
+        ecx_mbxreceive(context, request->slave, &mbx, 0);
+        soem_sdo_upload_request(context, request, &mbx);
+        request->wkc = ecx_mbxsend(context, request->slave, &mbx, EC_TIMEOUTTXM);
+        if (request->wkc > 0)
+        {
+            request->state = SOEM_SDO_PENDING;
+            npending++;
+        }
+        else
+        {
+            request->completion = completed++;
+        }
+        soem_mbx_pop_errors(context, requests, count, emergencies);
+    }
+
+    /* poll the mailboxes of all pending requests until they are answered */
+    osal_timer_start(&timer, timeout);
+    while (npending > 0)
+    {
+        received = 0;
+        first = 0;
+        while (first < count)
+        {
+            n = 0;
+            for (i = first; (i < count) && (n < SOEM_MBX_POLLS_PER_FRAME); i++)
+            {
+                if (requests[i].state == SOEM_SDO_PENDING)
+                {
+                    pending[n] = &requests[i];
+                    slaves[n++] = requests[i].slave;
+                }
+            }
+            first = i;
+            if (n == 0)
+            {
+                break;
+            }
+            soem_mbx_poll(context, slaves, n, ready);
+            for (j = 0; j < n; j++)
+            {
+                if (!ready[j])
+                {
+                    continue;
+                }
+                request = pending[j];
+                ec_clearmbx(&mbx);
+                request->wkc = ecx_mbxreceive(context, request->slave, &mbx, 0);
+                if (request->wkc > 0)
+                {
+                    soem_sdo_upload_response(context, request, &mbx);
+                }
+                else if ((mbxh->length != 0) && ((mbxh->mbxtype & 0x0f) == 0x00))
+                {
+                    /* mailbox error response, already pushed to the error list */
+                    request->state = SOEM_SDO_DONE;
+                }
+                else
+                {
+                    /* an emergency or a lost mailbox, keep waiting for the response */
+                    continue;
+                }
+                received++;
+                npending--;
+                if (request->state == SOEM_SDO_DONE)
+                {
+                    request->completion = completed++;
+                }
+            }
+            soem_mbx_pop_errors(context, requests, count, emergencies);
+        }
+        if (npending == 0)
+        {
+            break;
+        }
+        if (osal_timer_is_expired(&timer))
+        {
+            for (i = 0; i < count; i++)
+            {
+                if (requests[i].state == SOEM_SDO_PENDING)
+                {
+                    requests[i].state = SOEM_SDO_DONE;
+                    requests[i].wkc = EC_TIMEOUT;
+                    requests[i].completion = completed++;
+                }
+            }
+            break;
+        }
+        if (received == 0)
+        {
+            osal_usleep(SOEM_MBX_POLLDELAY);
+        }
+    }
+
+    /* segmented transfers need a dialog with the slave, do them one by one */
+    for (i = 0; i < count; i++)
+    {
+        request = &requests[i];
+        if (request->state == SOEM_SDO_SEGMENTED)
+        {
+            request->wkc = ecx_SDOread(context, request->slave, request->index, request->subindex,
+                                       request->ca, &request->size, request->data, timeout);
+            request->state = SOEM_SDO_DONE;
+            request->completion = completed++;
+            soem_mbx_pop_errors(context, requests, count, emergencies);
+        }
+        if (request->wkc > 0)
+        {
+            successful++;
+        }
+    }
+
+    return successful;
+}
+
+/* Move the errors of the context into errors, as long as there is space. */
+static void soem_mbx_drain_errors(ecx_contextt *context, soem_emergenciest *errors)
+{
+    while ((errors->count < errors->capacity) && ecx_poperror(context, &errors->errors[errors->count]))
+    {
+        errors->count++;
+    }
+}
+
+int soem_mbx_poll_emergencies(ecx_contextt *context, const uint16 *slaves, int count, soem_emergenciest *errors)
+{
+    ec_mbxbuft mbx;
+    uint8 ready[SOEM_MBX_POLLS_PER_FRAME];
+    int received = 0;
+    int first;
+    int n;
+    int i;
+
+    soem_mbx_drain_errors(context, errors);
+    for (first = 0; first < count; first += n)
+    {
+        n = count - first;
+        if (n > SOEM_MBX_POLLS_PER_FRAME)
+        {
+            n = SOEM_MBX_POLLS_PER_FRAME;
+        }
+        soem_mbx_poll(context, &slaves[first], n, ready);
+        for (i = 0; i < n; i++)
+        {
+            if (!ready[i])
+            {
+                continue;
+            }
+            /* an emergency is pushed to the error list by ecx_mbxreceive(), other content is dropped */
+            ec_clearmbx(&mbx);
+            ecx_mbxreceive(context, slaves[first + i], &mbx, 0);
+            received++;
+            soem_mbx_drain_errors(context, errors);
+        }
+    }
+    return received;
+}
+
+/* datasize is the number of bytes read so far, or the number of bytes left to write */
+static int soem_foe_hook(uint16 slave, int packetnumber, int datasize)
+{
+    soem_foe_progresst *progress = soem_foe_current;
+
+    (void)slave;
+    (void)packetnumber;
+    if ((progress != NULL) && osal_timer_is_expired(&progress->timer))
+    {
+        osal_timer_start(&progress->timer, progress->interval_us);
+        progress->callback(progress->user, (progress->size >= 0) ? progress->size - datasize : datasize);
+    }
+    return 0;
+}
+
+static void soem_foe_begin(ecx_contextt *context, soem_foe_progresst *progress, int size)
+{
+    progress->size = size;
+    osal_timer_start(&progress->timer, 0);
+    progress->previous_hook = context->FOEhook;
+    context->FOEhook = soem_foe_hook;
+    soem_foe_current = progress;
+}
+
+static void soem_foe_end(ecx_contextt *context, soem_foe_progresst *progress)
+{
+    context->FOEhook = progress->previous_hook;
+    soem_foe_current = NULL;
+}
+
+int soem_foe_write(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int psize, void *p,
+                   int timeout, soem_foe_progresst *progress)
+{
+    int wkc;
+
+    if (progress == NULL)
+    {
+        return ecx_FOEwrite(context, slave, filename, password, psize, p, timeout);
+    }
+    soem_foe_begin(context, progress, psize);
+    wkc = ecx_FOEwrite(context, slave, filename, password, psize, p, timeout);
+    soem_foe_end(context, progress);
+    if (wkc > 0)
+    {
+        progress->callback(progress->user, psize);
+    }
+    return wkc;
+}
+
+int soem_foe_read(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int *psize, void *p,
+                  int timeout, soem_foe_progresst *progress)
+{
+    int wkc;
+
+    if (progress == NULL)
+    {
+        return ecx_FOEread(context, slave, filename, password, psize, p, timeout);
+    }
+    soem_foe_begin(context, progress, -1);
+    wkc = ecx_FOEread(context, slave, filename, password, psize, p, timeout);
+    soem_foe_end(context, progress);
+    if (wkc > 0)
+    {
+        progress->callback(progress->user, *psize);
+    }
+    return wkc;
+}
@@ -0,0 +1,89 @@
+#ifndef _SOEM_MAILBOX_H
+#define _SOEM_MAILBOX_H
+
+#include "ethercat.h"
+
+/** A CoE SDO upload of soem_sdo_read_parallel(). */
+typedef struct {
+    uint16 slave;
+    uint16 index;
+    uint8 subindex;
+    /** != 0 for complete access */
+    uint8 ca;
+    /** in: size of data, out: bytes read */
+    int size;
+    uint8 *data;
+    /** working counter of the last mailbox transfer, > 0 on success */
+    int wkc;
+    /** position in the order the uploads were finished, starting with 0 */
+    int completion;
+    /** != 0 if error holds the first error of the upload */
+    int has_error;
+    ec_errort error;
+    /** internal state of the upload */
+    int state;
+} soem_sdo_requestt;
+
+/** Emergencies received during soem_sdo_read_parallel(). */
+typedef struct {
+    ec_errort *errors;
+    /** size of errors, further emergencies are dropped */
+    int capacity;
+    int count;
+} soem_emergenciest;
+
+/** Read CoE objects from several slaves concurrently.
+ *
+ * The upload requests are written into the mailboxes of all slaves first, then the
+ * mailbox status of all slaves waiting for a response is polled with one frame for up
+ * to 64 slaves, and responses are read as soon as they are available. Segmented responses
+ * are finished with ecx_SDOread() after all other uploads.
+ *
+ * The error list of the context is emptied while the uploads are running, so it can not
+ * overflow with many slaves. Errors are stored in the request of their slave, emergencies
+ * in emergencies. Each request must address a different slave.
+ *
+ * @param[in,out] requests     the uploads
+ * @param[in]     count        number of requests
+ * @param[in]     timeout      timeout in us for the responses
+ * @param[out]    emergencies  receives the emergencies, may be NULL to drop them
+ * @return number of successful uploads
+ */
+int soem_sdo_read_parallel(ecx_contextt *context, soem_sdo_requestt *requests, int count, int timeout,
+                           soem_emergenciest *emergencies);
+/** Receive the emergencies of several slaves.
+ *
+ * The mailbox status of up to 64 slaves is read with one frame, only the mailboxes
+ * of slaves that have sent something are read. Anything but emergencies is dropped.
+ * The error list of the context, with the received emergencies, is moved into errors
+ * while there is space, errors that do not fit stay in the error list.
+ *
+ * @param[in]  slaves  the slaves to poll, with mailboxes
+ * @param[in]  count   number of slaves
+ * @param[out] errors  receives the errors, count is increased
+ * @return number of mailboxes read
+ */
+int soem_mbx_poll_emergencies(ecx_contextt *context, const uint16 *slaves, int count, soem_emergenciest *errors);
+/** Progress of a FoE transfer, reported through the FOEhook of the context. */
+typedef struct {
+    /** called with the number of bytes transferred so far */
+    void (*callback)(void *user, int transferred);
+    void *user;
+    /** minimum time in us between two calls of callback, the final call is always made */
+    int interval_us;
+    /** internal */
+    int size;
+    osal_timert timer;
+    /** internal, the FOEhook of the context before the transfer, restored after it */
+    int (*previous_hook)(uint16 slave, int packetnumber, int datasize);
+} soem_foe_progresst;
+
+/** ecx_FOEwrite() reporting its progress, progress may be NULL. */
+int soem_foe_write(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int psize, void *p,
+                   int timeout, soem_foe_progresst *progress);
+
+/** ecx_FOEread() reporting its progress, progress may be NULL. */
+int soem_foe_read(ecx_contextt *context, uint16 slave, char *filename, uint32 password, int *psize, void *p,
+                  int timeout, soem_foe_progresst *progress);
+
+#endif /* _SOEM_MAILBOX_H */
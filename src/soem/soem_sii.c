@@ -0,0 +1,459 @@
+#include <stdlib.h>
+#include <string.h>
+
+#include "soem_sii.h"
+
+/* ecx_readeepromFP() returns 0 if a read fails, tell this apart from words that are 0 by the EEPROM status. */
+static int soem_sii_read_failed(ecx_contextt *context, uint16 configadr)
+{
+    uint16 estat = 0;
+
+    if (ecx_FPRD(context->port, configadr, ECT_REG_EEPSTAT, sizeof(estat), &estat, EC_TIMEOUTRET) <= 0)
+    {
+        return 1;
+    }
+    return (etohs(estat) & (EC_ESTAT_BUSY | EC_ESTAT_NACK)) != 0;
+}
+
+/* Read the SII until at least words words are in image, returns the number of words read, -1 if a read fails. */
+static int soem_sii_read_words(ecx_contextt *context, uint16 slave, uint8 *image, int read, int words,
+                               int size_words, int timeout)
+{
+    uint16 configadr = context->slavelist[slave].configadr;
+    int step = context->slavelist[slave].eep_8byte ? 4 : 2;
+    uint64 data;
+    int n;
+
+    if (words > size_words)
+    {
+        words = size_words;
+    }
+    while (read < words)
+    {
+        data = ecx_readeepromFP(context, configadr, (uint16)read, timeout);
+        if ((data == 0) && soem_sii_read_failed(context, configadr))
+        {
+            return -1;
+        }
+        n = (size_words - read < step) ? size_words - read : step;
+        memcpy(&image[2 * read], &data, 2 * n);
+        read += n;
+    }
+    return read;
+}
+
+int soem_sii_read_image(ecx_contextt *context, uint16 slave, uint8 *image, int size, int timeout)
+{
+    int size_words = size / 2;
+    int address = SOEM_SII_FIRST_CATEGORY;
+    int read;
+    uint16 type;
+    uint16 length;
+
+    ecx_eeprom2master(context, slave);
+    read = soem_sii_read_words(context, slave, image, 0, address + 2, size_words, timeout);
+    while ((read >= 0) && (address + 2 <= read))
+    {
+        type = (uint16)(image[2 * address] | (image[2 * address + 1] << 8));
+        if ((type == SOEM_SII_END) || (type == SOEM_SII_INVALID))
+        {
+            /* keep the end marker, or the invalid type for the caller to detect */
+            return 2 * (address + 1);
+        }
+        length = (uint16)(image[2 * address + 2] | (image[2 * address + 3] << 8));
+        address += 2 + length;
+        /* the category and the header of the next one */
+        read = soem_sii_read_words(context, slave, image, read, address + 2, size_words, timeout);
+    }
+    return (read < 0) ? -1 : 2 * read;
+}
+
+/* Compare the EEPROM with image and set differs[i] for the words that are not equal. */
+static void soem_sii_compare(ecx_contextt *context, uint16 slave, const uint8 *image, int words,
+                             const uint8 *selected, uint8 *differs, int timeout)
+{
+    uint16 configadr = context->slavelist[slave].configadr;
+    int step = context->slavelist[slave].eep_8byte ? 4 : 2;
+    uint64 data;
+    uint8 *bytes = (uint8 *)&data;
+    int address;
+    int i;
+    int n;
+
+    for (address = 0; address < words; address += step)
+    {
+        n = (words - address < step) ? words - address : step;
+        if (selected != NULL)
+        {
+            /* skip reads without a selected word */
+            for (i = 0; (i < n) && !selected[address + i]; i++)
+            {
+                differs[address + i] = 0;
+            }
+            if (i == n)
+            {
+                continue;
+            }
+        }
+        data = ecx_readeepromFP(context, configadr, (uint16)address, timeout);
+        for (i = 0; i < n; i++)
+        {
+            differs[address + i] = (bytes[2 * i] != image[2 * (address + i)]) ||
+                                   (bytes[2 * i + 1] != image[2 * (address + i) + 1]);
+        }
+    }
+}
+
+int soem_sii_write_image(ecx_contextt *context, uint16 slave, const uint8 *image, int words, uint8 *changed,
+                         int verify, int timeout, int *failed_word)
+{
+    uint16 configadr = context->slavelist[slave].configadr;
+    uint8 *differs;
+    uint16 value;
+    int written = 0;
+    int result;
+    int address;
+
+    differs = (uint8 *)malloc(words > 0 ? words : 1);
+    if (differs == NULL)
+    {
+        return -3;
+    }
+    ecx_eeprom2master(context, slave);
+    soem_sii_compare(context, slave, image, words, NULL, changed, timeout);
+    result = 0;
+    for (address = 0; address < words; address++)
+    {
+        if (!changed[address])
+        {
+            continue;
+        }
+        /* ecx_writeeepromFP() writes the word as it is in memory */
+        memcpy(&value, &image[2 * address], sizeof(value));
+        if (ecx_writeeepromFP(context, configadr, (uint16)address, value, timeout) <= 0)
+        {
+            *failed_word = address;
+            result = -1;
+            break;
+        }
+        written++;
+    }
+    /* the SII cache of SOEM may hold the old content */
+    if (context->esislave == slave)
+    {
+        context->esislave = 0;
+    }
+    if ((result == 0) && verify)
+    {
+        soem_sii_compare(context, slave, image, words, changed, differs, timeout);
+        for (address = 0; address < words; address++)
+        {
+            if (differs[address])
+            {
+                *failed_word = address;
+                result = -2;
+                break;
+            }
+        }
+    }
+    free(differs);
+    return (result < 0) ? result : written;
+}
+
+/** maximum number of slaves addressed by one frame of soem_sii_read_parallel() */
+#define SOEM_SII_READS_PER_FRAME 48
+/** delay in us between two polls of EEPROMs that are all busy */
+#define SOEM_SII_POLL_DELAY 100
+
+enum {
+    SOEM_SII_READ_COMMAND,
+    SOEM_SII_READ_WAIT,
+    SOEM_SII_READ_CLEAR,
+    SOEM_SII_READ_DONE
+};
+
+/* Check whether read needs more words, finishes it otherwise. */
+static int soem_sii_read_needs_words(soem_sii_readt *read)
+{
+    int words = read->length / 2;
+    uint16 type;
+    uint16 length;
+
+    if (read->words > 0)
+    {
+        if (words < read->words)
+        {
+            return 1;
+        }
+        read->length = 2 * read->words;
+        read->complete = 1;
+        return 0;
+    }
+    while (read->address + 2 <= words)
+    {
+        type = (uint16)(read->image[2 * read->address] | (read->image[2 * read->address + 1] << 8));
+        if (type == SOEM_SII_END)
+        {
+            /* keep the end marker */
+            read->length = 2 * (read->address + 1);
+            read->complete = 1;
+            return 0;
+        }
+        length = (uint16)(read->image[2 * read->address + 2] | (read->image[2 * read->address + 3] << 8));
+        read->address += 2 + length;
+    }
+    return 1;
+}
+
+/* Append n words to the image of read, returns 0 if the image can not grow. */
+static int soem_sii_read_store(soem_sii_readt *read, const uint8 *data, int n)
+{
+    int needed = read->length + 2 * n;
+    int size = (read->size > 0) ? read->size : 2 * SOEM_SII_FIRST_CATEGORY;
+    uint8 *image;
+
+    if (needed > SOEM_SII_MAX_SIZE)
+    {
+        needed = SOEM_SII_MAX_SIZE;
+    }
+    if (needed <= read->length)
+    {
+        return 0;
+    }
+    if (needed > read->size)
+    {
+        while (size < needed)
+        {
+            size *= 2;
+        }
+        image = (uint8 *)realloc(read->image, size);
+        if (image == NULL)
+        {
+            return 0;
+        }
+        read->image = image;
+        read->size = size;
+    }
+    memcpy(&read->image[read->length], data, needed - read->length);
+    read->length = needed;
+    return needed < SOEM_SII_MAX_SIZE;
+}
+
+/* Write the pending commands of n reads with one frame. */
+static void soem_sii_read_commands(ecx_contextt *context, soem_sii_readt **reads, int n, int timeout)
+{
+    ecx_portt *port = context->port;
+    uint16 offsets[SOEM_SII_READS_PER_FRAME];
+    uint16 lengths[SOEM_SII_READS_PER_FRAME];
+    uint16 command[3];
+    uint16 wkc;
+    uint8 idx;
+    int i;
+
+    idx = ecx_getindex(port);
+    for (i = 0; i < n; i++)
+    {
+        command[0] = htoes((reads[i]->state == SOEM_SII_READ_CLEAR) ? EC_ECMD_NOP : EC_ECMD_READ);
+        command[1] = htoes((uint16)(reads[i]->length / 2));
+        command[2] = 0;
+        /* a NOP only clears the error bits */
+        lengths[i] = (reads[i]->state == SOEM_SII_READ_CLEAR) ? sizeof(command[0]) : sizeof(command);
+        if (i == 0)
+        {
+            ecx_setupdatagram(port, &(port->txbuf[idx]), EC_CMD_FPWR, idx,
+                              context->slavelist[reads[i]->slave].configadr, ECT_REG_EEPCTL, lengths[i], command);
+            offsets[i] = EC_HEADERSIZE;
+        }
+        else
+        {
+            offsets[i] = ecx_adddatagram(port, &(port->txbuf[idx]), EC_CMD_FPWR, idx, (i < n - 1),
+                                         context->slavelist[reads[i]->slave].configadr, ECT_REG_EEPCTL,
+                                         lengths[i], command);
+        }
+    }
+    if (ecx_srconfirm(port, idx, EC_TIMEOUTRET) == EC_NOFRAME)
+    {
+        memset(offsets, 0, sizeof(offsets));
+    }
+    for (i = 0; i < n; i++)
+    {
+        wkc = 0;
+        if (offsets[i] > 0)
+        {
+            memcpy(&wkc, &(port->rxbuf[idx][offsets[i] + lengths[i]]), sizeof(wkc));
+        }
+        if (etohs(wkc) > 0)
+        {
+            if (reads[i]->state == SOEM_SII_READ_CLEAR)
+            {
+                reads[i]->state = SOEM_SII_READ_COMMAND;
+            }
+            else
+            {
+                reads[i]->state = SOEM_SII_READ_WAIT;
+                osal_timer_start(&reads[i]->timer, timeout);
+            }
+        }
+        else if (++reads[i]->retries > EC_DEFAULTRETRIES)
+        {
+            reads[i]->state = SOEM_SII_READ_DONE;
+        }
+    }
+    ecx_setbufstat(port, idx, EC_BUF_EMPTY);
+}
+
+/* Read the EEPROM status, address and data of n reads with one frame, returns the number of reads that
+ * are not busy anymore. */
+static int soem_sii_read_results(ecx_contextt *context, soem_sii_readt **reads, int n)
+{
+    ecx_portt *port = context->port;
+    uint16 offsets[SOEM_SII_READS_PER_FRAME];
+    /* status, address and data registers */
+    uint8 registers[14];
+    uint8 *result;
+    uint16 estat;
+    uint32 address;
+    uint16 wkc;
+    uint8 idx;
+    int finished = 0;
+    int i;
+
+    memset(registers, 0, sizeof(registers));
+    idx = ecx_getindex(port);
+    ecx_setupdatagram(port, &(port->txbuf[idx]), EC_CMD_FPRD, idx,
+                      context->slavelist[reads[0]->slave].configadr, ECT_REG_EEPSTAT, sizeof(registers), registers);
+    offsets[0] = EC_HEADERSIZE;
+    for (i = 1; i < n; i++)
+    {
+        offsets[i] = ecx_adddatagram(port, &(port->txbuf[idx]), EC_CMD_FPRD, idx, (i < n - 1),
+                                     context->slavelist[reads[i]->slave].configadr, ECT_REG_EEPSTAT,
+                                     sizeof(registers), registers);
+    }
+    if (ecx_srconfirm(port, idx, EC_TIMEOUTRET) == EC_NOFRAME)
+    {
+        memset(offsets, 0, sizeof(offsets));
+    }
+    for (i = 0; i < n; i++)
+    {
+        wkc = 0;
+        if (offsets[i] > 0)
+        {
+            memcpy(&wkc, &(port->rxbuf[idx][offsets[i] + sizeof(registers)]), sizeof(wkc));
+        }
+        if (etohs(wkc) == 0)
+        {
+            if (++reads[i]->retries > EC_DEFAULTRETRIES)
+            {
+                reads[i]->state = SOEM_SII_READ_DONE;
+            }
+            continue;
+        }
+        result = &(port->rxbuf[idx][offsets[i]]);
+        memcpy(&estat, result, sizeof(estat));
+        memcpy(&address, result + 2, sizeof(address));
+        estat = etohs(estat);
+        if (estat & EC_ESTAT_BUSY)
+        {
+            if (osal_timer_is_expired(&reads[i]->timer))
+            {
+                reads[i]->state = SOEM_SII_READ_DONE;
+            }
+            continue;
+        }
+        finished++;
+        if (estat & EC_ESTAT_NACK)
+        {
+            /* the EEPROM did not acknowledge, clear the error and read again */
+            reads[i]->state = (++reads[i]->retries > EC_DEFAULTRETRIES) ? SOEM_SII_READ_DONE : SOEM_SII_READ_CLEAR;
+        }
+        else if ((etohl(address) & 0xffff) != (uint32)(reads[i]->length / 2))
+        {
+            /* the command was not taken, the EEPROM was busy */
+            reads[i]->state = (++reads[i]->retries > EC_DEFAULTRETRIES) ? SOEM_SII_READ_DONE : SOEM_SII_READ_COMMAND;
+        }
+        else
+        {
+            reads[i]->retries = 0;
+            if (!soem_sii_read_store(reads[i], result + 6, (estat & EC_ESTAT_R64) ? 4 : 2))
+            {
+                /* the image is full, it is complete only if it ends there */
+                soem_sii_read_needs_words(reads[i]);
+                reads[i]->state = SOEM_SII_READ_DONE;
+            }
+            else
+            {
+                reads[i]->state = soem_sii_read_needs_words(reads[i]) ? SOEM_SII_READ_COMMAND : SOEM_SII_READ_DONE;
+            }
+        }
+    }
+    ecx_setbufstat(port, idx, EC_BUF_EMPTY);
+    return finished;
+}
+
+int soem_sii_read_parallel(ecx_contextt *context, soem_sii_readt *reads, int count, int timeout)
+{
+    soem_sii_readt *pending[SOEM_SII_READS_PER_FRAME];
+    int npending;
+    int active;
+    int polled;
+    int finished;
+    int complete = 0;
+    int state;
+    int i;
+
+    for (i = 0; i < count; i++)
+    {
+        ecx_eeprom2master(context, reads[i].slave);
+        reads[i].length &= ~1;
+        reads[i].complete = 0;
+        reads[i].address = SOEM_SII_FIRST_CATEGORY;
+        reads[i].retries = 0;
+        reads[i].state = soem_sii_read_needs_words(&reads[i]) ? SOEM_SII_READ_COMMAND : SOEM_SII_READ_DONE;
+    }
+    do
+    {
+        polled = 0;
+        finished = 0;
+        /* write the commands, then poll the slaves waiting for their EEPROM */
+        for (state = SOEM_SII_READ_COMMAND; state <= SOEM_SII_READ_WAIT; state++)
+        {
+            npending = 0;
+            for (i = 0; i < count; i++)
+            {
+                if ((reads[i].state == state) ||
+                    ((state == SOEM_SII_READ_COMMAND) && (reads[i].state == SOEM_SII_READ_CLEAR)))
+                {
+                    pending[npending++] = &reads[i];
+                }
+                if ((npending == SOEM_SII_READS_PER_FRAME) || ((npending > 0) && (i == count - 1)))
+                {
+                    if (state == SOEM_SII_READ_COMMAND)
+                    {
+                        soem_sii_read_commands(context, pending, npending, timeout);
+                    }
+                    else
+                    {
+                        finished += soem_sii_read_results(context, pending, npending);
+                        polled += npending;
+                    }
+                    npending = 0;
+                }
+            }
+        }
+        if ((polled > 0) && (finished == 0))
+        {
+            osal_usleep(SOEM_SII_POLL_DELAY);
+        }
+        active = 0;
+        for (i = 0; i < count; i++)
+        {
+            active += (reads[i].state != SOEM_SII_READ_DONE);
+        }
+    }
+    while (active > 0);
+    for (i = 0; i < count; i++)
+    {
+        complete += reads[i].complete;
+    }
+    return complete;
+}
@@ -0,0 +1,77 @@
+#ifndef _SOEM_SII_H
+#define _SOEM_SII_H
+
+#include "ethercat.h"
+
+/** Maximum size in bytes of an SII. */
+#define SOEM_SII_MAX_SIZE 0x20000
+/** Word address of the first category of the SII. */
+#define SOEM_SII_FIRST_CATEGORY 0x0040
+/** Category type that ends the category list of the SII. */
+#define SOEM_SII_END 0xffff
+/** Category type of an empty or unreadable category list, reading stops there. */
+#define SOEM_SII_INVALID 0x0000
+
+/** Read the SII of a slave, up to the end of its category list, or a category of type SOEM_SII_INVALID.
+ *
+ * The EEPROM is read with 8 bytes per access if the ESC supports it, otherwise
+ * with 4 bytes. The EEPROM is handed to the master before, if it is assigned to the PDI.
+ *
+ * @param[in]  slave    the slave
+ * @param[out] image    receives the SII
+ * @param[in]  size     size of image in bytes, reading stops when it is full
+ * @param[in]  timeout  timeout in us of an EEPROM access
+ * @return number of bytes read into image, -1 if an EEPROM read failed
+ */
+int soem_sii_read_image(ecx_contextt *context, uint16 slave, uint8 *image, int size, int timeout);
+/** Write an SII image to the EEPROM of a slave, only the words that differ.
+ *
+ * The EEPROM is read first, then the words that differ from image are written one by one.
+ * With verify, the written words are read back and compared afterwards.
+ *
+ * @param[in]  slave        the slave
+ * @param[in]  image        the new content, starting at word address 0
+ * @param[in]  words        number of words in image
+ * @param[out] changed      changed[i] is set to 1 for the words written, 0 for the others
+ * @param[in]  verify       != 0 to read back the written words
+ * @param[in]  timeout      timeout in us of an EEPROM access
+ * @param[out] failed_word  receives the address of the word that could not be written or verified
+ * @return number of words written, -1 if a write failed, -2 if the verification failed,
+ *         -3 if memory could not be allocated
+ */
+int soem_sii_write_image(ecx_contextt *context, uint16 slave, const uint8 *image, int words, uint8 *changed,
+                         int verify, int timeout, int *failed_word);
+/** An SII read of soem_sii_read_parallel(). */
+typedef struct {
+    uint16 slave;
+    /** the SII, grown with realloc() while reading, to be released with free() */
+    uint8 *image;
+    /** allocated size of image in bytes */
+    int size;
+    /** in: bytes already in image, reading continues behind them, out: bytes read */
+    int length;
+    /** words to read, 0 to read up to the end of the category list */
+    int words;
+    /** != 0 if all words were read */
+    int complete;
+    /** internal state of the read */
+    int state;
+    int address;
+    int retries;
+    osal_timert timer;
+} soem_sii_readt;
+
+/** Read the SIIs of several slaves concurrently.
+ *
+ * The read commands for all slaves are written to their ESCs with one frame for up to 48 slaves,
+ * then the EEPROM status and data of all slaves still busy are read with one frame, until every
+ * SII is read. The EEPROMs of all slaves are working at the same time, instead of one after the other.
+ *
+ * @param[in,out] reads    the reads, a read stops at SOEM_SII_MAX_SIZE or if an access fails
+ * @param[in]     count    number of reads
+ * @param[in]     timeout  timeout in us of an EEPROM access
+ * @return number of complete reads
+ */
+int soem_sii_read_parallel(ecx_contextt *context, soem_sii_readt *reads, int count, int timeout);
+
+#endif /* _SOEM_SII_H */
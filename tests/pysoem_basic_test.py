@@ -1,4 +1,6 @@
 import dataclasses
+import json
+import struct
 
 import pytest
 
@@ -111,6 +113,116 @@ def test_call_config_init_twice(pysoem_env):
     assert len(pysoem_env.get_master().slaves) == len(pysoem_env._expected_slave_layout)
 
 
+def test_config_init_sizes_slave_list(ifname):
+    with pysoem.open(ifname) as master:
+        assert master.max_slaves == 0
+        assert master.config_init() > 0
+        assert master.max_slaves == len(master.slaves)
+        io_map_size = master.config_map()
+        assert io_map_size > 0
+        assert len(master.io_map) == io_map_size
+
+    master = pysoem.Master(max_slaves=2)
+    master.open(ifname)
+    try:
+        assert master.config_init() <= 0
+        assert master.max_slaves == 2
+        assert master.slaves == []
+    finally:
+        master.close()
+
+
+def test_config_init_parallel_sii(ifname):
+    def slave_config(slave):
+        return slave.name, slave.man, slave.id, slave.rev, len(slave.input), len(slave.output)
+
+    with pysoem.open(ifname) as master:
+        assert master.config_init() > 0
+        assert list(master.config_init_timing) == ['count', 'config_init', 'slaves']
+        io_map_size = master.config_map()
+        expected = [slave_config(slave) for slave in master.slaves]
+
+        assert master.config_init(parallel_sii=True) == len(expected)
+        assert list(master.config_init_timing) == ['count', 'detect', 'sii', 'configure', 'slaves']
+        assert master.config_map() == io_map_size
+        assert [slave_config(slave) for slave in master.slaves] == expected
+
+
+def test_config_init_parallel_sii_with_usetable():
+    master = pysoem.Master()
+    with pytest.raises(ValueError):
+        master.config_init(True, parallel_sii=True)
+
+
+def test_config_init_sii_cache(ifname, tmp_path, monkeypatch):
+    monkeypatch.setattr(pysoem.settings, 'sii_cache_dir', str(tmp_path))
+    pysoem.clear_sii_cache()
+    with pysoem.open(ifname) as master:
+        assert master.config_init(parallel_sii=True) > 0
+        expected = [(slave.name, slave.man, slave.id, slave.rev) for slave in master.slaves]
+        assert len(list(tmp_path.iterdir())) == len(set(identity[1:] for identity in expected))
+
+        # served from the cache in memory and on disk
+        for _ in range(2):
+            assert master.config_init(parallel_sii=True) == len(expected)
+            assert [(slave.name, slave.man, slave.id, slave.rev) for slave in master.slaves] == expected
+            pysoem.clear_sii_cache()
+
+
+def test_save_and_restore_config(ifname, tmp_path):
+    def slave_config(slave):
+        return slave.name, slave.man, slave.id, slave.rev, len(slave.input), len(slave.output)
+
+    path = tmp_path / 'network.json'
+    with pysoem.open(ifname) as master:
+        assert not master.restore_config(str(path))
+        assert master.config_init() > 0
+        master.config_dc()
+        io_map_size = master.config_map()
+        expected = [slave_config(slave) for slave in master.slaves]
+        master.save_config(str(path))
+
+    with pysoem.open(ifname) as master:
+        assert master.restore_config(str(path))
+        assert len(master.io_map) == io_map_size
+        assert [slave_config(slave) for slave in master.slaves] == expected
+        assert master.state_check(pysoem.SAFEOP_STATE, 50000) == pysoem.SAFEOP_STATE
+
+        # a different device is detected
+        saved = path.read_text()
+        config = json.loads(saved)
+        config['slaves'][1]['record'] = config['slaves'][2]['record']
+        path.write_text(json.dumps(config))
+        assert not master.restore_config(str(path))
+
+        # other versions and invalid content are rejected
+        changes = [
+            lambda config: config.update(pysoem_version='0.0.0'),
+            lambda config: config.update(soem_version='0.0.0'),
+            lambda config: config['slaves'][1].update(record=config['slaves'][1]['record'][:-2]),
+            lambda config: config['groups'][0].update(record=config['groups'][0]['record'] + '00'),
+            lambda config: config['slaves'][1].update(inputs=config['io_map_size'] + 1),
+            lambda config: config['groups'].append(config['groups'][0]),
+            lambda config: config.update(mapped_groups=list(range(9))),
+            lambda config: config.update(mapped_groups=[8]),
+        ]
+        for change in changes:
+            config = json.loads(saved)
+            change(config)
+            path.write_text(json.dumps(config))
+            assert not master.restore_config(str(path))
+        path.write_text('{')
+        assert not master.restore_config(str(path))
+        path.write_text(saved)
+        assert master.restore_config(str(path))
+
+
+def test_save_config_without_map(tmp_path):
+    master = pysoem.Master()
+    with pytest.raises(RuntimeError):
+        master.save_config(str(tmp_path / 'network.json'))
+
+
 def test_closed_interface_master(ifname):
     """Quick check if the open() function context manager works as expected."""
     with pysoem.open(ifname) as master:
@@ -179,3 +291,129 @@ def test_release_gil(revert_global_settings):
     new_master = pysoem.Master()
     assert new_master.always_release_gil == 1
     assert master.always_release_gil == 0
+
+
+def test_cycle_stats_without_exchange():
+    master = pysoem.Master()
+    stats = master.cycle_stats()
+    assert stats.cycles == 0
+    assert stats.wkc_mismatches == 0
+    assert stats.overruns == 0
+    for timing in [stats.wakeup_latency, stats.roundtrip]:
+        assert timing.count == 0
+        assert timing.mean_ns == 0
+        assert len(timing.histogram) == 32
+        assert sum(timing.histogram) == 0
+    master.reset_cycle_stats()
+    assert master.cycle_stats() == stats
+
+
+def test_cyclic_groups_without_exchange():
+    master = pysoem.Master()
+    assert master.cyclic_group_wkc(1) == -1
+    assert master.cyclic_group_count(1) == 0
+    with pytest.raises(ValueError):
+        master.cyclic_group_wkc(8)
+
+
+def test_input_snapshot_without_exchange():
+    master = pysoem.Master()
+    assert master.read_input_snapshot() is None
+    assert master.read_input_snapshot(bytearray(16)) is None
+
+
+@pytest.mark.parametrize('max_slaves', [None, 0, 3, 5000])
+def test_master_sizes(max_slaves):
+    master = pysoem.Master(max_slaves=max_slaves)
+    assert master.max_slaves == (0 if max_slaves is None else max_slaves)
+    assert len(master.io_map) == 0
+    assert master.io_map_layout() == []
+    master.close()
+
+
+def test_large_io_map(ifname, tmp_path):
+    """Move the process data behind the first 8 KiB of the IO map, and back by mapping again."""
+    def shifted(offset):
+        return None if offset is None else offset + 8192
+
+    path = tmp_path / 'network.json'
+    with pysoem.open(ifname) as master:
+        assert master.config_init() > 0
+        io_map_size = master.config_map()
+        layout = master.io_map_layout()
+        master.save_config(str(path))
+
+        config = json.loads(path.read_text())
+        config['io_map_size'] += 8192
+        for entry in config['slaves'] + config['groups']:
+            entry['outputs'] = shifted(entry['outputs'])
+            entry['inputs'] = shifted(entry['inputs'])
+        path.write_text(json.dumps(config))
+
+        assert master.restore_config(str(path))
+        assert len(master.io_map) == io_map_size + 8192
+        assert master.io_map_layout() == [entry._replace(output_offset=shifted(entry.output_offset),
+                                                         input_offset=shifted(entry.input_offset))
+                                          for entry in layout]
+        for slave, entry in zip(master.slaves, master.io_map_layout()):
+            if entry.output_bytes > 0:
+                slave.output[0] = 0x5a
+                assert master.io_map[entry.output_offset] == 0x5a
+                slave.output[0] = 0
+
+        # mapped into the large IO map and moved into one of the mapped size
+        assert master.config_init() > 0
+        assert master.config_map() == io_map_size
+        assert len(master.io_map) == io_map_size
+        assert master.io_map_layout() == layout
+
+
+def test_master_invalid_size():
+    with pytest.raises(ValueError):
+        pysoem.Master(max_slaves=-1)
+    with pytest.raises(TypeError):
+        pysoem.Master(max_slave=3)
+
+
+def _sii_category(category_type, content):
+    content += bytes(len(content) % 2)
+    return struct.pack('<HH', category_type, len(content) // 2) + content
+
+
+def test_parse_sii_image():
+    header = bytearray(128)
+    struct.pack_into('<4I', header, 0x10, 0x2, 0x04eb3052, 0x00120000, 1234)
+    struct.pack_into('<9H', header, 0x28, 0x1000, 0x80, 0x1080, 0x80, 0x1000, 0x80, 0x1080, 0x80, 0x0c)
+    strings = b'\x03' + b'\x05EL125' + b'\x06Inputs' + b'\x07Channel'
+    general = bytes([0, 0, 1, 1, 0, 0x23, 0, 0, 0, 0, 0, 0]) + struct.pack('<hBBH', -90, 0, 0, 0x0011)
+    sync_managers = struct.pack('<HHBBBB', 0x1000, 0x80, 0x26, 0, 1, 1) + struct.pack('<HHBBBB', 0x1100, 2, 0x20, 0, 1, 4)
+    tx_pdo = struct.pack('<HBBBBH', 0x1a00, 2, 3, 0, 2, 0) + \
+        struct.pack('<HBBBBH', 0x6000, 1, 3, 1, 1, 0) + struct.pack('<HBBBBH', 0, 0, 0, 0, 7, 0)
+    image = bytes(header) + _sii_category(10, strings) + _sii_category(30, general) + \
+        _sii_category(40, bytes([1, 2, 3, 0])) + _sii_category(41, sync_managers) + _sii_category(50, tx_pdo) + \
+        _sii_category(0x0800, b'\x01\x02') + b'\xff\xff'
+
+    sii = pysoem.parse_sii_image(image)
+    assert sii.data == image
+    assert (sii.vendor_id, sii.product_code, sii.revision, sii.serial_number) == (0x2, 0x04eb3052, 0x00120000, 1234)
+    assert sii.boot_rx_mailbox == (0x1000, 0x80)
+    assert sii.std_tx_mailbox == (0x1080, 0x80)
+    assert sii.mailbox_protocols == 0x0c
+    assert sii.strings == ['EL125', 'Inputs', 'Channel']
+    assert sii.general.order == 'EL125'
+    assert sii.general.group is None
+    assert sii.general.coe_details == 0x23
+    assert sii.general.current_on_ebus == -90
+    assert sii.general.physical_ports == 0x0011
+    assert sii.fmmus == [1, 2, 3, 0]
+    assert sii.sync_managers[1] == pysoem.SiiSyncManager(0x1100, 2, 0x20, 1, 4)
+    assert sii.tx_pdos == [pysoem.SiiPdo(0x1a00, 3, 0, 'Inputs', 0, [pysoem.SiiPdoEntry(0x6000, 1, 'Channel', 1, 1, 0),
+                                                                     pysoem.SiiPdoEntry(0, 0, None, 0, 7, 0)])]
+    assert sii.rx_pdos == []
+    assert [category_type for category_type, _ in sii.categories] == [10, 30, 40, 41, 50, 0x0800]
+    assert sii.categories[-1][1] == b'\x01\x02'
+
+    with pytest.raises(ValueError):
+        pysoem.parse_sii_image(image[:100])
+    with pytest.raises(pysoem.EepromError):
+        pysoem.parse_sii_image(bytes(header) + _sii_category(10, strings) + bytes(64))
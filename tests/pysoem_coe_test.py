@@ -1,5 +1,6 @@
 
 import struct
+import time
 import pytest
 import pysoem
 
@@ -77,6 +78,106 @@ def test_compare_eeprom_against_coe_0x1018(el1259):
     assert sdo_sn == eeprom_sn
 
 
+def test_eeprom_read_image(el1259):
+    sii = el1259.eeprom_read_image()
+    assert (sii.vendor_id, sii.product_code, sii.revision) == (el1259.man, el1259.id, el1259.rev)
+    assert sii.serial_number == struct.unpack('I', el1259.sdo_read(0x1018, 4))[0]
+    for word_address in [0x00, 0x14, 0x40, len(sii.data) // 2 - 2]:
+        assert sii.data[2 * word_address:2 * word_address + 4] == el1259.eeprom_read(word_address)
+    assert sii.data[-2:] == b'\xff\xff'
+    assert sii.strings[0] == el1259.name
+    assert sii.sync_managers
+    assert [entry.index for pdo in sii.tx_pdos for entry in pdo.entries if entry.index != 0]
+
+
+def test_eeprom_write_image(el1259):
+    sii = el1259.eeprom_read_image()
+    assert el1259.eeprom_write_image(sii) == []
+    assert el1259.eeprom_write_image(sii.data, update_checksum=True) == []
+    with pytest.raises(ValueError):
+        el1259.eeprom_write_image(sii.data[:-1])
+
+    # change the low word of the serial number, and restore it
+    serial_number_word = 0x000E
+    changed = bytearray(sii.data)
+    changed[2 * serial_number_word] ^= 0x01
+    try:
+        assert el1259.eeprom_write_image(changed) == [(serial_number_word, 1)]
+        assert el1259.eeprom_read(serial_number_word)[:2] == changed[2 * serial_number_word:2 * serial_number_word + 2]
+    finally:
+        assert el1259.eeprom_write_image(sii) == [(serial_number_word, 1)]
+    assert el1259.eeprom_read_image().data == sii.data
+
+
+def test_sdo_read_many(el1259):
+    results = el1259.sdo_read_many([(0x1018, 1), (0x1018, 2), (0x1111, 0, 1), (0x1008, 0, 3), (0x1018, 3, 4)])
+    assert [(result.index, result.subindex) for result in results] == [(0x1018, 1), (0x1018, 2), (0x1111, 0),
+                                                                       (0x1008, 0), (0x1018, 3)]
+    assert struct.unpack('I', results[0].data)[0] == el1259.man
+    assert struct.unpack('I', results[1].data)[0] == el1259.id
+    assert struct.unpack('I', results[4].data)[0] == el1259.rev
+    for result in [results[0], results[1], results[4]]:
+        assert result.wkc > 0
+        assert result.abort_code == 0
+        assert result.error is None
+
+    assert results[2].data is None
+    assert results[2].abort_code == 0x06020000
+    assert isinstance(results[2].error, pysoem.SdoError)
+    assert results[3].data is None
+    assert isinstance(results[3].error, pysoem.PacketError)
+
+    assert el1259.sdo_read_many([]) == []
+
+
+def test_sdo_write_many(el1259):
+    results = el1259.sdo_write_many([(0x1111, 0, bytes(4)), (0x1008, 0, b'test')])
+    assert [result.abort_code for result in results] == [0x06020000, 0x08000021]
+    assert all(isinstance(result.error, pysoem.SdoError) for result in results)
+    assert all(result.data is None for result in results)
+
+
+def test_sdo_read_all(pysoem_env):
+    pysoem_env.config_init()
+    master = pysoem_env.get_master()
+    coe_slaves = [i for i, slave in enumerate(master.slaves) if slave.sdo_read_many([(0x1018, 1)])[0].error is None]
+
+    results = master.sdo_read_all(0x1018, 1)
+    assert sorted(results) == coe_slaves
+    for pos, result in results.items():
+        assert result.error is None
+        assert struct.unpack('I', result.data)[0] == master.slaves[pos].man
+
+    results = master.sdo_read_all(0x1111, 0, slaves=coe_slaves[:2])
+    assert sorted(results) == coe_slaves[:2]
+    assert all(result.abort_code == 0x06020000 for result in results.values())
+    assert all(isinstance(result.error, pysoem.SdoError) for result in results.values())
+
+    with pytest.raises(ValueError):
+        master.sdo_read_all(0x1018, 1, slaves=[coe_slaves[0], coe_slaves[0]])
+
+
+def test_sdo_read_typed(el1259):
+    assert el1259.sdo_read_typed(0x1018, 1, pysoem.ECT_UNSIGNED32) == el1259.man
+    assert el1259.sdo_read_typed(0x1008, 0, pysoem.ECT_VISIBLE_STRING) == el1259.name
+    # data types from the object dictionary
+    assert el1259.sdo_read_typed(0x1018, 2) == el1259.id
+    assert el1259.sdo_read_typed(0x1008, 0) == el1259.name
+    with pytest.raises(ValueError):
+        el1259.sdo_read_typed(0x1018, 1, pysoem.ECT_INTEGER16)
+
+    results = el1259.sdo_read_many([(0x1018, 1, 0, pysoem.ECT_UNSIGNED32), (0x1018, 3, 0, pysoem.ECT_UNSIGNED32)])
+    assert [result.data for result in results] == [el1259.man, el1259.rev]
+
+
+def test_sdo_write_typed(el1259):
+    with pytest.raises(pysoem.SdoError) as excinfo:
+        el1259.sdo_write_typed(0x1008, 0, 'test', pysoem.ECT_VISIBLE_STRING)
+    assert excinfo.value.abort_code == 0x08000021
+    with pytest.raises(OverflowError):
+        el1259.sdo_write_typed(0x1018, 1, -1, pysoem.ECT_UNSIGNED32)
+
+
 def test_device_name(el1259):
     name_size = len(el1259.name)
 
@@ -160,6 +261,56 @@ def test_sdo_info_rec(el1259):
     assert entry_vendor_id.obj_access == 0x0007
 
 
+def test_sdo_info_cache(el1259, tmp_path, monkeypatch):
+    monkeypatch.setattr(pysoem.settings, 'od_cache_dir', str(tmp_path))
+    pysoem.clear_od_cache()
+    od = el1259.od
+    for obj in od:
+        obj.entries
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # served from the cache in memory and on disk, without SDO info requests and without storing it again
+    requests = []
+    stores = []
+    monkeypatch.setattr(pysoem.pysoem.logger, 'debug',
+                        lambda msg, *args: requests.append(msg) if msg.startswith('ecx_read') else None)
+    monkeypatch.setattr(pysoem.pysoem.json, 'dump', lambda obj, f: stores.append(obj))
+    for cached_od in [el1259.od, (pysoem.clear_od_cache(), el1259.od)[1]]:
+        obj_0x1018 = get_obj_from_od(cached_od, 0x1018)
+        assert obj_0x1018.name == b'Identity'
+        assert obj_0x1018.entries[1].name == b'Vendor ID'
+        assert obj_0x1018.entries[1].data_type == pysoem.ECT_UNSIGNED32
+        assert [obj.index for obj in cached_od] == [obj.index for obj in od]
+        for obj in cached_od:
+            obj.entries
+    assert requests == []
+    assert stores == []
+    pysoem.clear_od_cache()
+
+
+def test_read_object_dictionary(el1259, tmp_path, monkeypatch):
+    monkeypatch.setattr(pysoem.settings, 'od_cache_dir', str(tmp_path))
+    pysoem.clear_od_cache()
+    table = el1259.read_object_dictionary(0x1018, 0x1018)
+    rows = [i for i, index in enumerate(table.index) if index == 0x1018]
+    assert [table.subindex[i] for i in rows] == [0, 1, 2, 3, 4]
+    assert table.object_name[rows[0]] == 'Identity'
+    assert table.name[rows[1]] == 'Vendor ID'
+    assert table.data_type[rows[1]] == pysoem.ECT_UNSIGNED32
+    assert table.bit_length[rows[1]] == 32
+
+    # the complete dictionary matches the one read object by object
+    table = el1259.read_object_dictionary()
+    assert len(list(tmp_path.iterdir())) == 1
+    pysoem.clear_od_cache()
+    expected = [(obj.index, entry_subindex, entry.data_type, entry.bit_length)
+                for obj in el1259.od
+                for entry_subindex, entry in enumerate(obj.entries or [obj])
+                if entry.data_type != 0 or entry.bit_length != 0]
+    assert list(zip(table.index, table.subindex, table.data_type, table.bit_length)) == sorted(expected)
+    pysoem.clear_od_cache()
+
+
 @pytest.mark.parametrize('mode', ['mbx_receive', 'sdo_read'])
 def test_coe_emergency_legacy(xmc_device, mode):
     """Test if CoE Emergency errors can be received.
@@ -224,4 +375,38 @@ def test_coe_emergency_new(xmc_device, mode):
         assert len(emcy_consumer._pending_emcy_msg) == 0
     # again mbx_receive() should not raise any further exception
     xmc_device.mbx_receive()
-    assert len(emcy_consumer._pending_emcy_msg) == 0
\ No newline at end of file
+    assert len(emcy_consumer._pending_emcy_msg) == 0
+
+
+def test_mailbox_monitor(pysoem_env, xmc_device):
+    master = pysoem_env.get_master()
+    batches = []
+    emcy_consumer = EmergencyConsumer()
+    xmc_device.add_emergency_callback(emcy_consumer.on_emergency)
+    master.start_mailbox_monitor(batches.append, 1000)
+    with pytest.raises(RuntimeError):
+        master.start_mailbox_monitor()
+    # this write triggers an emergency message in the device, the monitor reads it in the background
+    xmc_device.sdo_write_async(0x8001, 1, bytes(4)).result(timeout=5)
+    for _ in range(100):
+        if batches:
+            break
+        time.sleep(0.01)
+    master.stop_mailbox_monitor()
+    events = [event for batch in batches for event in batch]
+    assert len(events) == 1
+    assert events[0].slave_pos == 1
+    assert isinstance(events[0].error, pysoem.Emergency)
+    assert events[0].error.error_code == 0xFFFE
+    assert abs(events[0].timestamp - time.time()) < 10
+    assert len(emcy_consumer._pending_emcy_msg) == 1
+
+    # without a callback the events are queued
+    master.start_mailbox_monitor(max_events=16)
+    xmc_device.sdo_write_async(0x8001, 1, bytes(4)).result(timeout=5)
+    time.sleep(0.1)
+    master.stop_mailbox_monitor()
+    events = master.get_mailbox_events()
+    assert [event.error.error_code for event in events] == [0xFFFE]
+    assert master.get_mailbox_events() == []
+    assert master.mailbox_events_dropped == 0
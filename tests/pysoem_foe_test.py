@@ -23,6 +23,44 @@ def test_foe_good(pysoem_env):
         assert reread_data[:len(random_data)] == random_data
 
 
+def test_foe_streaming(pysoem_env, tmp_path):
+    pysoem_env.config_init()
+    test_slave = pysoem_env.get_xmc_test_device()
+    file_path = os.path.join(test_dir, 'foe_testdata/random_data_01.bin')
+    with open(file_path, 'rb') as file:
+        random_data = file.read()
+
+    # write from the file, memory-mapped
+    write_progress = []
+    test_slave.foe_write('test.bin', 0, file_path, progress=lambda *args: write_progress.append(args),
+                         progress_interval_us=0)
+    assert write_progress[-1] == (len(random_data), len(random_data))
+    assert all(total == len(random_data) for _, total in write_progress)
+    assert [written for written, _ in write_progress] == sorted(written for written, _ in write_progress)
+
+    # read into a preallocated buffer
+    buffer = bytearray(8192)
+    read_progress = []
+    size = test_slave.foe_read_into('test.bin', 0, buffer, progress=lambda *args: read_progress.append(args))
+    assert size >= len(random_data)
+    assert buffer[:len(random_data)] == random_data
+    assert read_progress[-1] == (size, None)
+
+    # read into a file, truncated to the size read
+    read_path = tmp_path / 'read.bin'
+    assert test_slave.foe_read_to_file('test.bin', 0, read_path, 8192) == size
+    assert read_path.read_bytes() == bytes(buffer[:size])
+
+    # any buffer can be written
+    test_slave.foe_write('test.bin', 0, memoryview(bytearray(random_data)))
+    assert test_slave.foe_read('test.bin', 0, 8192)[:len(random_data)] == random_data
+
+    def failing_progress(transferred, total):
+        raise RuntimeError('cancelled')
+    with pytest.raises(RuntimeError):
+        test_slave.foe_write('test.bin', 0, random_data, progress=failing_progress)
+
+
 def test_foe_fails(pysoem_env):
     pysoem_env.config_init()
     test_slave = pysoem_env.get_device_without_foe()
@@ -41,3 +79,21 @@ def test_foe_fails(pysoem_env):
     assert excinfo.value.error_code == 2
     assert excinfo.value.desc == 'The mailbox protocol is not supported'
 
+
+def test_update_firmware(pysoem_env):
+    pysoem_env.config_init()
+    master = pysoem_env.get_master()
+    file_path = os.path.join(test_dir, 'foe_testdata/random_data_01.bin')
+    progress = []
+
+    results = master.update_firmware('test.bin', {0: file_path},
+                                     progress=lambda *args: progress.append(args), progress_interval_us=0)
+    assert list(results) == [0]
+    assert results[0].error is None
+    assert results[0].size == os.path.getsize(file_path)
+    assert results[0].duration > 0
+    assert progress[-1] == (0, results[0].size, results[0].size)
+    assert master.slaves[0].state == pysoem.INIT_STATE
+
+    with pytest.raises(IndexError):
+        master.update_firmware('test.bin', {len(master.slaves): file_path})
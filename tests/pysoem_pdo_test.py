@@ -68,6 +68,339 @@ def test_io_toggle(pysoem_env, overlapping_enable):
         assert el1259.input[in_offset] & 0x04 == 0x00
 
 
+def test_io_toggle_in_place(pysoem_env):
+    """Same as test_io_toggle but writes single bytes through the output view."""
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    pysoem_env.go_to_op_state()
+
+    output = el1259.output
+    assert isinstance(output, memoryview)
+    assert output.readonly is False
+    assert el1259.input.readonly is True
+    output[:] = bytes(len(output))
+    with pytest.raises(ValueError):
+        el1259.output = bytes(len(output) + 1)
+    with pytest.raises(BufferError):
+        el1259.output = memoryview(bytes(2 * len(output)))[::2]
+
+    for i in range(8):
+        out_offset = 12 * i
+        in_offset = 4 * i
+
+        el1259.output[out_offset] = 0x02
+        time.sleep(0.1)
+        assert el1259.input[in_offset] & 0x04 == 0x04
+
+        el1259.output[out_offset] = 0x00
+        time.sleep(0.1)
+        assert el1259.input[in_offset] & 0x04 == 0x00
+
+
+@pytest.mark.parametrize('overlapping_enable', [False, True])
+def test_io_map_layout(pysoem_env, overlapping_enable):
+    """Check that the IO map layout matches the process data views of the slaves."""
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map(overlapping_enable)
+    master = pysoem_env.get_master()
+
+    layout = master.io_map_layout()
+    assert len(layout) == len(master.slaves)
+    el1259_layout = layout[3]
+    assert el1259_layout.name == el1259.name
+    assert el1259_layout.output_bytes == len(el1259.output)
+    assert el1259_layout.input_bytes == len(el1259.input)
+
+    io_map = master.io_map
+    io_map[el1259_layout.output_offset] = 0x02
+    assert el1259.output[0] == 0x02
+    el1259.output[0] = 0x00
+    assert io_map[el1259_layout.output_offset] == 0x00
+    assert io_map[el1259_layout.input_offset:el1259_layout.input_offset + el1259_layout.input_bytes] == el1259.input
+
+
+@pytest.mark.parametrize('overlapping_enable', [False, True])
+def test_exchange_processdata(pysoem_env, overlapping_enable):
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map(overlapping_enable)
+    master = pysoem_env.get_master()
+
+    wkc, ok = master.exchange_processdata(10000)
+    assert ok == (wkc == master.expected_wkc)
+    assert master.cycle_stats().cycles == 1
+
+    master.state = pysoem.OP_STATE
+    master.write_state()
+    for _ in range(200):
+        wkc, ok = master.exchange_processdata(10000)
+        if master.state_check(pysoem.OP_STATE, 5000) == pysoem.OP_STATE:
+            break
+    assert master.state == pysoem.OP_STATE
+    wkc, ok = master.exchange_processdata(10000)
+    assert ok
+    assert wkc == master.expected_wkc
+
+
+def test_io_toggle_bits(pysoem_env):
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    pysoem_env.go_to_op_state()
+
+    assert len(el1259.output_bits) == len(el1259.output) * 8
+    assert len(el1259.input_bits) == len(el1259.input) * 8
+    with pytest.raises(TypeError):
+        el1259.input_bits[0] = True
+
+    # second output bit of each channel, see test_io_toggle()
+    channel_outputs = slice(1, 8 * 12 * 8, 12 * 8)
+    channel_inputs = slice(2, 8 * 4 * 8, 4 * 8)
+    for value in [1, 0]:
+        el1259.output_bits[channel_outputs] = bytes([value] * 8)
+        time.sleep(0.1)
+        assert el1259.input_bits[channel_inputs] == bytes([value] * 8)
+    el1259.output_bits[1] = True
+    assert el1259.output[0] & 0x02 == 0x02
+    # every second value of a strided buffer
+    el1259.output_bits[0:4] = memoryview(bytes([1, 0, 0, 0, 1, 0, 0, 0]))[::2]
+    assert el1259.output[0] & 0x0f == 0x05
+    el1259.output_bits[:] = False
+    assert bytes(el1259.output) == bytes(len(el1259.output))
+
+
+def test_pdo_map(pysoem_env):
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    pdo_map = el1259.read_pdo_map()
+    assert el1259.pdo is pdo_map
+
+    inputs = [variable for variable in pdo_map.variables if variable.is_input]
+    outputs = [variable for variable in pdo_map.variables if not variable.is_input]
+    assert sum(variable.bit_length for variable in outputs) <= len(el1259.output) * 8
+    assert sum(variable.bit_length for variable in inputs) <= len(el1259.input) * 8
+    for variable in pdo_map.variables:
+        assert variable.name
+        assert (variable.index, variable.subindex) in pdo_map
+
+    # second bit of the first channel, see test_io_toggle()
+    output_bit = next(variable for variable in outputs if variable.bit_offset == 1)
+    key = (output_bit.index, output_bit.subindex)
+    pdo_map[key] = True
+    assert pdo_map[key] is True
+    assert el1259.output[0] & 0x02 == 0x02
+    pdo_map[key] = False
+    assert el1259.output[0] & 0x02 == 0x00
+    with pytest.raises(TypeError):
+        pdo_map[(inputs[0].index, inputs[0].subindex)] = 0
+
+    # every output entry is written without changing the entries sharing its bytes
+    keys = [(variable.index, variable.subindex) for variable in outputs]
+    for key in keys:
+        before = {other: pdo_map[other] for other in keys}
+        if not isinstance(before[key], int):
+            continue
+        pdo_map[key] = 1
+        assert pdo_map[key] == 1
+        assert {other: pdo_map[other] for other in keys if other != key} == \
+            {other: value for other, value in before.items() if other != key}
+        pdo_map[key] = before[key]
+
+    pysoem_env.config_map()
+    assert el1259.pdo is not pdo_map
+
+
+def test_cyclic_exchange(pysoem_env):
+    """Let the native cyclic thread exchange the process data and toggle an output."""
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    master = pysoem_env.get_master()
+
+    master.start_cyclic(1_000_000)
+    assert master.cyclic_running
+    with pytest.raises(RuntimeError):
+        master.start_cyclic(1_000_000)
+    for exchange in [master.send_processdata, master.send_overlap_processdata, master.receive_processdata,
+                     master.exchange_processdata]:
+        with pytest.raises(RuntimeError):
+            exchange()
+    master.state = pysoem.OP_STATE
+    master.write_state()
+    assert master.state_check(pysoem.OP_STATE, 1_000_000) == pysoem.OP_STATE
+
+    start_count = master.cycle_count
+    time.sleep(0.5)
+    assert master.cycle_count - start_count > 400
+    assert master.cyclic_wkc == master.expected_wkc
+
+    el1259.output[0] = 0x02
+    time.sleep(0.1)
+    assert el1259.input[0] & 0x04 == 0x04
+    el1259.output[0] = 0x00
+    time.sleep(0.1)
+    assert el1259.input[0] & 0x04 == 0x00
+
+    master.stop_cyclic()
+    assert not master.cyclic_running
+    stop_count = master.cycle_count
+    time.sleep(0.1)
+    assert master.cycle_count == stop_count
+
+
+def test_sdo_async_during_cyclic_exchange(pysoem_env):
+    """Read and write CoE objects in OP while the native cyclic thread keeps the cycle."""
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    master = pysoem_env.get_master()
+
+    master.start_cyclic(1_000_000)
+    master.state = pysoem.OP_STATE
+    master.write_state()
+    assert master.state_check(pysoem.OP_STATE, 1_000_000) == pysoem.OP_STATE
+
+    start_count = master.cycle_count
+    futures = [el1259.sdo_read_async(0x1018, subindex) for subindex in [1, 2, 3]]
+    write_future = el1259.sdo_write_async(0x1111, 0, bytes(4))
+    assert [struct.unpack('I', future.result(timeout=5))[0] for future in futures] == [el1259.man, el1259.id, el1259.rev]
+    with pytest.raises(pysoem.SdoError):
+        write_future.result(timeout=5)
+    assert master.cycle_count > start_count
+    assert master.cyclic_wkc == master.expected_wkc
+
+    master.stop_cyclic()
+
+
+def test_cyclic_groups(pysoem_env):
+    """Exchange the EL1259 in its own group with a shorter cycle time than the other slaves."""
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    master = pysoem_env.get_master()
+    for slave in master.slaves:
+        slave.group = 1
+    el1259.group = 2
+    with pytest.raises(ValueError):
+        el1259.group = 8
+    pysoem_env.config_map()
+
+    layout = master.io_map_layout()
+    assert [slave_layout.group for slave_layout in layout] == [slave.group for slave in master.slaves]
+    assert master.expected_wkc == master.group_expected_wkc(1) + master.group_expected_wkc(2)
+
+    master.start_cyclic(1_000_000, group_periods={1: 4_000_000})
+    master.state = pysoem.OP_STATE
+    master.write_state()
+    assert master.state_check(pysoem.OP_STATE, 1_000_000) == pysoem.OP_STATE
+
+    time.sleep(0.5)
+    master.stop_cyclic()
+    fast_count = master.cyclic_group_count(2)
+    slow_count = master.cyclic_group_count(1)
+    assert fast_count > 400
+    assert 3 <= fast_count / slow_count <= 5
+    assert master.cyclic_group_wkc(1) == master.group_expected_wkc(1)
+    assert master.cyclic_group_wkc(2) == master.group_expected_wkc(2)
+    assert master.cyclic_group_wkc(3) == -1
+
+
+def test_cyclic_dc_sync(pysoem_env):
+    """Lock the native cyclic thread to the SYNC0 events of the EL1259."""
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    master = pysoem_env.get_master()
+
+    master.start_cyclic(1_000_000, dc_sync_offset_ns=50_000)
+    master.state = pysoem.OP_STATE
+    master.write_state()
+    assert master.state_check(pysoem.OP_STATE, 1_000_000) == pysoem.OP_STATE
+    time.sleep(1)
+    master.reset_cycle_stats()
+    time.sleep(0.5)
+    stats = master.cycle_stats()
+    master.stop_cyclic()
+
+    assert stats.dc_offset.count > 0
+    # locked within a quarter of the cycle time
+    assert stats.dc_offset.max_ns < 250_000
+    assert abs(stats.dc_offset_ns) < 250_000
+
+
+def test_cycle_stats(pysoem_env):
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    master = pysoem_env.get_master()
+
+    for _ in range(10):
+        master.send_processdata()
+        master.receive_processdata(10000)
+    stats = master.cycle_stats()
+    assert stats.cycles == 10
+    assert stats.roundtrip.count == 10
+    assert 0 < stats.roundtrip.min_ns <= stats.roundtrip.mean_ns <= stats.roundtrip.max_ns
+    assert sum(stats.roundtrip.histogram) == 10
+    assert stats.wakeup_latency.count == 0
+
+    master.reset_cycle_stats()
+    master.start_cyclic(1_000_000)
+    time.sleep(0.5)
+    master.stop_cyclic()
+    stats = master.cycle_stats()
+    assert stats.cycles == master.cycle_count
+    assert stats.wakeup_latency.count == stats.cycles
+    assert stats.roundtrip.count == stats.cycles
+    assert stats.wkc_mismatches <= stats.cycles
+
+
+def test_input_snapshot(pysoem_env):
+    pysoem_env.config_init()
+    el1259 = pysoem_env.get_el1259()
+    pysoem_env.el1259_config_func = El1259ConfigFunction(el1259).fn
+    pysoem_env.config_map()
+    master = pysoem_env.get_master()
+    el1259_layout = master.io_map_layout()[3]
+    assert master.read_input_snapshot() is None
+
+    wkc = master.receive_processdata(10000) if master.send_processdata() else 0
+    snapshot = master.read_input_snapshot()
+    assert snapshot.cycle == 1
+    assert snapshot.wkc == wkc
+    assert len(snapshot.data) == len(master.io_map)
+    start = el1259_layout.input_offset
+    assert snapshot.data[start:start + el1259_layout.input_bytes] == el1259.input
+
+    master.start_cyclic(1_000_000)
+    image = bytearray(len(master.io_map))
+    last_snapshot = master.read_input_snapshot(image)
+    for _ in range(10):
+        time.sleep(0.01)
+        snapshot = master.read_input_snapshot(image)
+        assert snapshot.data is image
+        assert snapshot.cycle > last_snapshot.cycle
+        assert snapshot.timestamp_ns > last_snapshot.timestamp_ns
+        last_snapshot = snapshot
+    with pytest.raises(RuntimeError):
+        master.config_map()
+    master.stop_cyclic()
+    with pytest.raises(ValueError):
+        master.read_input_snapshot(bytearray(1))
+
+
 @pytest.mark.parametrize('disable_complete_access', [False, True])
 def test_disable_complete_access(pysoem_env, disable_complete_access):
     """Very basic sanity check if disable_complete_access does not do any damage."""